@@ -0,0 +1,274 @@
+"""Benchmark suite for the translation pipeline.
+
+Usage:
+    python benchmarks/bench.py run [--output results.json] [--only process_letter] [--quick]
+                                   [--html-dir DIR] [--latency 0.05] [--jitter 0.02]
+                                   [--error-rate 0.0] [--throttle-rate 0.0] [--seed 0]
+    python benchmarks/bench.py compare baseline.json results.json [--threshold 0.10]
+
+`run` times the sentence splitters, extract_letters on saved HTML pages (every
+*.html/*.shtml under --html-dir, e.g. an HtmlMirror root, or a synthetic
+124-letter corpus), EpubBuilder.save for the full corpus, and process_letter
+(sync, async, paragraph-batched and combined) against MockOpenAITransport with the given
+latency, jitter, error and 429 rates. Results are written as JSON.
+
+`compare` prints the median change per benchmark against a baseline file and
+exits with status 1 if any benchmark slowed down by more than --threshold.
+No baseline is checked in, since timings depend on the machine; create one with
+`bench.py run --output baseline.json` on the revision to compare against.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_text_utils import PARAGRAPH, time_splitters
+
+from latin_translator.models import Letter
+from latin_translator.service.epub_builder import EpubBuilder
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.service.seneca_letter_downloader import SenecaLetterDownloader, etree
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport
+
+LETTER_COUNT = 124
+SECTIONS_PER_LETTER = 8
+
+
+def to_roman(number: int) -> str:
+    numerals = [(100, "C"), (90, "XC"), (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I")]
+    roman = ""
+    for value, numeral in numerals:
+        while number >= value:
+            roman += numeral
+            number -= value
+    return roman
+
+
+def synthetic_letter(number: int, sections: int = SECTIONS_PER_LETTER) -> Letter:
+    """A letter of roughly corpus-typical length built from the sample paragraph."""
+    body = PARAGRAPH.split("] ", 1)[1].strip()
+    content = "\n".join(f"[{i}] {body}" for i in range(1, sections + 1))
+    return Letter(number=number, roman=to_roman(number), title="SENECA LVCILIO SVO SALVTEM", content=content)
+
+
+def synthetic_pages() -> List[str]:
+    """One HTML page per book, shaped like the source site's letter pages."""
+    pages = []
+    for first, last in SenecaLetterDownloader.PAGE_LETTER_RANGES.values():
+        paragraphs = []
+        for number in range(first, last + 1):
+            letter = synthetic_letter(number)
+            paragraphs.append(f"<p><b>{letter.roman}. {letter.title}</b></p>")
+            paragraphs += [f"<p>{line}</p>" for line in letter.content.split("\n")]
+        pages.append(
+            "<html><head><title>Seneca</title></head><body>\n"
+            + "\n".join(paragraphs)
+            + '\n<p class="shortborder"> </p></body></html>'
+        )
+    return pages
+
+
+def load_pages(html_dir: Path) -> List[str]:
+    paths = sorted(p for p in html_dir.rglob("*") if p.suffix in (".html", ".shtml"))
+    if not paths:
+        raise SystemExit(f"No *.html or *.shtml files under {html_dir}")
+    return [p.read_text(encoding="utf-8", errors="replace") for p in paths]
+
+
+def timed(function: Callable[[], object], repeat: int) -> List[float]:
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - started)
+    return runs
+
+
+def bench_text_utils(args) -> Dict[str, dict]:
+    number = 200 if args.quick else 2000
+    return {
+        f"text_utils.{name}": {"runs": runs}
+        for name, runs in time_splitters(number=number).items()
+    }
+
+
+def bench_extract_letters(args) -> Dict[str, dict]:
+    pages = load_pages(args.html_dir) if args.html_dir else synthetic_pages()
+    backends = ["html.parser"] + (["lxml"] if etree is not None else [])
+    results = {}
+    for backend in backends:
+        letters = sum(len(SenecaLetterDownloader.extract_letters(page, backend=backend)) for page in pages)
+        runs = timed(
+            lambda: [SenecaLetterDownloader.extract_letters(page, backend=backend) for page in pages],
+            repeat=2 if args.quick else 5
+        )
+        results[f"extract_letters.{backend}"] = {
+            "runs": runs,
+            "pages": len(pages),
+            "letters": letters,
+            "bytes": sum(len(page.encode("utf-8")) for page in pages),
+        }
+    return results
+
+
+def bench_epub_save(args) -> Dict[str, dict]:
+    letters = [synthetic_letter(number) for number in range(1, LETTER_COUNT + 1)]
+
+    def build_and_save() -> None:
+        builder = EpubBuilder()
+        for letter in letters:
+            builder.add_letter(letter, letter.content)
+        with tempfile.TemporaryDirectory() as tmp:
+            builder.save(Path(tmp) / "corpus.epub")
+
+    return {"epub_builder.save": {"runs": timed(build_and_save, repeat=1 if args.quick else 3), "letters": len(letters)}}
+
+
+def bench_process_letter(args) -> Dict[str, dict]:
+    letter = synthetic_letter(1, sections=2 if args.quick else SECTIONS_PER_LETTER)
+    repeat = 1 if args.quick else 3
+    modes = {
+        "process_letter.sync": ({}, lambda t: t.process_letter(letter.content)),
+        "process_letter.async": ({}, lambda t: asyncio.run(t.aprocess_letter(letter.content))),
+        "process_letter.batched": ({"batch_paragraphs": True}, lambda t: t.process_letter(letter.content)),
+        "process_letter.combined": ({"combined": True}, lambda t: t.process_letter(letter.content)),
+    }
+    results = {}
+    for name, (options, translate) in modes.items():
+        transport = MockOpenAITransport(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            retry_after=args.latency,
+            seed=args.seed
+        )
+        translator = LetterTranslator(http_transport=transport, **options)
+        runs = timed(lambda: translate(translator), repeat)
+        sentences = sum(len(stage.original) for stage in translator.process_letter(letter.content))
+        results[name] = {
+            "runs": runs,
+            "sentences": sentences,
+            "requests_per_run": len(transport.requests) / (repeat + 1),
+            "errors": transport.errors,
+            "throttled": transport.throttled,
+            "sentences_per_second": sentences / statistics.median(runs),
+        }
+    return results
+
+
+BENCHMARKS = {
+    "text_utils": bench_text_utils,
+    "extract_letters": bench_extract_letters,
+    "epub_save": bench_epub_save,
+    "process_letter": bench_process_letter,
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args) -> int:
+    # The OpenAI client insists on a key even though requests never leave the process
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    results: Dict[str, dict] = {}
+    for group in args.only or list(BENCHMARKS):
+        print(f"Running {group}...", file=sys.stderr)
+        for name, result in BENCHMARKS[group](args).items():
+            runs = result["runs"]
+            result.update(unit="seconds", best=min(runs), median=statistics.median(runs), mean=statistics.fmean(runs))
+            results[name] = result
+            print(f"  {name:<36} median {result['median']:.6f}s  best {result['best']:.6f}s", file=sys.stderr)
+
+    config = {key: (str(value) if isinstance(value, Path) else value) for key, value in vars(args).items()
+              if key not in ("command", "handler", "output")}
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": config,
+        "benchmarks": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+def compare(args) -> int:
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["benchmarks"]
+    current = json.loads(args.current.read_text(encoding="utf-8"))["benchmarks"]
+    regressions = []
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            print(f"{name:<36} {'only in ' + ('current' if name in current else 'baseline'):>34}")
+            continue
+        before, after = baseline[name]["median"], current[name]["median"]
+        change = after / before - 1 if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {before:>11.6f}s {after:>11.6f}s {change:>+7.1%}{flag}")
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subcommands.add_parser("run", help="Run the benchmarks and write JSON results")
+    run_parser.add_argument("--output", type=Path, help="Results file (default: stdout)")
+    run_parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Benchmark groups to run")
+    run_parser.add_argument("--quick", action="store_true", help="Fewer, shorter runs for a smoke test")
+    run_parser.add_argument("--html-dir", type=Path, help="Saved pages for extract_letters (default: synthetic)")
+    run_parser.add_argument("--latency", type=float, default=0.05, help="Mock API latency in seconds")
+    run_parser.add_argument("--jitter", type=float, default=0.02, help="Mock API latency jitter in seconds")
+    run_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock requests failing with 500")
+    run_parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of mock requests throttled with 429")
+    run_parser.add_argument("--seed", type=int, default=0, help="Seed for mock latency and failures")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subcommands.add_parser(
+        "compare",
+        help="Compare results against a baseline",
+        description="Compare results against a baseline recorded on the same machine with "
+                    "`bench.py run --output baseline.json`; none is checked in."
+    )
+    compare_parser.add_argument("baseline", type=Path, help="Earlier `run --output` results")
+    compare_parser.add_argument("current", type=Path, help="Results to check against the baseline")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before failing")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""Micro-benchmark for the sentence splitters in latin_translator.utils.text_utils.
+
+Usage:
+    python benchmarks/bench_text_utils.py [--number 2000] [--paragraphs 20]
+
+Also run as part of the full suite in benchmarks/bench.py.
+"""
+
+from typing import Dict, List
+import argparse
+import timeit
+
+from latin_translator.utils import split_naive_sentences, split_paragraphs, split_text_with_quotes
+
+PARAGRAPH = (
+    "[6] Amicus noster Stoicus, homo egregius et, ut verbis illum quibus laudari dignus est laudem, "
+    "vir fortis ac strenuus, videtur mihi optime illum cohortatus. Sic enim coepit: \"noli, mi Marcelline, "
+    "torqueri tamquam de re magna deliberes. Non est res magna vivere: omnes servi tui vivunt, omnia "
+    "animalia: magnum est honeste mori, prudenter, fortiter.\" Cogita quamdiu iam idem facias: cibus, "
+    "somnus, libido -- per hunc circulum curritur; mori velle non tantum prudens aut fortis aut miser, "
+    "etiam fastidiosus potest! Quid ergo? "
+)
+
+
+def time_splitters(number: int = 2000, paragraphs: int = 20, repeat: int = 5) -> Dict[str, List[float]]:
+    """Seconds per call of each splitter, one entry per timing run."""
+    text = PARAGRAPH * paragraphs
+    return {
+        splitter.__name__: [run / number for run in timeit.repeat(lambda: splitter(text), number=number, repeat=repeat)]
+        for splitter in (split_text_with_quotes, split_naive_sentences, split_paragraphs)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing run")
+    parser.add_argument("--paragraphs", type=int, default=20, help="Copies of the sample paragraph per call")
+    args = parser.parse_args()
+
+    text_length = len(PARAGRAPH) * args.paragraphs
+    print(f"Input: {text_length} characters")
+    for name, runs in time_splitters(args.number, args.paragraphs).items():
+        best = min(runs)
+        print(f"{name:<24} {best * 1e6:9.1f} us/call {text_length / best / 1e6:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -47,12 +47,10 @@ from IPython.display import display, Markdown
 
 # %%
 downloader = SenecaLetterDownloader()  # Uses default URLs
-logger.info("Fetching all letters...")
-all_letters = downloader.fetch_all_letters()
-logger.info(f"Found {len(all_letters)} letters")
 # %%
 # Select a letter by number (e.g., letter 77)
 # Change this to select a different letter number
+# Only the page containing the letter is downloaded
 letter = downloader.get_letter_by_number(77)
 logger.info(f"Selected letter {letter.roman} ({letter.number}): {letter.title}")
 
@@ -10,7 +10,7 @@ import requests
 from bs4 import BeautifulSoup
 from typing import List
 import logging
-from latin_translator.models import Letter, TranslationStages
+from latin_translator.models import Letter, TranslationStages, ParagraphEvent
 from latin_translator.service.letter_translator import LetterTranslator
 
 # Initialize logging
@@ -94,7 +94,12 @@ builder = EpubBuilder(config=custom_config)
 for letter_to_add in letters_to_include:
     # Translate the letter
     logger.info(f"Translating letter {letter_to_add.roman} for EPUB")
-    translation_stages = translator.process_letter(letter_to_add.content)
+    # Stream so each paragraph can be reviewed as soon as it is done
+    translation_stages = []
+    for event in translator.iter_process_letter(letter_to_add.content, letter_number=letter_to_add.number):
+        if isinstance(event, ParagraphEvent):
+            TranslationStages.display_many([event.stages])
+            translation_stages.append(event.stages)
     # Use the rhetorical translation for the EPUB
     translated_text = "\n\n".join([" ".join(stage.rhetorical) for stage in translation_stages])
     
@@ -105,3 +110,19 @@ for letter_to_add in letters_to_include:
 custom_epub_path = builder.save(Path("seneca_volume_1.epub"))
 logger.info(f"Created multi-letter EPUB at: {custom_epub_path}")
 # %%
+# %% [markdown]
+# ## Comparing rhetorical prompt variants
+#
+# The direct phase runs once per paragraph and is shared by every variant, so only the
+# rhetorical phase is paid for per variant.
+# %%
+from latin_translator.models import PromptVariant
+
+variants = [
+    PromptVariant(name="current"),
+    PromptVariant(name="mini", model="gpt-4o-mini"),
+    # PromptVariant(name="draft", prompt=Path("rhetorical_draft.txt").read_text()),
+]
+letter_to_compare = letters_to_include[0]
+variant_stages = translator.process_letter_variants(letter_to_compare.content, variants, letter_to_compare.number)
+display(Markdown(TranslationStages.compare_many(variant_stages)))
@@ -1,8 +1,14 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_namespace_packages
 
 setup(
     name='latin_translator',
     version='0.1',
-    packages=find_packages(where='src'),
+    packages=find_namespace_packages(where='src', include=['latin_translator*']),
     package_dir={'': 'src'},
+    package_data={'latin_translator': ['prompts/*.txt']},
+    entry_points={
+        'console_scripts': [
+            'latin-translate=latin_translator.cli:main',
+        ],
+    },
 )
\ No newline at end of file
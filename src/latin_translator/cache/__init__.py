@@ -0,0 +1,24 @@
+"""Caching implementations for the Latin Translator project.
+
+This package contains the persistent stores used to avoid repeated work:
+- translation_cache: Content-addressed cache of LLM translation replies
+- html_mirror: Local mirror of downloaded source pages
+- corpus_snapshot: Pre-parsed, memory-mapped corpus of letters
+- translation_journal: Append-only checkpoint journal for resuming interrupted runs
+"""
+
+from .translation_cache import TranslationCache, CacheStats
+from .html_mirror import HtmlMirror, MirrorEntry
+from .corpus_snapshot import CorpusSnapshot
+from .translation_journal import TranslationJournal, JournalEntry, prompt_version
+
+__all__ = [
+    'TranslationCache',
+    'CacheStats',
+    'HtmlMirror',
+    'MirrorEntry',
+    'CorpusSnapshot',
+    'TranslationJournal',
+    'JournalEntry',
+    'prompt_version',
+]
@@ -0,0 +1,116 @@
+"""Pre-parsed, memory-mapped snapshot of the letter corpus."""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import json
+import logging
+import mmap
+import os
+
+from ..models import Letter
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusSnapshot:
+    """A versioned JSON-lines file of parsed Letters with a byte-offset index.
+    
+    Layout: the first line is a JSON header holding the format name, version and
+    an index mapping each letter number to the (offset, length) of its line,
+    relative to the end of the header. Every following line is one serialized
+    Letter, sections included. The file is memory-mapped, so loading a single
+    letter decodes only that letter's bytes.
+    
+    Example:
+        >>> CorpusSnapshot.write(downloader.fetch_all_letters(), Path("corpus.jsonl"))
+        >>> snapshot = CorpusSnapshot(Path("corpus.jsonl"))
+        >>> snapshot.get(77).title
+    """
+    
+    FORMAT = "latin-translator-corpus"
+    VERSION = 1
+    
+    def __init__(self, path: Union[str, Path]):
+        """Open and memory-map a snapshot file.
+        
+        Args:
+            path: Location of the snapshot
+            
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version
+        """
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_line = self._mmap.readline()
+        header = json.loads(header_line)
+        if header.get("format") != self.FORMAT or header.get("version") != self.VERSION:
+            self.close()
+            raise ValueError(
+                f"{self.path} is not a {self.FORMAT} v{self.VERSION} snapshot "
+                f"(found {header.get('format')} v{header.get('version')})"
+            )
+        self._body_start = len(header_line)
+        self._index: Dict[int, Tuple[int, int]] = {
+            int(number): (offset, length) for number, (offset, length) in header["index"].items()
+        }
+
+    @classmethod
+    def write(cls, letters: Iterable[Letter], path: Union[str, Path]) -> "CorpusSnapshot":
+        """Write letters to a new snapshot file and open it.
+        
+        Args:
+            letters: Parsed letters, written in the given order
+            path: Destination; replaced atomically if it exists
+            
+        Returns:
+            The opened snapshot
+        """
+        path = Path(path)
+        lines: List[bytes] = []
+        index: Dict[str, Tuple[int, int]] = {}
+        offset = 0
+        for letter in letters:
+            line = letter.model_dump_json().encode("utf-8") + b"\n"
+            index[str(letter.number)] = (offset, len(line))
+            lines.append(line)
+            offset += len(line)
+        header = {"format": cls.FORMAT, "version": cls.VERSION, "index": index}
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n")
+            f.writelines(lines)
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote corpus snapshot with {len(lines)} letters to {path}")
+        return cls(path)
+
+    @property
+    def numbers(self) -> List[int]:
+        """Letter numbers in file order."""
+        return list(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, number: int) -> bool:
+        return number in self._index
+
+    def get(self, number: int) -> Optional[Letter]:
+        """Load one letter by number. Returns None if it is not in the snapshot."""
+        location = self._index.get(number)
+        if location is None:
+            return None
+        offset, length = location
+        start = self._body_start + offset
+        return Letter.model_validate_json(self._mmap[start:start + length])
+
+    def letters(self) -> List[Letter]:
+        """Load every letter in file order."""
+        return [self.get(number) for number in self._index]
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        self._mmap.close()
+        self._file.close()
@@ -0,0 +1,158 @@
+"""On-disk mirror of downloaded HTML pages with conditional revalidation."""
+
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+import requests
+from pydantic import BaseModel
+
+from ..exceptions import MirrorMissError
+
+logger = logging.getLogger(__name__)
+
+
+class MirrorEntry(BaseModel):
+    """Manifest record for one mirrored page."""
+    url: str
+    file_name: str
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float
+
+
+class HtmlMirror:
+    """Keeps a local copy of source pages and revalidates them with conditional GETs.
+    
+    Pages are stored as UTF-8 files next to a `manifest.json` that records each
+    URL's file, content hash, ETag and Last-Modified validators. Online, a mirrored
+    page is revalidated with If-None-Match / If-Modified-Since and only downloaded
+    again when the server reports a change. Offline, the network is never touched
+    and a page missing from the mirror raises MirrorMissError.
+    
+    Example:
+        >>> mirror = HtmlMirror(Path(".cache/html"), offline=True)
+        >>> downloader = SenecaLetterDownloader(mirror=mirror)
+    """
+    
+    DEFAULT_DIR = Path(".cache/html")
+    MANIFEST_NAME = "manifest.json"
+    
+    def __init__(self, root: Optional[Union[str, Path]] = None, offline: bool = False):
+        """Open (or create) the mirror directory.
+        
+        Args:
+            root: Directory holding the pages and manifest. Defaults to DEFAULT_DIR.
+            offline: Serve only mirrored pages and never make requests.
+        """
+        self.root = Path(root) if root is not None else self.DEFAULT_DIR
+        self.offline = offline
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._manifest: Dict[str, MirrorEntry] = self._load_manifest()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / self.MANIFEST_NAME
+
+    @property
+    def entries(self) -> Dict[str, MirrorEntry]:
+        """A copy of the manifest, keyed by URL."""
+        with self._lock:
+            return dict(self._manifest)
+
+    def _load_manifest(self) -> Dict[str, MirrorEntry]:
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            data = json.load(f)
+        return {url: MirrorEntry(**entry) for url, entry in data.items()}
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically so a crash never leaves it half-written."""
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({url: entry.model_dump() for url, entry in self._manifest.items()}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _file_name(url: str) -> str:
+        url_hash = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+        base_name = os.path.basename(urlparse(url).path) or "index"
+        return f"{url_hash}_{base_name}"
+
+    def _read(self, entry: MirrorEntry) -> Optional[str]:
+        """Read a mirrored page, returning None if it is missing or fails its hash check."""
+        path = self.root / entry.file_name
+        if not path.exists():
+            return None
+        data = path.read_bytes()
+        if hashlib.sha256(data).hexdigest() != entry.sha256:
+            logger.warning(f"Mirrored copy of {entry.url} does not match its manifest hash")
+            return None
+        return data.decode("utf-8")
+
+    def _store(self, url: str, text: str, response: requests.Response) -> None:
+        data = text.encode("utf-8")
+        entry = MirrorEntry(
+            url=url,
+            file_name=self._file_name(url),
+            sha256=hashlib.sha256(data).hexdigest(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.time()
+        )
+        (self.root / entry.file_name).write_bytes(data)
+        with self._lock:
+            self._manifest[url] = entry
+            self._save_manifest()
+
+    def get(self, url: str, session: Optional[requests.Session] = None, timeout: float = 30.0) -> str:
+        """Return a page's HTML, revalidating or downloading it unless offline.
+        
+        Args:
+            url: Page to fetch
+            session: Session to make requests with (defaults to the requests module)
+            timeout: Per-request timeout in seconds
+            
+        Returns:
+            The page HTML
+            
+        Raises:
+            MirrorMissError: If offline and the page is not mirrored
+        """
+        with self._lock:
+            entry = self._manifest.get(url)
+        cached = self._read(entry) if entry is not None else None
+        
+        if self.offline:
+            if cached is None:
+                raise MirrorMissError(f"{url} is not in the offline mirror at {self.root}")
+            return cached
+        
+        headers = {}
+        if cached is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        
+        response = (session or requests).get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached is not None:
+            logger.info(f"{url} not modified; using mirrored copy")
+            with self._lock:
+                self._manifest[url] = entry.model_copy(update={"fetched_at": time.time()})
+                self._save_manifest()
+            return cached
+        
+        response.raise_for_status()
+        logger.info(f"Mirroring {url}")
+        self._store(url, response.text, response)
+        return response.text
@@ -0,0 +1,156 @@
+"""Persistent, content-addressed cache for LLM translation replies."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats(BaseModel):
+    """Hit/miss counters and current size of a TranslationCache."""
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TranslationCache:
+    """An on-disk SQLite cache of translation replies keyed by request content.
+    
+    Keys are SHA-256 hashes of the exact `messages` list sent to the model plus
+    the model parameters, so any change to the sentence, system prompt, context
+    window, model or temperature produces a different key.
+    
+    The cache is bounded by entry count and evicts least-recently-used entries.
+    In replay mode it is read-only: lookups do not touch recency and `put` is a
+    no-op, so a replayed run leaves the cache file unchanged.
+    
+    Example:
+        >>> cache = TranslationCache(Path(".cache/translations.sqlite3"))
+        >>> translator = LetterTranslator(cache=cache)
+    """
+    
+    DEFAULT_PATH = Path(".cache/translations.sqlite3")
+    
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: Optional[int] = 100_000,
+        replay: bool = False
+    ):
+        """Open (or create) the cache database.
+        
+        Args:
+            path: Location of the SQLite file. Defaults to DEFAULT_PATH.
+            max_entries: Maximum number of entries kept before LRU eviction. None for unbounded.
+            replay: Open in read-only replay mode.
+        """
+        self.path = Path(path) if path is not None else self.DEFAULT_PATH
+        self.max_entries = max_entries
+        self.replay = replay
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)"
+            )
+        logger.info(f"TranslationCache opened at {self.path} (replay={replay})")
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, Any]], **params: Any) -> str:
+        """Build the content hash for a request.
+        
+        Args:
+            messages: The exact messages list sent to the model
+            **params: Model parameters that affect the reply (model, temperature, ...)
+            
+        Returns:
+            A hex SHA-256 digest identifying the request
+        """
+        payload = json.dumps(
+            {"messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached reply, updating recency unless in replay mode."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            if not self.replay:
+                with self._conn:
+                    self._conn.execute(
+                        "UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key)
+                    )
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a reply and evict least-recently-used entries beyond max_entries."""
+        if self.replay:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM translations WHERE key IN ("
+                    " SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    @property
+    def stats(self) -> CacheStats:
+        """Current hit/miss counters and entry count."""
+        return CacheStats(hits=self._hits, misses=self._misses, entries=len(self))
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM translations")
+        self._hits = 0
+        self._misses = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,146 @@
+"""Append-only checkpoint journal of completed sentence translations."""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+JournalKey = Tuple[int, int, int, str, str]
+
+
+def prompt_version(prompt: str) -> str:
+    """Short, stable identifier for a system prompt's exact text."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+class JournalEntry(BaseModel):
+    """One completed sentence in one translation phase."""
+    letter: int
+    paragraph: int
+    sentence: int  # Zero-based position within the paragraph
+    phase: str
+    prompt_version: str
+    source: str       # Text that was translated
+    reply: Optional[str]  # Raw assistant reply, replayed into the rolling context on resume;
+                          # None for a sentence of a batched reply, which has none of its own
+    translation: str  # Cleaned translation
+    recorded_at: float
+
+    @property
+    def key(self) -> JournalKey:
+        return (self.letter, self.paragraph, self.sentence, self.phase, self.prompt_version)
+
+
+class TranslationJournal:
+    """A crash-safe JSONL journal that lets an interrupted run resume where it stopped.
+
+    Every completed sentence is appended as one JSON line and flushed (and, by
+    default, fsynced) before translation moves on, so at most the sentence in
+    flight is lost when a run dies. Entries are keyed by letter, paragraph,
+    sentence index, phase and prompt version; changing a prompt therefore
+    invalidates its phase without touching the others. A truncated last line
+    left by a crash is ignored on load.
+
+    Example:
+        >>> journal = TranslationJournal(Path(".cache/journal.jsonl"))
+        >>> translator = LetterTranslator(journal=journal)
+        >>> translator.process_letter(letter.content, letter_number=letter.number)
+    """
+
+    DEFAULT_PATH = Path(".cache/journal.jsonl")
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, fsync: bool = True):
+        """Open (or create) the journal and load its completed entries.
+
+        Args:
+            path: Location of the JSONL file. Defaults to DEFAULT_PATH.
+            fsync: fsync after every entry; turn off to trade durability for speed.
+        """
+        self.path = Path(path) if path is not None else self.DEFAULT_PATH
+        self.fsync = fsync
+        self._entries: Dict[JournalKey, JournalEntry] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        needs_newline = self._load()
+        self._file = open(self.path, "a", encoding="utf-8")
+        if needs_newline:
+            # Terminate a partial line so the next entry starts cleanly
+            self._file.write("\n")
+            self._file.flush()
+        logger.info(f"Opened translation journal at {self.path} with {len(self._entries)} entries")
+
+    def _load(self) -> bool:
+        """Read existing entries. Returns whether the file ends mid-line."""
+        if not self.path.exists():
+            return False
+        content = self.path.read_text(encoding="utf-8")
+        for line_number, line in enumerate(content.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = JournalEntry.model_validate_json(line)
+            except ValidationError:
+                logger.warning(f"Skipping unreadable journal line {line_number} in {self.path}")
+                continue
+            self._entries[entry.key] = entry
+        return bool(content) and not content.endswith("\n")
+
+    def get(
+        self,
+        letter: int,
+        paragraph: int,
+        sentence: int,
+        phase: str,
+        prompt_version: str
+    ) -> Optional[JournalEntry]:
+        """Return the completed entry for a sentence, or None."""
+        return self._entries.get((letter, paragraph, sentence, phase, prompt_version))
+
+    def record(
+        self,
+        letter: int,
+        paragraph: int,
+        sentence: int,
+        phase: str,
+        prompt_version: str,
+        source: str,
+        reply: Optional[str],
+        translation: str
+    ) -> JournalEntry:
+        """Durably append a completed sentence."""
+        entry = JournalEntry(
+            letter=letter,
+            paragraph=paragraph,
+            sentence=sentence,
+            phase=phase,
+            prompt_version=prompt_version,
+            source=source,
+            reply=reply,
+            translation=translation,
+            recorded_at=time.time()
+        )
+        line = json.dumps(entry.model_dump(), ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._entries[entry.key] = entry
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        """Close the journal file."""
+        with self._lock:
+            self._file.close()
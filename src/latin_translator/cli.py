@@ -0,0 +1,141 @@
+"""Command line entry point: `latin-translate`.
+
+Example:
+    latin-translate 1-12 20 --workers 4 --store /shared/seneca/run.sqlite3 --output seneca.epub
+
+Run the same command on several hosts with a shared --store to split the
+letters between them.
+"""
+
+from pathlib import Path
+from typing import List, Optional
+import argparse
+import logging
+import sys
+
+from .cache import CorpusSnapshot, HtmlMirror
+from .service.corpus_runner import CorpusRunner
+from .service.epub_builder import EpubConfig
+from .service.seneca_letter_downloader import SenecaLetterDownloader
+
+logger = logging.getLogger(__name__)
+
+FIRST_LETTER = 1
+LAST_LETTER = 124
+
+
+def parse_letter_ranges(specs: List[str]) -> List[int]:
+    """
+    Parse letter specifications such as ["1-12", "20", "30-35,40"] into sorted letter numbers.
+
+    Raises:
+        ValueError: If a specification is malformed or outside 1-124
+    """
+    numbers = set()
+    for spec in specs:
+        for part in spec.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            start, _, end = part.partition("-")
+            try:
+                first, last = int(start), int(end or start)
+            except ValueError:
+                raise ValueError(f"Invalid letter range: {part!r}") from None
+            if first > last or first < FIRST_LETTER or last > LAST_LETTER:
+                raise ValueError(f"Letter range {part!r} is outside {FIRST_LETTER}-{LAST_LETTER}")
+            numbers.update(range(first, last + 1))
+    return sorted(numbers)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="latin-translate",
+        description="Translate Seneca's letters with a pool of workers and build an EPUB."
+    )
+    parser.add_argument(
+        "letters", nargs="*", default=[f"{FIRST_LETTER}-{LAST_LETTER}"],
+        help="Letter numbers or ranges, e.g. 1-12 20 30-35 (default: all)"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes on this host")
+    parser.add_argument(
+        "--store", type=Path, default=Path(".cache/corpus_run.sqlite3"),
+        help="Shared SQLite lease and results database"
+    )
+    parser.add_argument("--journal-dir", type=Path, help="Per-letter checkpoint journals (default: beside --store)")
+    parser.add_argument("--lease-seconds", type=float, default=900.0, help="How long a claim lasts without renewal")
+    parser.add_argument("--owner", help="Name for this host in the lease table")
+    parser.add_argument("--output", type=Path, help="EPUB path (default: timestamped file)")
+    parser.add_argument("--no-epub", action="store_true", help="Only translate; do not build the EPUB")
+    parser.add_argument("--model", default="gpt-4o", help="OpenAI model")
+    parser.add_argument("--batch-paragraphs", action="store_true", help="One JSON request per paragraph phase")
+    parser.add_argument("--combined", action="store_true", help="One JSON request per sentence for both phases")
+    parser.add_argument("--context-tokens", type=int, help="Prompt token budget for conversation history")
+    parser.add_argument("--mirror", type=Path, help="Local mirror directory for source pages")
+    parser.add_argument("--snapshot", type=Path, help="Pre-parsed corpus snapshot to read letters from")
+    parser.add_argument("--status", action="store_true", help="Report progress and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Debug logging")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(processName)s %(name)s %(levelname)s: %(message)s"
+    )
+    try:
+        numbers = parse_letter_ranges(args.letters)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    runner = CorpusRunner(
+        args.store,
+        workers=args.workers,
+        translator_options={
+            "model": args.model,
+            "batch_paragraphs": args.batch_paragraphs,
+            "combined": args.combined,
+            "context_tokens": args.context_tokens,
+        },
+        journal_dir=args.journal_dir,
+        lease_seconds=args.lease_seconds,
+        owner_prefix=args.owner
+    )
+    if args.status:
+        # Progress lives in the lease store; no need to fetch the letters
+        counts = runner.counts(numbers)
+        logger.info(f"Letters done: {counts.done}, in progress elsewhere: {counts.leased}, pending: {counts.pending}")
+        return 0
+
+    downloader = SenecaLetterDownloader(
+        mirror=HtmlMirror(args.mirror) if args.mirror else None,
+        snapshot=CorpusSnapshot(args.snapshot) if args.snapshot else None
+    )
+    # One concurrent download of every page rather than one page per letter
+    by_number = {letter.number: letter for letter in downloader.fetch_all_letters()}
+    missing = [number for number in numbers if number not in by_number]
+    if missing:
+        logger.error(f"Could not find letters {missing}")
+        return 1
+    letters = [by_number[number] for number in numbers]
+
+    runner.run(letters)
+    counts = runner.counts(numbers)
+    logger.info(f"Letters done: {counts.done}, in progress elsewhere: {counts.leased}, pending: {counts.pending}")
+    if args.no_epub:
+        return 0
+    if counts.done < len(letters):
+        logger.info("Not building the EPUB until every letter is done; rerun when other workers finish")
+        return 0
+
+    letter_range = f"Letters {numbers[0]}-{numbers[-1]}"
+    config = EpubConfig(title_template=f"Letters of Seneca ({letter_range}) - {{timestamp}}")
+    output_path = runner.build_epub(letters, args.output, config)
+    logger.info(f"Created EPUB at: {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,17 @@
-from pydantic import BaseSettings, SecretStr
+from typing import Optional
+
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
 
 class Settings(BaseSettings):
-    openai_api_key: SecretStr
-    openai_api_base_url: str = "https://api.openai.com/v1"
-    
-    class Config:
-        env_file = ".env"
+    """Environment configuration, read from environment variables and `.env`."""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    openai_api_key: Optional[SecretStr] = None
+    openai_api_base_url: str = "https://api.openai.com/v1"  # e.g. a MockOpenAIServer for offline runs
+
 
-settings = Settings() 
\ No newline at end of file
+def get_settings() -> Settings:
+    """Read the current settings (environment changes are picked up on every call)."""
+    return Settings()
@@ -0,0 +1,21 @@
+"""Custom exception types for the Latin Translator project."""
+
+
+class LatinTranslatorError(Exception):
+    """Base class for all errors raised by the Latin Translator project."""
+
+
+class CacheMissError(LatinTranslatorError):
+    """Raised when a translation is not in the cache while running in replay mode."""
+
+
+class BatchJobError(LatinTranslatorError):
+    """Raised when a batch translation job ends in a non-completed state."""
+
+
+class MirrorMissError(LatinTranslatorError):
+    """Raised when an offline HtmlMirror has no copy of a requested page."""
+
+
+class PromptNotFoundError(LatinTranslatorError):
+    """Raised when the prompt registry has no file for a requested prompt or version."""
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Literal, Union
 from pydantic import BaseModel
 
 class Letter(BaseModel):
@@ -34,4 +34,70 @@ class TranslationStages(BaseModel):
         Display all stages of translation for a list of paragraphs using print.
         """
         for stage in stages:
-            stage.display() 
\ No newline at end of file
+            stage.display()
+
+    @staticmethod
+    def compare_many(variants: Dict[str, List["TranslationStages"]]) -> str:
+        """
+        Compare the translations of the same letter by several variants as Markdown.
+
+        For each sentence the Latin and the direct translation are shown once (the
+        direct translation per variant only where they differ), followed by every
+        variant's rhetorical translation, labelled with the variant's name.
+        """
+        md_str = ""
+        names = list(variants)
+        num_paras = max((len(stages) for stages in variants.values()), default=0)
+        for i in range(num_paras):
+            paragraphs = {name: variants[name][i] for name in names if i < len(variants[name])}
+            first = next(iter(paragraphs.values()))
+            md_str += f"## Paragraph {first.paragraph_index}\n\n"
+            for j, original in enumerate(first.original):
+                md_str += f"**Sentence {j+1}:**\n\n- Latin: `{original}`\n"
+                directs = {name: p.direct[j] if j < len(p.direct) else "" for name, p in paragraphs.items()}
+                if len(set(directs.values())) == 1:
+                    md_str += f"- Direct: `{next(iter(directs.values()))}`\n"
+                else:
+                    md_str += "".join(f"- Direct ({name}): `{direct}`\n" for name, direct in directs.items())
+                for name, paragraph in paragraphs.items():
+                    rhetorical = paragraph.rhetorical[j] if j < len(paragraph.rhetorical) else ""
+                    md_str += f"- {name}: `{rhetorical}`\n"
+                md_str += "\n"
+            md_str += "---\n\n"
+        return md_str
+
+
+class PromptVariant(BaseModel):
+    """One rhetorical-phase configuration in an A/B run; unset fields use the translator's own."""
+    name: str
+    prompt: Optional[str] = None  # Rhetorical system prompt
+    model: Optional[str] = None
+    temperature: Optional[float] = None
+
+
+class TokenEvent(BaseModel):
+    """A piece of streamed model output for one sentence."""
+    type: Literal["token"] = "token"
+    paragraph_index: int
+    phase: Literal["direct", "rhetorical"]
+    sentence_index: int  # Zero-based position within the paragraph
+    text: str
+
+
+class SentenceEvent(BaseModel):
+    """A sentence finished one translation phase."""
+    type: Literal["sentence"] = "sentence"
+    paragraph_index: int
+    phase: Literal["direct", "rhetorical"]
+    sentence_index: int
+    source: str       # Text that was translated (Latin for direct, direct English for rhetorical)
+    translation: str  # Cleaned translation
+
+
+class ParagraphEvent(BaseModel):
+    """A paragraph finished both phases."""
+    type: Literal["paragraph"] = "paragraph"
+    stages: TranslationStages
+
+
+TranslationEvent = Union[TokenEvent, SentenceEvent, ParagraphEvent]
@@ -0,0 +1,235 @@
+"""Corpus-scale translation through the OpenAI Batch API request format."""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Tuple
+import json
+import logging
+import time
+
+from openai import OpenAI
+
+from ..exceptions import BatchJobError
+from ..models import Letter, TranslationStages
+from ..utils import split_paragraphs, split_text_with_quotes, clean_translation
+from .letter_translator import LetterTranslator
+
+logger = logging.getLogger(__name__)
+
+# (letter number, paragraph index, sentence index)
+SentenceKey = Tuple[int, int, int]
+
+
+class BatchBackend(ABC):
+    """Interface to a service that runs JSONL files of chat completion requests."""
+
+    TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    @abstractmethod
+    def submit(self, requests_path: Path) -> str:
+        """Upload a JSONL request file, start a batch and return its id."""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> str:
+        """Return the batch status (e.g. 'in_progress', 'completed', 'failed')."""
+
+    @abstractmethod
+    def results(self, batch_id: str) -> List[dict]:
+        """Return the output lines of a completed batch."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """BatchBackend backed by the OpenAI Files and Batches endpoints."""
+
+    def __init__(self, client: OpenAI, completion_window: str = "24h"):
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, requests_path: Path) -> str:
+        with open(requests_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> List[dict]:
+        batch = self.client.batches.retrieve(batch_id)
+        lines: List[dict] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = self.client.files.content(file_id).text
+                lines.extend(json.loads(line) for line in content.splitlines() if line.strip())
+        return lines
+
+
+class BatchTranslationJob:
+    """
+    Translates many letters through a batch endpoint in two waves.
+
+    Wave one submits a direct translation request for every sentence of every
+    letter; wave two submits a rhetorical request for every direct result. Batch
+    requests are independent, so unlike process_letter there is no rolling
+    context: each request carries only the system prompt and its sentence.
+    Lone quotation marks are preserved without a request, as in translate_chunk,
+    and any sentence whose batch result errored is retried with translate_chunk.
+    """
+
+    def __init__(
+        self,
+        translator: LetterTranslator,
+        backend: BatchBackend,
+        work_dir: Path,
+        poll_interval: float = 60.0,
+        max_requests_per_file: int = 50_000
+    ):
+        """
+        Args:
+            translator: Supplies the prompts, model and temperature
+            backend: Where request files are submitted
+            work_dir: Directory for the JSONL request files
+            poll_interval: Seconds between status checks
+            max_requests_per_file: Requests per submitted file (the Batch API caps this)
+        """
+        self.translator = translator
+        self.backend = backend
+        self.work_dir = Path(work_dir)
+        self.poll_interval = poll_interval
+        self.max_requests_per_file = max_requests_per_file
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _custom_id(phase: str, key: SentenceKey) -> str:
+        letter_number, paragraph_index, sentence_index = key
+        return f"{phase}-{letter_number}-{paragraph_index}-{sentence_index}"
+
+    def _request_line(self, phase: str, key: SentenceKey, text: str, system_prompt: str) -> dict:
+        return {
+            "custom_id": self._custom_id(phase, key),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.translator.model,
+                "temperature": self.translator.temperature,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": text},
+                ],
+                "prompt_cache_key": self.translator.prompt_cache_key(system_prompt),
+            },
+        }
+
+    def write_request_files(self, phase: str, sentences: Dict[SentenceKey, str]) -> List[Path]:
+        """
+        Write the batch request JSONL files for one wave.
+
+        Args:
+            phase: 'direct' or 'rhetorical'
+            sentences: Text to translate, keyed by sentence position
+
+        Returns:
+            Paths of the written request files
+        """
+        system_prompt = self.translator.direct_prompt if phase == "direct" else self.translator.rhetorical_prompt
+        items = list(sentences.items())
+        paths: List[Path] = []
+        for part, start in enumerate(range(0, len(items), self.max_requests_per_file)):
+            path = self.work_dir / f"{phase}_requests_{part}.jsonl"
+            with open(path, "w", encoding="utf-8") as f:
+                for key, text in items[start:start + self.max_requests_per_file]:
+                    f.write(json.dumps(self._request_line(phase, key, text, system_prompt), ensure_ascii=False) + "\n")
+            paths.append(path)
+        return paths
+
+    def wait(self, batch_id: str) -> None:
+        """Poll a batch until it reaches a terminal status."""
+        while True:
+            status = self.backend.status(batch_id)
+            if status in BatchBackend.TERMINAL_STATUSES:
+                break
+            logger.info(f"Batch {batch_id} is {status}; checking again in {self.poll_interval}s")
+            time.sleep(self.poll_interval)
+        if status != "completed":
+            raise BatchJobError(f"Batch {batch_id} ended with status '{status}'")
+
+    def run_wave(self, phase: str, sentences: Dict[SentenceKey, str]) -> Dict[SentenceKey, str]:
+        """
+        Translate one wave of sentences through the batch backend.
+
+        Args:
+            phase: 'direct' or 'rhetorical'
+            sentences: Text to translate, keyed by sentence position
+
+        Returns:
+            Cleaned translations keyed by sentence position
+        """
+        system_prompt = self.translator.direct_prompt if phase == "direct" else self.translator.rhetorical_prompt
+        pending = {key: text for key, text in sentences.items() if not self.translator._is_lone_quote(text)}
+        translations = {key: text for key, text in sentences.items() if key not in pending}
+        if not pending:
+            return translations
+
+        keys_by_id = {self._custom_id(phase, key): key for key in pending}
+        batch_ids = [self.backend.submit(path) for path in self.write_request_files(phase, pending)]
+        logger.info(f"Submitted {len(pending)} {phase} requests in {len(batch_ids)} batch(es)")
+
+        for batch_id in batch_ids:
+            self.wait(batch_id)
+            for line in self.backend.results(batch_id):
+                key = keys_by_id.get(line.get("custom_id"))
+                response = line.get("response") or {}
+                if key is None or line.get("error") or response.get("status_code") != 200:
+                    continue
+                reply = response["body"]["choices"][0]["message"].get("content")
+                if reply is None:
+                    # e.g. a refusal or content filter; retried below like a failed line
+                    continue
+                translations[key] = clean_translation(reply.strip())
+
+        for key, text in pending.items():
+            if key not in translations:
+                logger.warning(f"No batch result for {self._custom_id(phase, key)}; translating directly")
+                translations[key], _ = self.translator.translate_chunk(text, system_prompt)
+        return translations
+
+    def run(self, letters: List[Letter]) -> Dict[int, List[TranslationStages]]:
+        """
+        Translate letters through both phases.
+
+        Args:
+            letters: Letters to translate, e.g. SenecaLetterDownloader.fetch_all_letters()
+
+        Returns:
+            TranslationStages for each letter, keyed by letter number
+        """
+        paragraphs: Dict[int, List[List[str]]] = {
+            letter.number: [split_text_with_quotes(p) for p in split_paragraphs(letter.content)]
+            for letter in letters
+        }
+        originals: Dict[SentenceKey, str] = {
+            (number, p_idx, s_idx): sentence
+            for number, letter_paragraphs in paragraphs.items()
+            for p_idx, sentences in enumerate(letter_paragraphs, start=1)
+            for s_idx, sentence in enumerate(sentences)
+        }
+
+        direct = self.run_wave("direct", originals)
+        rhetorical = self.run_wave("rhetorical", direct)
+
+        return {
+            number: [
+                TranslationStages(
+                    paragraph_index=p_idx,
+                    original=sentences,
+                    direct=[direct[(number, p_idx, s_idx)] for s_idx in range(len(sentences))],
+                    rhetorical=[rhetorical[(number, p_idx, s_idx)] for s_idx in range(len(sentences))]
+                )
+                for p_idx, sentences in enumerate(letter_paragraphs, start=1)
+            ]
+            for number, letter_paragraphs in paragraphs.items()
+        }
@@ -0,0 +1,364 @@
+"""Shard corpus translation across processes and hosts that share a filesystem."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from pydantic import BaseModel
+
+from ..models import Letter, TranslationStages
+from ..cache import TranslationJournal
+from .epub_builder import EpubBuilder, EpubConfig
+from .letter_translator import LetterTranslator
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseCounts(BaseModel):
+    """How many of a set of letters are done, leased to a live worker, or free to claim."""
+    done: int = 0
+    leased: int = 0
+    pending: int = 0
+
+
+class LeaseStore:
+    """A SQLite lease table and results store shared by every worker in a run.
+
+    A worker claims one letter at a time by taking a time-limited lease on it
+    and renews the lease while it translates. A lease that is not renewed
+    (because the worker crashed or its host went away) expires, and the letter
+    can then be claimed by another worker. Completed translations are stored in
+    the same database, so the EPUB can be built by whichever host finishes last.
+
+    The database uses SQLite's default rollback journal rather than WAL, because
+    WAL needs shared memory and does not work on network filesystems. Claims
+    take a write lock (BEGIN IMMEDIATE), so two workers never claim the same letter.
+    """
+
+    def __init__(self, path: Union[str, Path], lease_seconds: float = 900.0, timeout: float = 60.0):
+        """Open (or create) the store.
+
+        Args:
+            path: Location of the SQLite file, on a filesystem all workers can reach
+            lease_seconds: How long a claim lasts without renewal
+            timeout: Seconds to wait for another worker's write lock
+        """
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=timeout, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            " letter INTEGER PRIMARY KEY,"
+            " owner TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 1)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " letter INTEGER PRIMARY KEY,"
+            " stages TEXT NOT NULL,"
+            " owner TEXT NOT NULL,"
+            " completed_at REAL NOT NULL)"
+        )
+
+    def claim(self, letters: List[int], owner: str) -> Optional[int]:
+        """
+        Lease the first letter in `letters` that is neither done nor leased by a live worker.
+
+        Returns:
+            The claimed letter number, or None if there is nothing left to claim
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = {row[0] for row in self._conn.execute("SELECT letter FROM results")}
+            live = {row[0] for row in self._conn.execute("SELECT letter FROM leases WHERE expires_at > ?", (now,))}
+            for letter in letters:
+                if letter in done or letter in live:
+                    continue
+                self._conn.execute(
+                    "INSERT INTO leases (letter, owner, expires_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(letter) DO UPDATE SET"
+                    " owner = excluded.owner, expires_at = excluded.expires_at, attempts = attempts + 1",
+                    (letter, owner, now + self.lease_seconds)
+                )
+                self._conn.execute("COMMIT")
+                return letter
+            self._conn.execute("COMMIT")
+            return None
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def renew(self, letter: int, owner: str) -> bool:
+        """Extend a lease. Returns False if the lease now belongs to someone else."""
+        cursor = self._conn.execute(
+            "UPDATE leases SET expires_at = ? WHERE letter = ? AND owner = ?",
+            (time.time() + self.lease_seconds, letter, owner)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, letter: int, owner: str) -> None:
+        """Give up a lease early so another worker can claim the letter."""
+        self._conn.execute("UPDATE leases SET expires_at = 0 WHERE letter = ? AND owner = ?", (letter, owner))
+
+    def complete(self, letter: int, owner: str, stages: List[TranslationStages]) -> bool:
+        """
+        Store a letter's translation and drop its lease, if `owner` still holds a live lease.
+
+        Returns:
+            False if the lease expired or was claimed by another worker; nothing is written then
+        """
+        payload = json.dumps([stage.model_dump() for stage in stages], ensure_ascii=False)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self._conn.execute(
+                "DELETE FROM leases WHERE letter = ? AND owner = ? AND expires_at > ?",
+                (letter, owner, time.time())
+            )
+            if cursor.rowcount != 1:
+                self._conn.execute("ROLLBACK")
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (letter, stages, owner, completed_at) VALUES (?, ?, ?, ?)",
+                (letter, payload, owner, time.time())
+            )
+            self._conn.execute("COMMIT")
+            return True
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def results(self, letters: Optional[List[int]] = None) -> Dict[int, List[TranslationStages]]:
+        """Completed translations, optionally limited to some letters, in letter order."""
+        rows = self._conn.execute("SELECT letter, stages FROM results ORDER BY letter").fetchall()
+        wanted = set(letters) if letters is not None else None
+        return {
+            letter: [TranslationStages.model_validate(stage) for stage in json.loads(stages)]
+            for letter, stages in rows
+            if wanted is None or letter in wanted
+        }
+
+    def counts(self, letters: List[int]) -> LeaseCounts:
+        """Progress of a set of letters across all workers."""
+        now = time.time()
+        done = {row[0] for row in self._conn.execute("SELECT letter FROM results")}
+        live = {row[0] for row in self._conn.execute("SELECT letter FROM leases WHERE expires_at > ?", (now,))}
+        counts = LeaseCounts()
+        for letter in letters:
+            if letter in done:
+                counts.done += 1
+            elif letter in live:
+                counts.leased += 1
+            else:
+                counts.pending += 1
+        return counts
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _LeaseHeartbeat:
+    """Renew a lease in the background until stopped or the lease is lost."""
+
+    def __init__(self, store_path: Path, lease_seconds: float, letter: int, owner: str):
+        self._stop = threading.Event()
+        self._lost = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(store_path, lease_seconds, letter, owner),
+            daemon=True
+        )
+
+    def _run(self, store_path: Path, lease_seconds: float, letter: int, owner: str) -> None:
+        # SQLite connections are per-thread, so the heartbeat opens its own
+        store = LeaseStore(store_path, lease_seconds)
+        try:
+            while not self._stop.wait(lease_seconds / 3):
+                if not store.renew(letter, owner):
+                    logger.warning(f"Lost lease on letter {letter} to another worker")
+                    self._lost.set()
+                    return
+        finally:
+            store.close()
+
+    @property
+    def lost(self) -> bool:
+        """Whether a renewal found the lease expired or taken over."""
+        return self._lost.is_set()
+
+    def __enter__(self) -> "_LeaseHeartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    store_path: Union[str, Path],
+    letters: List[Letter],
+    owner: str,
+    translator_options: Optional[dict] = None,
+    journal_dir: Optional[Union[str, Path]] = None,
+    lease_seconds: float = 900.0
+) -> List[int]:
+    """
+    Claim and translate letters until none are left. Runs in a worker process.
+
+    Each letter gets its own checkpoint journal under journal_dir, so a worker that
+    picks up an expired lease resumes where the previous holder stopped. A letter
+    that fails is released for another worker and skipped by this one.
+
+    Returns:
+        Numbers of the letters this worker completed
+    """
+    store = LeaseStore(store_path, lease_seconds)
+    translator = LetterTranslator(**(translator_options or {}))
+    by_number = {letter.number: letter for letter in letters}
+    completed: List[int] = []
+    failed: Set[int] = set()
+    try:
+        while (number := store.claim([n for n in by_number if n not in failed], owner)) is not None:
+            logger.info(f"{owner} claimed letter {number}")
+            journal = (
+                TranslationJournal(Path(journal_dir) / f"letter_{number:03d}.jsonl")
+                if journal_dir is not None else None
+            )
+            translator.journal = journal
+            try:
+                with _LeaseHeartbeat(Path(store_path), lease_seconds, number, owner) as heartbeat:
+                    stages = translator.process_letter(by_number[number].content, letter_number=number)
+            except Exception:
+                logger.exception(f"{owner} failed to translate letter {number}")
+                store.release(number, owner)
+                failed.add(number)
+                continue
+            finally:
+                if journal is not None:
+                    journal.close()
+            # The letter now belongs to another worker; leave the result to it
+            if heartbeat.lost or not store.complete(number, owner, stages):
+                logger.warning(f"{owner} dropped its translation of letter {number} after losing the lease")
+                continue
+            completed.append(number)
+            logger.info(f"{owner} completed letter {number}")
+    finally:
+        store.close()
+    if failed:
+        logger.error(f"{owner} left letters {sorted(failed)} pending after failures")
+    return completed
+
+
+class CorpusRunner:
+    """Translate a set of letters with a pool of worker processes.
+
+    Workers coordinate only through a LeaseStore, so several runners on
+    different hosts can point at the same store and split the letters between
+    them without doing any letter twice. Run the same command on every host;
+    whichever finishes last has all results and can build the EPUB.
+
+    Example:
+        >>> runner = CorpusRunner(Path("/shared/seneca/run.sqlite3"), workers=4)
+        >>> runner.run(letters)
+        >>> runner.build_epub(letters, Path("seneca.epub"))
+    """
+
+    def __init__(
+        self,
+        store_path: Union[str, Path],
+        workers: int = 1,
+        translator_options: Optional[dict] = None,
+        journal_dir: Optional[Union[str, Path]] = None,
+        lease_seconds: float = 900.0,
+        owner_prefix: Optional[str] = None
+    ):
+        """
+        Args:
+            store_path: Shared SQLite lease/results database
+            workers: Number of worker processes on this host
+            translator_options: Keyword arguments for each worker's LetterTranslator; must be picklable
+            journal_dir: Directory for per-letter checkpoint journals; defaults to beside the store
+            lease_seconds: Lease duration; leases are renewed every third of this
+            owner_prefix: Name identifying this host in the lease table
+        """
+        self.store_path = Path(store_path)
+        self.workers = workers
+        self.translator_options = translator_options or {}
+        self.journal_dir = Path(journal_dir) if journal_dir is not None else self.store_path.parent / "journals"
+        self.lease_seconds = lease_seconds
+        self.owner_prefix = owner_prefix or f"{socket.gethostname()}-{os.getpid()}"
+
+    def run(self, letters: List[Letter]) -> Dict[int, List[TranslationStages]]:
+        """
+        Translate every letter not already done, then return the results available so far.
+
+        Letters leased by workers on other hosts are left to them, so the returned
+        dict may be missing some letters; see LeaseStore.counts.
+        """
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        owners = [f"{self.owner_prefix}-w{i}" for i in range(self.workers)]
+        logger.info(f"Translating up to {len(letters)} letters with {self.workers} workers")
+        if self.workers == 1:
+            run_worker(
+                self.store_path, letters, owners[0],
+                self.translator_options, self.journal_dir, self.lease_seconds
+            )
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(
+                        run_worker, self.store_path, letters, owner,
+                        self.translator_options, self.journal_dir, self.lease_seconds
+                    )
+                    for owner in owners
+                ]
+                for future in futures:
+                    future.result()
+        return self.results(letters)
+
+    def results(self, letters: List[Letter]) -> Dict[int, List[TranslationStages]]:
+        store = LeaseStore(self.store_path, self.lease_seconds)
+        try:
+            return store.results([letter.number for letter in letters])
+        finally:
+            store.close()
+
+    def counts(self, numbers: List[int]) -> LeaseCounts:
+        """Progress of the given letter numbers; needs only the lease store, not the letters."""
+        store = LeaseStore(self.store_path, self.lease_seconds)
+        try:
+            return store.counts(numbers)
+        finally:
+            store.close()
+
+    def build_epub(
+        self,
+        letters: List[Letter],
+        output_path: Optional[Path] = None,
+        config: Optional[EpubConfig] = None
+    ) -> Path:
+        """
+        Build an EPUB of the rhetorical translations of the given letters.
+
+        Raises:
+            ValueError: If any of the letters has not been translated yet
+        """
+        results = self.results(letters)
+        missing = [letter.number for letter in letters if letter.number not in results]
+        if missing:
+            raise ValueError(f"Cannot build EPUB: letters {missing} are not translated yet")
+        builder = EpubBuilder(config=config)
+        for letter in sorted(letters, key=lambda letter: letter.number):
+            translated_text = "\n\n".join(" ".join(stage.rhetorical) for stage in results[letter.number])
+            builder.add_letter(letter, translated_text)
+        return builder.save(output_path)
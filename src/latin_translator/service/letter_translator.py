@@ -1,38 +1,52 @@
-from typing import List, Optional
-import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import lru_cache
+from string import Template
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
+import asyncio
+import copy
+import time
 import logging
 import json
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 import httpx
-from ..models import Letter, TranslationStages
-from ..utils import split_paragraphs, split_text_with_quotes, clean_translation
+from ..models import Letter, PromptVariant, TranslationStages, TokenEvent, SentenceEvent, ParagraphEvent, TranslationEvent
+from ..cache import TranslationCache, TranslationJournal, prompt_version
+from ..config import get_settings
+from ..exceptions import CacheMissError, PromptNotFoundError
+from ..utils import split_paragraphs, split_text_with_quotes, clean_translation, AdaptiveRateLimiter
+from ..utils.rate_limiter import estimate_request_tokens, parse_retry_after
+from ..utils.retry_policy import (
+    RETRYABLE_ERRORS, UNTHROTTLED_RETRYABLE_ERRORS, RetryPolicy, LatencyTracker, call_with_retry, acall_with_retry
+)
+from ..utils.metrics import TranslationMetrics, CallLabels
+from ..utils.http_instrumentation import HttpInstrumentation
+from ..utils.context_budget import ContextBudget
+from ..utils.conversation_window import ConversationWindow, History
+from ..utils.prompt_registry import get_prompt_registry
 
 # Configure logging
 # Removed basicConfig to use global configuration
 logger = logging.getLogger(__name__)
-http_logger = logging.getLogger(f"{__name__}.http")
-
-# Define request and response hooks for logging
-def log_request(request):
-    method = request.method
-    url = str(request.url)
-    http_logger.debug(f"OpenAI Request: {method} {url}")
-    
-    # Log the request body
-    if request.content:
-        try:
-            body = request.content.decode("utf-8")
-            # Try to parse and pretty-print if it's JSON
-            try:
-                json_body = json.loads(body)
-                http_logger.debug(f"Request body: {json.dumps(json_body, indent=2)}")
-            except json.JSONDecodeError:
-                http_logger.debug(f"Request body: {body}")
-        except Exception as e:
-            http_logger.debug(f"Could not decode request body: {e}")
 
-def log_response(response):
-    http_logger.debug(f"OpenAI Response: HTTP {response.status_code}")
+# Letter being translated in the current (async) context, used to label metrics
+_current_letter: ContextVar[Optional[int]] = ContextVar("latin_translator_letter", default=None)
+
+# Registry prompt texts by (name, pinned version), resolved once per letter so that a
+# hot reload takes effect between letters rather than halfway through a paragraph
+_letter_prompts: ContextVar[Optional[Dict[Tuple[str, Optional[int]], str]]] = ContextVar(
+    "latin_translator_prompts", default=None
+)
+
+# Prompts every letter may need; see LetterTranslator._letter_scope
+_PROMPT_NAMES = ("direct", "rhetorical", "combined", "batch")
+
+
+@lru_cache(maxsize=32)
+def _render_combined(template: str, direct: str, rhetorical: str) -> str:
+    return Template(template).substitute(direct=direct, rhetorical=rhetorical)
+
 
 class LetterTranslator:
     """
@@ -42,106 +56,794 @@ class LetterTranslator:
     2. Rhetorical rewrite for modern clarity while maintaining philosophical precision
     """
 
-    def __init__(self, model: str = "gpt-4o", max_context: int = 2):
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        max_context: int = 2,
+        context_tokens: Optional[int] = None,
+        max_concurrency: int = 4,
+        temperature: float = 0.7,
+        cache: Optional[TranslationCache] = None,
+        batch_paragraphs: bool = False,
+        combined: bool = False,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        journal: Optional[TranslationJournal] = None,
+        metrics: Optional[TranslationMetrics] = None,
+        instrumentation: Optional[HttpInstrumentation] = None,
+        http_transport=None,
+        base_url: Optional[str] = None,
+        prompt_versions: Optional[Dict[str, int]] = None
+    ):
         """
         Initialize the orchestrator with configuration.
 
         Args:
             model: The OpenAI model to use for translation
             max_context: Number of previous exchanges to include for context
+            context_tokens: Optional prompt token budget; when set, previous exchanges are kept
+                newest first while they fit (see ContextBudget) and max_context is ignored
+            max_concurrency: Maximum number of paragraphs translated at once by aprocess_letter
+            temperature: Sampling temperature for completions
+            cache: Optional persistent cache of replies; in replay mode misses raise CacheMissError
+            batch_paragraphs: Translate all sentences of a paragraph in one structured (JSON)
+                request per phase, falling back to per-sentence requests on a malformed reply
+            combined: Get the direct and rhetorical translations of each sentence from one
+                structured (JSON) request, halving the request count; a paragraph with a malformed
+                reply is translated in two phases instead. Takes precedence over batch_paragraphs
+            rate_limiter: Optional limiter shared by all calls; it reads rate-limit headers from
+                every response and handles 429s itself, so the client's own retries are disabled
+            retry_policy: Optional retries with jittered backoff, per-call deadlines and hedging;
+                replaces the client's own retries. With a rate_limiter, 429s are left to its throttle retries
+            journal: Optional checkpoint journal; process_letter and aprocess_letter record each
+                completed sentence and skip journaled ones when given a letter_number
+            metrics: Optional collector of per-call latency, token usage and cost; exported
+                at the end of every process_letter/aprocess_letter
+            instrumentation: HTTP hooks for logging and capturing API traffic; defaults to
+                logging requests only when the `.http` logger is at DEBUG
+            http_transport: Optional httpx transport used by both clients instead of the network,
+                e.g. MockOpenAITransport; it must support sync and async requests as needed
+            base_url: API base URL; defaults to Settings.openai_api_base_url, which can point at a
+                MockOpenAIServer for offline runs
+            prompt_versions: Pin prompts to a version, e.g. {"direct": 1}; others use the highest
+                version in the prompt registry, and edited prompt files take effect on the next request
         """
-        # Create a client with our logging hooks
-        event_hooks = {"request": [log_request], "response": [log_response]}
-        http_client = httpx.Client(event_hooks=event_hooks)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.latency_tracker = LatencyTracker()
+        self.instrumentation = instrumentation if instrumentation is not None else HttpInstrumentation()
+        
+        # Create a client with our instrumentation hooks
+        event_hooks = self.instrumentation.event_hooks()
+        if rate_limiter is not None:
+            event_hooks["response"].append(rate_limiter.response_hook)
+        self.http_transport = http_transport
+        settings = get_settings()
+        self.base_url = base_url or settings.openai_api_base_url
+        self._api_key = settings.openai_api_key.get_secret_value() if settings.openai_api_key else None
+        http_client = httpx.Client(event_hooks=event_hooks, transport=http_transport)
         
+        client_options = {"max_retries": 0} if self._manages_retries else {}
         self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            http_client=http_client
+            api_key=self._api_key,
+            base_url=self.base_url,
+            http_client=http_client,
+            **client_options
         )
         
+        # The async client is created on first use so sync-only callers never need it
+        self._async_client: Optional[AsyncOpenAI] = None
+        
         self.model = model
         self.max_context = max_context
+        self.context_budget = ContextBudget(context_tokens) if context_tokens is not None else None
+        self.max_concurrency = max_concurrency
+        self.temperature = temperature
+        self.cache = cache
+        self.batch_paragraphs = batch_paragraphs
+        self.combined = combined
+        self.journal = journal
+        self.metrics = metrics
+        self.prompt_versions = prompt_versions or {}
+        self._prompt_overrides: Dict[str, str] = {}
+        # (phase, prompt version) of system prompts already seen, for metric labels
+        self._prompt_labels: Dict[str, Tuple[str, str]] = {}
         self._load_prompts()
         logger.info(f"LetterTranslator initialized with model={model}, max_context={max_context}")
 
+    @property
+    def _manages_retries(self) -> bool:
+        """Whether retries are handled here rather than by the OpenAI client."""
+        return self.rate_limiter is not None or self.retry_policy is not None
+
+    @property
+    def _retryable_errors(self) -> tuple:
+        """Errors the retry policy retries; 429s are left to the rate limiter when there is one."""
+        return RETRYABLE_ERRORS if self.rate_limiter is None else UNTHROTTLED_RETRYABLE_ERRORS
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client used by the async API, created lazily."""
+        self._ensure_async_client()
+        return self._async_client
+
+    def _ensure_async_client(self) -> None:
+        """Create the async client if this translator has none yet; copies made after share it."""
+        if self._async_client is None:
+            event_hooks = self.instrumentation.async_event_hooks()
+            client_options = {"max_retries": 0} if self._manages_retries else {}
+            if self.rate_limiter is not None:
+                event_hooks["response"].append(self.rate_limiter.async_response_hook)
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self.base_url,
+                http_client=httpx.AsyncClient(event_hooks=event_hooks, transport=self.http_transport),
+                **client_options
+            )
+
     def _load_prompts(self) -> None:
-        """Load prompt templates from files."""
-        base_path = os.path.dirname(os.path.dirname(__file__))
-        prompt_path = os.path.join(base_path, "prompts")
+        """Look up the phase prompts once so a missing prompt file fails at construction."""
+        # direct contains the Latin->English translation prompt,
+        # rhetorical the English->Modern English prompt
+        for name in ("direct", "rhetorical"):
+            self._prompt(name)
+
+    def _prompt(self, name: str) -> str:
+        """
+        A prompt's text: an override set on this translator, or the registry's version as
+        resolved for the current letter (the registry's current version outside a letter).
+        """
+        if name in self._prompt_overrides:
+            return self._prompt_overrides[name]
+        key = (name, self.prompt_versions.get(name))
+        resolved = _letter_prompts.get()
+        if resolved is not None and key in resolved:
+            return resolved[key]
+        return get_prompt_registry().get(*key).text
+
+    def _resolve_prompts(self) -> Dict[Tuple[str, Optional[int]], str]:
+        """Registry texts of the prompts a letter may use, looked up in one pass."""
+        registry = get_prompt_registry()
+        resolved = dict(_letter_prompts.get() or {})
+        for name in _PROMPT_NAMES:
+            key = (name, self.prompt_versions.get(name))
+            try:
+                resolved[key] = registry.get(*key).text
+            except PromptNotFoundError:
+                # Only an error if the letter actually needs it; _prompt raises then
+                continue
+        return resolved
+
+    @property
+    def direct_prompt(self) -> str:
+        return self._prompt("direct")
+
+    @direct_prompt.setter
+    def direct_prompt(self, text: str) -> None:
+        self._prompt_overrides["direct"] = text
+        self._prompt_labels = {}
+
+    @property
+    def rhetorical_prompt(self) -> str:
+        return self._prompt("rhetorical")
+
+    @rhetorical_prompt.setter
+    def rhetorical_prompt(self, text: str) -> None:
+        self._prompt_overrides["rhetorical"] = text
+        self._prompt_labels = {}
+
+    @property
+    def batch_template(self) -> Template:
+        """User message template for paragraph-batched requests."""
+        return Template(self._prompt("batch"))
+
+    @property
+    def combined_prompt(self) -> str:
+        """System prompt for combined mode: both phase prompts plus the JSON reply format."""
+        return _render_combined(self._prompt("combined"), self.direct_prompt, self.rhetorical_prompt)
+
+    @staticmethod
+    def _is_lone_quote(text: str) -> bool:
+        """Check whether text is a lone quotation mark (or very short run of them)."""
+        return len(text.strip()) <= 2 and all(char in "'\"" for char in text.strip())
+
+    def _window(self, system_prompt: str, conversation_history: Optional[History]) -> ConversationWindow:
+        """The conversation as a ConversationWindow, starting one or converting a message list."""
+        if isinstance(conversation_history, ConversationWindow):
+            return conversation_history
+        # A token budget picks from up to its max_exchanges; otherwise keep max_context
+        size = self.context_budget.max_exchanges if self.context_budget is not None else self.max_context
+        if conversation_history is None:
+            return ConversationWindow(system_prompt, size)
+        return ConversationWindow.from_messages(conversation_history, size)
+
+    def _preserve_chunk(
+        self,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History]
+    ) -> tuple[str, ConversationWindow]:
+        """Record text as its own translation without calling the LLM."""
+        logger.info(f"Detected lone quotation mark: '{text}'. Preserving as is.")
+        window = self._window(system_prompt, conversation_history)
+        # Add a dummy exchange to maintain conversation structure
+        window.add_exchange(text, text)
+        return text, window
+
+    def _prepare_messages(
+        self,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History]
+    ) -> tuple[List[dict], ConversationWindow]:
+        """
+        Add text to the conversation and select the messages to send.
+
+        Returns:
+            Tuple of (messages for the request, updated conversation window)
+        """
+        window = self._window(system_prompt, conversation_history)
+        window.ask(text)
+        messages = window.messages()
+        if self.context_budget is not None:
+            messages = self.context_budget.select(messages)
+        return messages, window
+
+    def _cached_reply(self, messages: List[dict], **params) -> tuple[Optional[str], Optional[str]]:
+        """
+        Look up a reply for messages in the cache, if one is configured.
+
+        Args:
+            messages: The request messages
+            **params: Extra request parameters that affect the reply (e.g. response_format)
+
+        Returns:
+            Tuple of (cached reply or None, cache key or None)
+
+        Raises:
+            CacheMissError: If the cache is in replay mode and has no entry
+        """
+        if self.cache is None:
+            return None, None
+        key = TranslationCache.make_key(messages, model=self.model, temperature=self.temperature, **params)
+        reply = self.cache.get(key)
+        if reply is not None:
+            logger.info(f"Cache hit for request with {len(messages)} messages")
+            if self.metrics is not None:
+                self.metrics.record_cache_hit(self._metric_labels(messages))
+        elif self.cache.replay:
+            raise CacheMissError(f"No cached translation for request with {len(messages)} messages")
+        return reply, key
+
+    @staticmethod
+    def _usage_tokens(completion) -> Optional[int]:
+        usage = getattr(completion, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        return total if isinstance(total, int) else None
+
+    def _metric_labels(self, messages: List[dict]) -> CallLabels:
+        """Labels for a request, with the phase recognised from its system prompt."""
+        system_prompt = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+        labels = self._prompt_labels.get(system_prompt)
+        if labels is None:
+            phases = {
+                self.direct_prompt: "direct", self.rhetorical_prompt: "rhetorical", self.combined_prompt: "combined"
+            }
+            labels = (phases.get(system_prompt, "other"), prompt_version(system_prompt))
+            self._prompt_labels[system_prompt] = labels
+        phase, version = labels
+        letter = _current_letter.get()
+        return CallLabels(
+            phase=phase,
+            model=self.model,
+            letter="" if letter is None else str(letter),
+            prompt_version=version
+        )
+
+    def _record_call(self, messages: List[dict], started: float, usage) -> None:
+        """Log prompt cache use and record a finished call's latency and token usage, if collecting metrics."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        counts = [
+            getattr(usage, "prompt_tokens", None),
+            getattr(usage, "completion_tokens", None),
+            getattr(details, "cached_tokens", None),
+        ]
+        prompt_tokens, completion_tokens, cached_tokens = (
+            count if isinstance(count, int) else 0 for count in counts
+        )
+        if prompt_tokens:
+            logger.debug(f"Prompt cache served {cached_tokens} of {prompt_tokens} prompt tokens")
+        if self.metrics is None:
+            return
+        self.metrics.record_call(
+            self._metric_labels(messages),
+            time.perf_counter() - started,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens
+        )
+
+    def _record_error(self, messages: List[dict]) -> None:
+        if self.metrics is not None:
+            self.metrics.record_error(self._metric_labels(messages))
+
+    def _send_completion(self, request: dict):
+        """Send one chat completion request, throttled by the rate limiter if one is configured.
+
+        Throttled (429) calls are retried after the server's Retry-After, up to the
+        limiter's max_throttle_retries.
+        """
+        if self.rate_limiter is None:
+            return self.client.chat.completions.create(**request)
         
-        # Fix: These files were loaded with swapped names
-        # direct.v1.txt contains the Latin->English translation prompt
-        # rhetorical.v1.txt contains the English->Modern English prompt
-        with open(os.path.join(prompt_path, "direct.v1.txt")) as f:
-            self.direct_prompt = f.read()
+        estimated_tokens = estimate_request_tokens(request["messages"])
+        for attempt in range(self.rate_limiter.max_throttle_retries + 1):
+            self.rate_limiter.acquire(estimated_tokens)
+            try:
+                completion = self.client.chat.completions.create(**request)
+            except RateLimitError as e:
+                self.rate_limiter.release(success=False, estimated_tokens=estimated_tokens)
+                self.rate_limiter.on_throttle(parse_retry_after(e.response.headers))
+                if attempt == self.rate_limiter.max_throttle_retries:
+                    raise
+                continue
+            except BaseException:
+                # Also on cancellation (e.g. a losing hedged request), or the slot leaks
+                self.rate_limiter.release(success=False, estimated_tokens=estimated_tokens)
+                raise
+            self.rate_limiter.release(True, estimated_tokens, self._usage_tokens(completion))
+            return completion
+
+    async def _asend_completion(self, request: dict):
+        """Async counterpart of _send_completion."""
+        if self.rate_limiter is None:
+            return await self.async_client.chat.completions.create(**request)
         
-        with open(os.path.join(prompt_path, "rhetorical.v1.txt")) as f:
-            self.rhetorical_prompt = f.read()
+        estimated_tokens = estimate_request_tokens(request["messages"])
+        for attempt in range(self.rate_limiter.max_throttle_retries + 1):
+            await self.rate_limiter.acquire_async(estimated_tokens)
+            try:
+                completion = await self.async_client.chat.completions.create(**request)
+            except RateLimitError as e:
+                self.rate_limiter.release(success=False, estimated_tokens=estimated_tokens)
+                self.rate_limiter.on_throttle(parse_retry_after(e.response.headers))
+                if attempt == self.rate_limiter.max_throttle_retries:
+                    raise
+                continue
+            except BaseException:
+                # Also on cancellation (e.g. a losing hedged request), or the slot leaks
+                self.rate_limiter.release(success=False, estimated_tokens=estimated_tokens)
+                raise
+            self.rate_limiter.release(True, estimated_tokens, self._usage_tokens(completion))
+            return completion
+
+    @staticmethod
+    def prompt_cache_key(system_prompt: str) -> str:
+        """Routing hint that sends requests sharing a system prompt to the same prompt cache."""
+        return f"latin-translator-{prompt_version(system_prompt)}"
+
+    def _build_request(self, messages: List[dict], **params) -> dict:
+        request = {"model": self.model, "messages": messages, "temperature": self.temperature, **params}
+        if messages and messages[0]["role"] == "system":
+            # The system prompt always comes first and unchanged, so it is a cacheable prefix
+            request["prompt_cache_key"] = self.prompt_cache_key(messages[0]["content"])
+        if self.retry_policy is not None and self.retry_policy.deadline is not None:
+            request["timeout"] = self.retry_policy.deadline
+        return request
+
+    def _create_completion(self, messages: List[dict], **params):
+        """
+        Create a chat completion, applying the retry policy if one is configured.
+
+        Latency and usage are recorded here, except for streams, whose usage only
+        arrives with the last chunk; the streaming caller records those.
+        """
+        request = self._build_request(messages, **params)
+        started = time.perf_counter()
+        try:
+            if self.retry_policy is None:
+                completion = self._send_completion(request)
+            else:
+                completion = call_with_retry(
+                    lambda: self._send_completion(request), self.retry_policy, self.latency_tracker,
+                    self._retryable_errors
+                )
+        except Exception:
+            self._record_error(messages)
+            raise
+        if not params.get("stream"):
+            self._record_call(messages, started, getattr(completion, "usage", None))
+        return completion
+
+    async def _acreate_completion(self, messages: List[dict], **params):
+        """Async counterpart of _create_completion."""
+        request = self._build_request(messages, **params)
+        started = time.perf_counter()
+        try:
+            if self.retry_policy is None:
+                completion = await self._asend_completion(request)
+            else:
+                completion = await acall_with_retry(
+                    lambda: self._asend_completion(request), self.retry_policy, self.latency_tracker,
+                    self._retryable_errors
+                )
+        except Exception:
+            self._record_error(messages)
+            raise
+        self._record_call(messages, started, getattr(completion, "usage", None))
+        return completion
+
+    def _reply_from_completion(self, completion, cache_key: Optional[str]) -> str:
+        """Extract the reply text from a completion and store it in the cache."""
+        reply = completion.choices[0].message.content.strip()
+        logger.debug(f"API request completed, received {len(reply)} characters")
+        if cache_key is not None:
+            self.cache.put(cache_key, reply)
+        return reply
+
+    @staticmethod
+    def _record_reply(reply: str, window: ConversationWindow) -> tuple[str, ConversationWindow]:
+        """Record the assistant reply in the conversation and clean it up."""
+        window.answer(reply)
+        return clean_translation(reply), window
+
+    def _checkpoint(
+        self,
+        letter_number: Optional[int],
+        paragraph_index: int,
+        phase: str,
+        system_prompt: str
+    ) -> Optional[dict]:
+        """Journal key fields shared by every sentence of a paragraph phase, or None when not journaling."""
+        if self.journal is None or letter_number is None:
+            return None
+        return {
+            "letter": letter_number,
+            "paragraph": paragraph_index,
+            "phase": phase,
+            "prompt_version": prompt_version(system_prompt)
+        }
+
+    def _replay_chunk(
+        self,
+        sentence_index: int,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History],
+        checkpoint: Optional[dict]
+    ) -> Optional[tuple[str, ConversationWindow]]:
+        """
+        Return a journaled translation of text, replaying it into the conversation history.
+
+        Returns None if there is no checkpoint or the journal has no entry for the
+        same source text. An entry without a reply (journaled by a batched phase) is
+        not replayed either: the rolling context must be exactly what was sent.
+        """
+        if checkpoint is None:
+            return None
+        entry = self.journal.get(sentence=sentence_index, **checkpoint)
+        if entry is None or entry.source != text or entry.reply is None:
+            return None
+        window = self._window(system_prompt, conversation_history)
+        window.add_exchange(text, entry.reply)
+        return entry.translation, window
+
+    def _journal_chunk(
+        self,
+        sentence_index: int,
+        text: str,
+        translation: str,
+        reply: Optional[str],
+        checkpoint: Optional[dict]
+    ) -> None:
+        if checkpoint is not None:
+            self.journal.record(
+                sentence=sentence_index,
+                source=text,
+                reply=reply,
+                translation=translation,
+                **checkpoint
+            )
+
+    def _translate_checkpointed(
+        self,
+        sentence_index: int,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History],
+        checkpoint: Optional[dict]
+    ) -> tuple[str, ConversationWindow]:
+        """translate_chunk that reads from and writes to the journal."""
+        replayed = self._replay_chunk(sentence_index, text, system_prompt, conversation_history, checkpoint)
+        if replayed is not None:
+            return replayed
+        if checkpoint is None:
+            return self.translate_chunk(text, system_prompt, conversation_history)
+        translation, conversation_history, reply = self._translate_chunk(
+            text, system_prompt, conversation_history
+        )
+        self._journal_chunk(sentence_index, text, translation, reply, checkpoint)
+        return translation, conversation_history
+
+    async def _atranslate_checkpointed(
+        self,
+        sentence_index: int,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History],
+        checkpoint: Optional[dict]
+    ) -> tuple[str, ConversationWindow]:
+        """atranslate_chunk that reads from and writes to the journal."""
+        replayed = self._replay_chunk(sentence_index, text, system_prompt, conversation_history, checkpoint)
+        if replayed is not None:
+            return replayed
+        if checkpoint is None:
+            return await self.atranslate_chunk(text, system_prompt, conversation_history)
+        translation, conversation_history, reply = await self._atranslate_chunk(
+            text, system_prompt, conversation_history
+        )
+        self._journal_chunk(sentence_index, text, translation, reply, checkpoint)
+        return translation, conversation_history
+
+    def _replay_sentences(self, sentences: List[str], checkpoint: Optional[dict]) -> Optional[List[str]]:
+        """Journaled translations of every sentence in a batched phase, or None if any is missing."""
+        if checkpoint is None:
+            return None
+        translations = []
+        for sentence_index, sentence in enumerate(sentences):
+            entry = self.journal.get(sentence=sentence_index, **checkpoint)
+            if entry is None or entry.source != sentence:
+                return None
+            translations.append(entry.translation)
+        return translations
+
+    def _journal_sentences(self, sentences: List[str], translations: List[str], checkpoint: Optional[dict]) -> None:
+        # A batched reply covers the whole paragraph, so there is no per-sentence reply to replay
+        for sentence_index, (sentence, translation) in enumerate(zip(sentences, translations)):
+            self._journal_chunk(sentence_index, sentence, translation, None, checkpoint)
 
     def translate_chunk(
         self,
         text: str,
         system_prompt: str,
-        conversation_history: Optional[List[dict]] = None
-    ) -> tuple[str, List[dict]]:
+        conversation_history: Optional[History] = None
+    ) -> tuple[str, ConversationWindow]:
         """
         Translate a single chunk of text while maintaining conversation history.
 
         Args:
             text: The text to translate
             system_prompt: The system prompt to use
-            conversation_history: Optional list of previous messages
+            conversation_history: Optional ConversationWindow (or list of previous messages)
+                returned by an earlier call
 
         Returns:
-            Tuple of (translation, updated conversation history)
+            Tuple of (translation, updated conversation window)
         """
+        translation, conversation_history, _ = self._translate_chunk(
+            text, system_prompt, conversation_history
+        )
+        return translation, conversation_history
+
+    def _translate_chunk(
+        self,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History]
+    ) -> tuple[str, ConversationWindow, str]:
+        """translate_chunk that also returns the raw reply, which the journal replays on resume."""
         # Handle special case: lone quotation marks or very short (1-2 chars) input
         # Skip LLM call and preserve them exactly
-        if len(text.strip()) <= 2 and all(char in "'\"" for char in text.strip()):
-            logger.info(f"Detected lone quotation mark: '{text}'. Preserving as is.")
-            if conversation_history is None:
-                conversation_history = [{"role": "system", "content": system_prompt}]
-            # Add a dummy exchange to maintain conversation structure
-            conversation_history.append({"role": "user", "content": text})
-            conversation_history.append({"role": "assistant", "content": text})
-            return text, conversation_history
-        
-        if conversation_history is None:
-            conversation_history = [{"role": "system", "content": system_prompt}]
+        if self._is_lone_quote(text):
+            translation, conversation_history = self._preserve_chunk(text, system_prompt, conversation_history)
+            return translation, conversation_history, text
         
-        conversation_history.append({"role": "user", "content": text})
+        messages, conversation_history = self._prepare_messages(text, system_prompt, conversation_history)
+        reply, cache_key = self._cached_reply(messages)
+        if reply is not None:
+            translation, conversation_history = self._record_reply(reply, conversation_history)
+            return translation, conversation_history, reply
         
-        # Keep only recent context
-        if len(conversation_history) > (self.max_context * 2 + 1):
-            messages = [conversation_history[0]] + conversation_history[-(self.max_context * 2):]
-        else:
-            messages = conversation_history
-
         logger.info(f"Making API request to {self.model} with {len(messages)} messages")
+        try:
+            completion = self._create_completion(messages)
+            reply = self._reply_from_completion(completion, cache_key)
+            translation, conversation_history = self._record_reply(reply, conversation_history)
+            return translation, conversation_history, reply
+        except Exception as e:
+            logger.error(f"API request failed: {str(e)}")
+            raise
+
+    async def atranslate_chunk(
+        self,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History] = None
+    ) -> tuple[str, ConversationWindow]:
+        """
+        Async counterpart of translate_chunk using the AsyncOpenAI client.
+
+        Args:
+            text: The text to translate
+            system_prompt: The system prompt to use
+            conversation_history: Optional ConversationWindow (or list of previous messages)
+                returned by an earlier call
+
+        Returns:
+            Tuple of (translation, updated conversation window)
+        """
+        translation, conversation_history, _ = await self._atranslate_chunk(
+            text, system_prompt, conversation_history
+        )
+        return translation, conversation_history
+
+    async def _atranslate_chunk(
+        self,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History]
+    ) -> tuple[str, ConversationWindow, str]:
+        """atranslate_chunk that also returns the raw reply, which the journal replays on resume."""
+        if self._is_lone_quote(text):
+            translation, conversation_history = self._preserve_chunk(text, system_prompt, conversation_history)
+            return translation, conversation_history, text
+        
+        messages, conversation_history = self._prepare_messages(text, system_prompt, conversation_history)
+        reply, cache_key = self._cached_reply(messages)
+        if reply is not None:
+            translation, conversation_history = self._record_reply(reply, conversation_history)
+            return translation, conversation_history, reply
         
+        logger.info(f"Making async API request to {self.model} with {len(messages)} messages")
         try:
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.7
-            )
-            
-            reply = completion.choices[0].message.content.strip()
-            conversation_history.append({"role": "assistant", "content": reply})
-            
-            # Log the response body now that we've successfully used it
-            if http_logger.isEnabledFor(logging.DEBUG):
-                try:
-                    http_logger.debug(f"Response content: {json.dumps(completion.model_dump(), indent=2)}")
-                except Exception as e:
-                    http_logger.debug(f"Could not log response content: {e}")
-            
-            logger.debug(f"API request completed, received {len(reply)} characters")
-            return clean_translation(reply), conversation_history
+            completion = await self._acreate_completion(messages)
+            reply = self._reply_from_completion(completion, cache_key)
+            translation, conversation_history = self._record_reply(reply, conversation_history)
+            return translation, conversation_history, reply
         except Exception as e:
             logger.error(f"API request failed: {str(e)}")
             raise
 
+    def _batch_messages(self, sentences: List[str], system_prompt: str) -> List[dict]:
+        """Build a single request asking for all sentences as a JSON list.
+
+        The system prompt is sent unchanged so it stays a stable request prefix;
+        the batching instructions go in the user message.
+        """
+        numbered = "\n".join(f"{n}. {sentence}" for n, sentence in enumerate(sentences, start=1))
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": self.batch_template.substitute(count=len(sentences), sentences=numbered)},
+        ]
+
+    @staticmethod
+    def _parse_batch_reply(reply: str, expected: int) -> Optional[List[str]]:
+        """Return the translations from a batched reply, or None if it is malformed."""
+        try:
+            translations = json.loads(reply).get("translations")
+        except (json.JSONDecodeError, AttributeError):
+            return None
+        if (
+            not isinstance(translations, list)
+            or len(translations) != expected
+            or not all(isinstance(t, str) for t in translations)
+        ):
+            return None
+        return [t.strip() for t in translations]
+
+    @staticmethod
+    def _merge_batch(sentences: List[str], pending: List[int], translations: List[str]) -> List[str]:
+        """Place batched translations back among the preserved lone quotes."""
+        result = list(sentences)
+        for index, translation in zip(pending, translations):
+            result[index] = clean_translation(translation)
+        return result
+
+    def _sequential_translations(
+        self,
+        sentences: List[str],
+        system_prompt: str,
+        checkpoint: Optional[dict] = None
+    ) -> List[str]:
+        """Translate sentences one request at a time with a rolling context."""
+        translations = []
+        conversation_history = None
+        for sentence_index, sentence in enumerate(sentences):
+            translation, conversation_history = self._translate_checkpointed(
+                sentence_index,
+                sentence,
+                system_prompt,
+                conversation_history,
+                checkpoint
+            )
+            translations.append(translation)
+        return translations
+
+    def translate_sentences(self, sentences: List[str], system_prompt: str) -> List[str]:
+        """
+        Translate the sentences of one paragraph with a single structured request.
+
+        Lone quotation marks are preserved without being sent. If the reply is not a
+        JSON list with one translation per sentence, the paragraph is translated
+        sentence by sentence instead.
+
+        Args:
+            sentences: Consecutive sentences of one paragraph
+            system_prompt: The system prompt to use
+
+        Returns:
+            One translation per input sentence, in order
+        """
+        pending = [i for i, sentence in enumerate(sentences) if not self._is_lone_quote(sentence)]
+        if not pending:
+            return list(sentences)
+        
+        messages = self._batch_messages([sentences[i] for i in pending], system_prompt)
+        response_format = {"type": "json_object"}
+        reply, cache_key = self._cached_reply(messages, response_format=response_format)
+        if reply is None:
+            logger.info(f"Making batched API request to {self.model} for {len(pending)} sentences")
+            try:
+                completion = self._create_completion(messages, response_format=response_format)
+            except Exception as e:
+                logger.error(f"API request failed: {str(e)}")
+                raise
+            reply = self._reply_from_completion(completion, None)
+        
+        translations = self._parse_batch_reply(reply, len(pending))
+        if translations is None:
+            logger.warning(f"Batched reply did not hold {len(pending)} translations; translating sentence by sentence")
+            return self._sequential_translations(sentences, system_prompt)
+        if cache_key is not None:
+            self.cache.put(cache_key, reply)
+        return self._merge_batch(sentences, pending, translations)
+
+    async def _asequential_translations(
+        self,
+        sentences: List[str],
+        system_prompt: str,
+        checkpoint: Optional[dict] = None
+    ) -> List[str]:
+        """Async counterpart of _sequential_translations."""
+        translations = []
+        conversation_history = None
+        for sentence_index, sentence in enumerate(sentences):
+            translation, conversation_history = await self._atranslate_checkpointed(
+                sentence_index,
+                sentence,
+                system_prompt,
+                conversation_history,
+                checkpoint
+            )
+            translations.append(translation)
+        return translations
+
+    async def atranslate_sentences(self, sentences: List[str], system_prompt: str) -> List[str]:
+        """Async counterpart of translate_sentences."""
+        pending = [i for i, sentence in enumerate(sentences) if not self._is_lone_quote(sentence)]
+        if not pending:
+            return list(sentences)
+        
+        messages = self._batch_messages([sentences[i] for i in pending], system_prompt)
+        response_format = {"type": "json_object"}
+        reply, cache_key = self._cached_reply(messages, response_format=response_format)
+        if reply is None:
+            logger.info(f"Making batched async API request to {self.model} for {len(pending)} sentences")
+            try:
+                completion = await self._acreate_completion(messages, response_format=response_format)
+            except Exception as e:
+                logger.error(f"API request failed: {str(e)}")
+                raise
+            reply = self._reply_from_completion(completion, None)
+        
+        translations = self._parse_batch_reply(reply, len(pending))
+        if translations is None:
+            logger.warning(f"Batched reply did not hold {len(pending)} translations; translating sentence by sentence")
+            return await self._asequential_translations(sentences, system_prompt)
+        if cache_key is not None:
+            self.cache.put(cache_key, reply)
+        return self._merge_batch(sentences, pending, translations)
+
     def translate_direct(self, text: str) -> str:
         """
         Perform the first-phase direct translation.
@@ -196,52 +898,677 @@ class LetterTranslator:
         
         return "\n\n".join(final_paragraphs)
 
-    def process_letter(self, content: str) -> List[TranslationStages]:
+    def _batched_phase(self, sentences: List[str], system_prompt: str, checkpoint: Optional[dict]) -> List[str]:
+        """translate_sentences for a whole paragraph phase, journaled as a unit."""
+        translations = self._replay_sentences(sentences, checkpoint)
+        if translations is None:
+            translations = self.translate_sentences(sentences, system_prompt)
+            self._journal_sentences(sentences, translations, checkpoint)
+        return translations
+
+    async def _abatched_phase(self, sentences: List[str], system_prompt: str, checkpoint: Optional[dict]) -> List[str]:
+        translations = self._replay_sentences(sentences, checkpoint)
+        if translations is None:
+            translations = await self.atranslate_sentences(sentences, system_prompt)
+            self._journal_sentences(sentences, translations, checkpoint)
+        return translations
+
+    def _translate_phase(self, sentences: List[str], system_prompt: str, checkpoint: Optional[dict]) -> List[str]:
+        """One phase of a paragraph, batched or sentence by sentence as configured."""
+        if self.batch_paragraphs:
+            return self._batched_phase(sentences, system_prompt, checkpoint)
+        return self._sequential_translations(sentences, system_prompt, checkpoint)
+
+    async def _atranslate_phase(self, sentences: List[str], system_prompt: str, checkpoint: Optional[dict]) -> List[str]:
+        """Async counterpart of _translate_phase."""
+        if self.batch_paragraphs:
+            return await self._abatched_phase(sentences, system_prompt, checkpoint)
+        return await self._asequential_translations(sentences, system_prompt, checkpoint)
+
+    @staticmethod
+    def _parse_combined_reply(reply: str) -> Optional[tuple[str, str]]:
+        """Return (direct, rhetorical) from a combined reply, or None if it is malformed."""
+        try:
+            data = json.loads(reply)
+            direct, rhetorical = data["direct"], data["rhetorical"]
+        except (json.JSONDecodeError, TypeError, KeyError):
+            return None
+        if not isinstance(direct, str) or not isinstance(rhetorical, str):
+            return None
+        return clean_translation(direct), clean_translation(rhetorical)
+
+    @staticmethod
+    def _combined_reply(direct: str, rhetorical: str) -> str:
+        """A combined reply holding the given translations, for replaying into the conversation."""
+        return json.dumps({"direct": direct, "rhetorical": rhetorical})
+
+    def _preserve_combined(
+        self,
+        text: str,
+        conversation_history: Optional[History]
+    ) -> tuple[tuple[str, str], ConversationWindow, str]:
+        """Record text as both of its translations without calling the LLM."""
+        logger.info(f"Detected lone quotation mark: '{text}'. Preserving as is.")
+        window = self._window(self.combined_prompt, conversation_history)
+        reply = self._combined_reply(text, text)
+        window.add_exchange(text, reply)
+        return (text, text), window, reply
+
+    def _combined_result(
+        self,
+        reply: str,
+        cache_key: Optional[str],
+        window: ConversationWindow
+    ) -> tuple[Optional[tuple[str, str]], ConversationWindow, str]:
+        translations = self._parse_combined_reply(reply)
+        if translations is not None and cache_key is not None:
+            self.cache.put(cache_key, reply)
+        window.answer(reply)
+        return translations, window, reply
+
+    def translate_combined(
+        self,
+        text: str,
+        conversation_history: Optional[History] = None
+    ) -> tuple[Optional[tuple[str, str]], ConversationWindow]:
+        """
+        Translate a Latin sentence through both phases with a single request.
+
+        Args:
+            text: The Latin sentence to translate
+            conversation_history: Optional ConversationWindow returned by an earlier call
+
+        Returns:
+            Tuple of ((direct, rhetorical) or None if the reply was not the expected JSON,
+            updated conversation window)
+        """
+        translations, window, _ = self._translate_combined(text, conversation_history)
+        return translations, window
+
+    def _translate_combined(
+        self,
+        text: str,
+        conversation_history: Optional[History]
+    ) -> tuple[Optional[tuple[str, str]], ConversationWindow, str]:
+        """translate_combined that also returns the raw reply, for the journal."""
+        if self._is_lone_quote(text):
+            return self._preserve_combined(text, conversation_history)
+
+        messages, window = self._prepare_messages(text, self.combined_prompt, conversation_history)
+        response_format = {"type": "json_object"}
+        reply, cache_key = self._cached_reply(messages, response_format=response_format)
+        if reply is None:
+            logger.info(f"Making combined API request to {self.model} with {len(messages)} messages")
+            try:
+                completion = self._create_completion(messages, response_format=response_format)
+            except Exception as e:
+                logger.error(f"API request failed: {str(e)}")
+                raise
+            reply = self._reply_from_completion(completion, None)
+        return self._combined_result(reply, cache_key, window)
+
+    async def atranslate_combined(
+        self,
+        text: str,
+        conversation_history: Optional[History] = None
+    ) -> tuple[Optional[tuple[str, str]], ConversationWindow]:
+        """Async counterpart of translate_combined."""
+        translations, window, _ = await self._atranslate_combined(text, conversation_history)
+        return translations, window
+
+    async def _atranslate_combined(
+        self,
+        text: str,
+        conversation_history: Optional[History]
+    ) -> tuple[Optional[tuple[str, str]], ConversationWindow, str]:
+        """atranslate_combined that also returns the raw reply, for the journal."""
+        if self._is_lone_quote(text):
+            return self._preserve_combined(text, conversation_history)
+
+        messages, window = self._prepare_messages(text, self.combined_prompt, conversation_history)
+        response_format = {"type": "json_object"}
+        reply, cache_key = self._cached_reply(messages, response_format=response_format)
+        if reply is None:
+            logger.info(f"Making async combined API request to {self.model} with {len(messages)} messages")
+            try:
+                completion = await self._acreate_completion(messages, response_format=response_format)
+            except Exception as e:
+                logger.error(f"API request failed: {str(e)}")
+                raise
+            reply = self._reply_from_completion(completion, None)
+        return self._combined_result(reply, cache_key, window)
+
+    def _combined_translations(
+        self,
+        sentences: List[str],
+        checkpoint: Optional[dict]
+    ) -> Optional[tuple[List[str], List[str]]]:
+        """
+        Direct and rhetorical translations of a paragraph's sentences, one combined request
+        per sentence with a rolling context. None if any reply was malformed.
+        """
+        direct: List[str] = []
+        rhetorical: List[str] = []
+        window = None
+        for sentence_index, sentence in enumerate(sentences):
+            # Journal entries of this phase hold the pair as a JSON list
+            replayed = self._replay_chunk(sentence_index, sentence, self.combined_prompt, window, checkpoint)
+            if replayed is not None:
+                translations, window = json.loads(replayed[0]), replayed[1]
+            else:
+                translations, window, reply = self._translate_combined(sentence, window)
+                if translations is None:
+                    return None
+                self._journal_chunk(sentence_index, sentence, json.dumps(translations), reply, checkpoint)
+            direct.append(translations[0])
+            rhetorical.append(translations[1])
+        return direct, rhetorical
+
+    async def _acombined_translations(
+        self,
+        sentences: List[str],
+        checkpoint: Optional[dict]
+    ) -> Optional[tuple[List[str], List[str]]]:
+        """Async counterpart of _combined_translations."""
+        direct: List[str] = []
+        rhetorical: List[str] = []
+        window = None
+        for sentence_index, sentence in enumerate(sentences):
+            replayed = self._replay_chunk(sentence_index, sentence, self.combined_prompt, window, checkpoint)
+            if replayed is not None:
+                translations, window = json.loads(replayed[0]), replayed[1]
+            else:
+                translations, window, reply = await self._atranslate_combined(sentence, window)
+                if translations is None:
+                    return None
+                self._journal_chunk(sentence_index, sentence, json.dumps(translations), reply, checkpoint)
+            direct.append(translations[0])
+            rhetorical.append(translations[1])
+        return direct, rhetorical
+
+    @contextmanager
+    def _letter_scope(self, letter_number: Optional[int]):
+        """
+        Label calls made inside with the letter number and pin the prompts for the
+        letter, then export metrics.
+        """
+        token = _current_letter.set(letter_number)
+        prompts_token = _letter_prompts.set(self._resolve_prompts())
+        # The budget's stats are running totals; log only this letter's share
+        budget_before = self.context_budget.stats() if self.context_budget is not None else None
+        try:
+            yield
+        finally:
+            _letter_prompts.reset(prompts_token)
+            _current_letter.reset(token)
+            if self.context_budget is not None:
+                stats = self.context_budget.stats().since(budget_before)
+                logger.info(
+                    f"Context budget: ~{stats.prompt_tokens} prompt tokens sent, ~{stats.tokens_saved} saved "
+                    f"by dropping {stats.exchanges_dropped} exchange(s)"
+                )
+            if self.metrics is not None:
+                self.metrics.export()
+
+    def process_letter(
+        self,
+        content: str,
+        letter_number: Optional[int] = None,
+        combined: Optional[bool] = None
+    ) -> List[TranslationStages]:
         """
         Process text through both translation phases.
         
         Args:
             content: The text content to translate
+            letter_number: Number of the letter being translated; used to label metrics and,
+                with a journal configured, to record completed sentences and skip them on a rerun
+            combined: Overrides the translator's combined setting for this letter; False forces
+                the strict two-phase translation
             
         Returns:
             List of TranslationStages containing original, direct, and rhetorical translations
         """
-        # Split original text into paragraphs and sentences
-        original_paragraphs = split_paragraphs(content)
-        result: List[TranslationStages] = []
+        combined = self.combined if combined is None else combined
+        with self._letter_scope(letter_number):
+            # Split original text into paragraphs and sentences
+            original_paragraphs = split_paragraphs(content)
+            result: List[TranslationStages] = []
         
-        for idx, original_paragraph in enumerate(original_paragraphs, start=1):
-            # Split into sentences
-            original_sentences = split_text_with_quotes(original_paragraph)
+            for idx, original_paragraph in enumerate(original_paragraphs, start=1):
+                # Split into sentences
+                original_sentences = split_text_with_quotes(original_paragraph)
             
-            # First phase: Direct translation
-            direct_sentences = []
-            conversation_history = None
-            for sentence in original_sentences:
-                translation, conversation_history = self.translate_chunk(
-                    sentence,
-                    self.direct_prompt,
-                    conversation_history
-                )
-                direct_sentences.append(translation)
+                direct_checkpoint = self._checkpoint(letter_number, idx, "direct", self.direct_prompt)
+                rhetorical_checkpoint = self._checkpoint(letter_number, idx, "rhetorical", self.rhetorical_prompt)
+                translations = None
+                if combined:
+                    translations = self._combined_translations(
+                        original_sentences, self._checkpoint(letter_number, idx, "combined", self.combined_prompt)
+                    )
+                    if translations is None:
+                        logger.warning(f"Combined reply was malformed; translating paragraph {idx} in two phases")
+                if translations is not None:
+                    direct_sentences, rhetorical_sentences = translations
+                else:
+                    # First phase: Direct translation
+                    direct_sentences = self._translate_phase(original_sentences, self.direct_prompt, direct_checkpoint)
+                    # Second phase: Rhetorical translation
+                    rhetorical_sentences = self._translate_phase(
+                        direct_sentences, self.rhetorical_prompt, rhetorical_checkpoint
+                    )
             
-            # Second phase: Rhetorical translation
-            rhetorical_sentences = []
-            conversation_history = None
-            for sentence in direct_sentences:
-                translation, conversation_history = self.translate_chunk(
-                    sentence,
-                    self.rhetorical_prompt,
-                    conversation_history
+                # Create TranslationStages for this paragraph
+                result.append(TranslationStages(
+                    paragraph_index=idx,
+                    original=original_sentences,
+                    direct=direct_sentences,
+                    rhetorical=rhetorical_sentences
+                ))
+        
+            return result
+
+    def _iter_translate_chunk(
+        self,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History] = None
+    ) -> Generator[str, None, tuple[str, ConversationWindow, str]]:
+        """
+        Streaming counterpart of _translate_chunk.
+
+        Yields pieces of the reply as they arrive (a cached or preserved reply comes
+        as a single piece) and returns the same (translation, history, raw reply)
+        tuple as _translate_chunk. Only opening the stream is rate limited and
+        retried; an error mid-stream propagates.
+        """
+        if self._is_lone_quote(text):
+            yield text
+            translation, conversation_history = self._preserve_chunk(text, system_prompt, conversation_history)
+            return translation, conversation_history, text
+        
+        messages, conversation_history = self._prepare_messages(text, system_prompt, conversation_history)
+        reply, cache_key = self._cached_reply(messages)
+        if reply is not None:
+            yield reply
+            translation, conversation_history = self._record_reply(reply, conversation_history)
+            return translation, conversation_history, reply
+        
+        logger.info(f"Making streaming API request to {self.model} with {len(messages)} messages")
+        parts: List[str] = []
+        usage = None
+        # Ask for usage in the final chunk when collecting metrics
+        stream_params = {"stream_options": {"include_usage": True}} if self.metrics is not None else {}
+        started = time.perf_counter()
+        try:
+            for chunk in self._create_completion(messages, stream=True, **stream_params):
+                usage = getattr(chunk, "usage", None) or usage
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"API request failed: {str(e)}")
+            raise
+        self._record_call(messages, started, usage)
+        
+        reply = "".join(parts).strip()
+        logger.debug(f"Streaming API request completed, received {len(reply)} characters")
+        if cache_key is not None:
+            self.cache.put(cache_key, reply)
+        translation, conversation_history = self._record_reply(reply, conversation_history)
+        return translation, conversation_history, reply
+
+    def _iter_translate_checkpointed(
+        self,
+        sentence_index: int,
+        text: str,
+        system_prompt: str,
+        conversation_history: Optional[History],
+        checkpoint: Optional[dict]
+    ) -> Generator[str, None, tuple[str, ConversationWindow]]:
+        """_iter_translate_chunk that reads from and writes to the journal; a replayed sentence comes as one piece."""
+        replayed = self._replay_chunk(sentence_index, text, system_prompt, conversation_history, checkpoint)
+        if replayed is not None:
+            yield replayed[0]
+            return replayed
+        translation, conversation_history, reply = yield from self._iter_translate_chunk(
+            text, system_prompt, conversation_history
+        )
+        self._journal_chunk(sentence_index, text, translation, reply, checkpoint)
+        return translation, conversation_history
+
+    @staticmethod
+    def _token_events(
+        tokens: Generator[str, None, tuple[str, ConversationWindow]],
+        **fields
+    ) -> Generator[TokenEvent, None, tuple[str, ConversationWindow]]:
+        """Wrap streamed pieces in TokenEvents, passing through the generator's return value."""
+        while True:
+            try:
+                token = next(tokens)
+            except StopIteration as stop:
+                return stop.value
+            yield TokenEvent(text=token, **fields)
+
+    def iter_process_letter(self, content: str, letter_number: Optional[int] = None) -> Iterator[TranslationEvent]:
+        """
+        Process text through both translation phases, streaming progress as it happens.
+
+        Yields a TokenEvent for each piece of model output, a SentenceEvent when a
+        sentence finishes a phase, and a ParagraphEvent with the paragraph's
+        TranslationStages once both phases are done. Translation is sentence by
+        sentence with the same rolling context as process_letter, always in two
+        phases (a combined JSON reply cannot be shown as it streams).
+
+        Args:
+            content: The text content to translate
+            letter_number: Number of the letter being translated, as for process_letter;
+                a sentence replayed from the journal comes as a single TokenEvent
+
+        Returns:
+            Iterator of TokenEvent, SentenceEvent and ParagraphEvent objects
+        """
+        with self._letter_scope(letter_number):
+            for idx, original_paragraph in enumerate(split_paragraphs(content), start=1):
+                original_sentences = split_text_with_quotes(original_paragraph)
+                translations = {}
+                sources = original_sentences
+                for phase, system_prompt in (("direct", self.direct_prompt), ("rhetorical", self.rhetorical_prompt)):
+                    translations[phase] = []
+                    conversation_history = None
+                    checkpoint = self._checkpoint(letter_number, idx, phase, system_prompt)
+                    for sentence_index, sentence in enumerate(sources):
+                        translation, conversation_history = yield from self._token_events(
+                            self._iter_translate_checkpointed(
+                                sentence_index, sentence, system_prompt, conversation_history, checkpoint
+                            ),
+                            paragraph_index=idx,
+                            phase=phase,
+                            sentence_index=sentence_index
+                        )
+                        translations[phase].append(translation)
+                        yield SentenceEvent(
+                            paragraph_index=idx,
+                            phase=phase,
+                            sentence_index=sentence_index,
+                            source=sentence,
+                            translation=translation
+                        )
+                    sources = translations[phase]
+
+                yield ParagraphEvent(stages=TranslationStages(
+                    paragraph_index=idx,
+                    original=original_sentences,
+                    direct=translations["direct"],
+                    rhetorical=translations["rhetorical"]
+                ))
+
+    async def _atranslate_paragraph(
+        self,
+        paragraph_index: int,
+        original_paragraph: str,
+        semaphore: asyncio.Semaphore,
+        letter_number: Optional[int] = None,
+        combined: bool = False
+    ) -> TranslationStages:
+        """
+        Translate one paragraph through both phases once a semaphore slot is free.
+
+        The phases run as a producer/consumer pipeline: each direct translation is
+        queued for the rhetorical stage as soon as it is ready, so rhetorical sentence i
+        overlaps direct sentence i+1. Each stage keeps its own rolling context and
+        consumes sentences in order, so outputs match the sequential process_letter.
+        """
+        async with semaphore:
+            original_sentences = split_text_with_quotes(original_paragraph)
+            direct_checkpoint = self._checkpoint(letter_number, paragraph_index, "direct", self.direct_prompt)
+            rhetorical_checkpoint = self._checkpoint(
+                letter_number, paragraph_index, "rhetorical", self.rhetorical_prompt
+            )
+            if combined:
+                translations = await self._acombined_translations(
+                    original_sentences,
+                    self._checkpoint(letter_number, paragraph_index, "combined", self.combined_prompt)
+                )
+                if translations is not None:
+                    return TranslationStages(
+                        paragraph_index=paragraph_index,
+                        original=original_sentences,
+                        direct=translations[0],
+                        rhetorical=translations[1]
+                    )
+                logger.warning(
+                    f"Combined reply was malformed; translating paragraph {paragraph_index} in two phases"
+                )
+            if self.batch_paragraphs:
+                # One request per phase, so there is nothing to pipeline
+                direct_sentences = await self._abatched_phase(
+                    original_sentences, self.direct_prompt, direct_checkpoint
+                )
+                rhetorical_sentences = await self._abatched_phase(
+                    direct_sentences, self.rhetorical_prompt, rhetorical_checkpoint
+                )
+                return TranslationStages(
+                    paragraph_index=paragraph_index,
+                    original=original_sentences,
+                    direct=direct_sentences,
+                    rhetorical=rhetorical_sentences
                 )
-                rhetorical_sentences.append(translation)
+
+            direct_sentences: List[str] = []
+            rhetorical_sentences: List[str] = []
+            direct_queue: asyncio.Queue = asyncio.Queue()
+
+            async def direct_stage() -> None:
+                conversation_history = None
+                try:
+                    for sentence_index, sentence in enumerate(original_sentences):
+                        translation, conversation_history = await self._atranslate_checkpointed(
+                            sentence_index,
+                            sentence,
+                            self.direct_prompt,
+                            conversation_history,
+                            direct_checkpoint
+                        )
+                        direct_sentences.append(translation)
+                        await direct_queue.put(translation)
+                finally:
+                    # Sentinel: no more direct sentences for this paragraph
+                    await direct_queue.put(None)
+
+            async def rhetorical_stage() -> None:
+                conversation_history = None
+                while (sentence := await direct_queue.get()) is not None:
+                    translation, conversation_history = await self._atranslate_checkpointed(
+                        len(rhetorical_sentences),
+                        sentence,
+                        self.rhetorical_prompt,
+                        conversation_history,
+                        rhetorical_checkpoint
+                    )
+                    rhetorical_sentences.append(translation)
+
+            producer = asyncio.ensure_future(direct_stage())
+            try:
+                await rhetorical_stage()
+                await producer
+            finally:
+                # Stop the direct stage if the rhetorical stage failed
+                producer.cancel()
             
-            # Create TranslationStages for this paragraph
-            result.append(TranslationStages(
-                paragraph_index=idx,
+            return TranslationStages(
+                paragraph_index=paragraph_index,
                 original=original_sentences,
                 direct=direct_sentences,
                 rhetorical=rhetorical_sentences
-            ))
+            )
+
+    async def aprocess_letter(
+        self,
+        content: str,
+        letter_number: Optional[int] = None,
+        combined: Optional[bool] = None
+    ) -> List[TranslationStages]:
+        """
+        Process text through both translation phases, translating paragraphs concurrently.
+        
+        Paragraphs are independent (each starts a fresh conversation), so up to
+        max_concurrency of them are translated at the same time. Within a paragraph
+        the direct and rhetorical phases are pipelined, and sentences stay in order
+        within each phase to preserve the rolling context.
         
-        return result 
\ No newline at end of file
+        Args:
+            content: The text content to translate
+            letter_number: Number of the letter being translated, used as in process_letter
+            combined: Overrides the translator's combined setting for this letter, as in process_letter
+            
+        Returns:
+            List of TranslationStages in paragraph order
+        """
+        original_paragraphs = split_paragraphs(content)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        combined = self.combined if combined is None else combined
+        with self._letter_scope(letter_number):
+            return list(await asyncio.gather(*(
+                self._atranslate_paragraph(idx, paragraph, semaphore, letter_number, combined)
+                for idx, paragraph in enumerate(original_paragraphs, start=1)
+            )))
+
+    def _for_variant(self, variant: PromptVariant) -> "LetterTranslator":
+        """A copy sharing clients, cache, journal and metrics, with the variant's prompt, model and temperature."""
+        translator = copy.copy(self)
+        translator._prompt_overrides = dict(self._prompt_overrides)
+        translator._prompt_labels = {}
+        if variant.prompt is not None:
+            translator.rhetorical_prompt = variant.prompt
+        if variant.model is not None:
+            translator.model = variant.model
+        if variant.temperature is not None:
+            translator.temperature = variant.temperature
+        return translator
+
+    @staticmethod
+    def _validate_variants(variants: List[PromptVariant]) -> None:
+        if not variants:
+            raise ValueError("At least one prompt variant is needed")
+        names = [variant.name for variant in variants]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Variants need distinct names, got {names}")
+
+    def _variant_translators(self, variants: List[PromptVariant]) -> Dict[str, "LetterTranslator"]:
+        return {variant.name: self._for_variant(variant) for variant in variants}
+
+    def _variant_stages(
+        self,
+        name: str,
+        paragraph_index: int,
+        original_sentences: List[str],
+        direct_sentences: List[str],
+        letter_number: Optional[int]
+    ) -> TranslationStages:
+        """The rhetorical phase of one paragraph for one variant (self is the variant's translator)."""
+        # Variants may share a prompt but not a model, so each gets its own journal phase
+        checkpoint = self._checkpoint(letter_number, paragraph_index, f"rhetorical:{name}", self.rhetorical_prompt)
+        return TranslationStages(
+            paragraph_index=paragraph_index,
+            original=original_sentences,
+            direct=direct_sentences,
+            rhetorical=self._translate_phase(direct_sentences, self.rhetorical_prompt, checkpoint)
+        )
+
+    async def _avariant_stages(
+        self,
+        name: str,
+        paragraph_index: int,
+        original_sentences: List[str],
+        direct_sentences: List[str],
+        letter_number: Optional[int]
+    ) -> TranslationStages:
+        """Async counterpart of _variant_stages."""
+        checkpoint = self._checkpoint(letter_number, paragraph_index, f"rhetorical:{name}", self.rhetorical_prompt)
+        return TranslationStages(
+            paragraph_index=paragraph_index,
+            original=original_sentences,
+            direct=direct_sentences,
+            rhetorical=await self._atranslate_phase(direct_sentences, self.rhetorical_prompt, checkpoint)
+        )
+
+    def process_letter_variants(
+        self,
+        content: str,
+        variants: List[PromptVariant],
+        letter_number: Optional[int] = None
+    ) -> Dict[str, List[TranslationStages]]:
+        """
+        Translate a letter once in the direct phase and in the rhetorical phase for every variant.
+
+        Each paragraph's direct translation is handed to all variants at once, in a
+        thread per variant, while the next paragraph's direct phase runs. The direct
+        phase is therefore paid for once however many variants are compared. Always
+        two-phase: the combined setting is ignored.
+
+        Args:
+            content: The text content to translate
+            variants: Rhetorical-phase configurations, with distinct names
+            letter_number: Number of the letter being translated, used as in process_letter
+
+        Returns:
+            Each variant's TranslationStages, by variant name; see TranslationStages.compare_many
+        """
+        self._validate_variants(variants)
+        translators = self._variant_translators(variants)
+        futures: Dict[str, List[Future]] = {name: [] for name in translators}
+        with self._letter_scope(letter_number), ThreadPoolExecutor(max_workers=len(translators)) as pool:
+            for idx, original_paragraph in enumerate(split_paragraphs(content), start=1):
+                original_sentences = split_text_with_quotes(original_paragraph)
+                direct_sentences = self._translate_phase(
+                    original_sentences,
+                    self.direct_prompt,
+                    self._checkpoint(letter_number, idx, "direct", self.direct_prompt)
+                )
+                for name, translator in translators.items():
+                    # Copy the context so calls keep the letter's metric labels
+                    futures[name].append(pool.submit(
+                        copy_context().run, translator._variant_stages,
+                        name, idx, original_sentences, direct_sentences, letter_number
+                    ))
+            return {name: [future.result() for future in pending] for name, pending in futures.items()}
+
+    async def aprocess_letter_variants(
+        self,
+        content: str,
+        variants: List[PromptVariant],
+        letter_number: Optional[int] = None
+    ) -> Dict[str, List[TranslationStages]]:
+        """
+        Async counterpart of process_letter_variants.
+
+        Up to max_concurrency paragraphs are translated at the same time; within a
+        paragraph the variants' rhetorical phases run concurrently once its direct
+        phase is done.
+        """
+        self._validate_variants(variants)
+        self._ensure_async_client()
+        translators = self._variant_translators(variants)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def translate_paragraph(idx: int, original_paragraph: str) -> List[TranslationStages]:
+            async with semaphore:
+                original_sentences = split_text_with_quotes(original_paragraph)
+                direct_sentences = await self._atranslate_phase(
+                    original_sentences,
+                    self.direct_prompt,
+                    self._checkpoint(letter_number, idx, "direct", self.direct_prompt)
+                )
+                return await asyncio.gather(*(
+                    translator._avariant_stages(name, idx, original_sentences, direct_sentences, letter_number)
+                    for name, translator in translators.items()
+                ))
+
+        with self._letter_scope(letter_number):
+            paragraphs = await asyncio.gather(*(
+                translate_paragraph(idx, paragraph)
+                for idx, paragraph in enumerate(split_paragraphs(content), start=1)
+            ))
+        return {name: [stages[i] for stages in paragraphs] for i, name in enumerate(translators)}
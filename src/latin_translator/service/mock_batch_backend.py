@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import json
+import logging
+import uuid
+
+from .batch_translation_job import BatchBackend
+
+logger = logging.getLogger(__name__)
+
+
+class MockBatchBackend(BatchBackend):
+    """A local stand-in for the OpenAI Batch API.
+    
+    This class implements the same BatchBackend interface as OpenAIBatchBackend but
+    answers every request in-process instead of uploading it. It's designed for
+    testing BatchTranslationJob without network access.
+    
+    Replies are produced by `responder`, which receives the request body and returns
+    the assistant content; by default it echoes the last user message. Output lines
+    use the same JSON shape as the real Batch API output file.
+    """
+    
+    def __init__(
+        self,
+        responder: Optional[Callable[[dict], str]] = None,
+        polls_until_complete: int = 0,
+        failing_custom_ids: Iterable[str] = (),
+        final_status: str = "completed"
+    ):
+        """Initialize the mock backend.
+        
+        Args:
+            responder: Function mapping a request body to reply content. Defaults to echo.
+            polls_until_complete: Number of status() calls reporting 'in_progress' first.
+            failing_custom_ids: Requests that get an error line instead of a reply.
+            final_status: Status reported once polling is done (e.g. 'failed').
+        """
+        self.responder = responder or (lambda body: body["messages"][-1]["content"])
+        self.polls_until_complete = polls_until_complete
+        self.failing_custom_ids = set(failing_custom_ids)
+        self.final_status = final_status
+        self.submitted: Dict[str, List[dict]] = {}
+        self._polls: Dict[str, int] = {}
+    
+    def submit(self, requests_path: Path) -> str:
+        """Read a request file and register it as a new batch."""
+        with open(requests_path, encoding="utf-8") as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        self.submitted[batch_id] = requests
+        self._polls[batch_id] = 0
+        logger.info(f"Mock batch {batch_id} accepted {len(requests)} requests")
+        return batch_id
+    
+    def status(self, batch_id: str) -> str:
+        """Report 'in_progress' for the configured number of polls, then the final status."""
+        self._polls[batch_id] += 1
+        if self._polls[batch_id] <= self.polls_until_complete:
+            return "in_progress"
+        return self.final_status
+    
+    def results(self, batch_id: str) -> List[dict]:
+        """Answer every request of the batch in Batch API output format."""
+        lines = []
+        for request in self.submitted[batch_id]:
+            custom_id = request["custom_id"]
+            if custom_id in self.failing_custom_ids:
+                lines.append({
+                    "id": f"req_{uuid.uuid4().hex[:12]}",
+                    "custom_id": custom_id,
+                    "response": None,
+                    "error": {"code": "server_error", "message": "Injected failure"},
+                })
+                continue
+            body = request["body"]
+            lines.append({
+                "id": f"req_{uuid.uuid4().hex[:12]}",
+                "custom_id": custom_id,
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "object": "chat.completion",
+                        "model": body["model"],
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": self.responder(body)},
+                            "finish_reason": "stop",
+                        }],
+                    },
+                },
+                "error": None,
+            })
+        return lines
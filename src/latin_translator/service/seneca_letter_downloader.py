@@ -1,12 +1,29 @@
-from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Dict, Tuple, Iterable, Iterator, NamedTuple, Union
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import logging
 import re
 from ..models import Letter
+from ..cache import HtmlMirror, CorpusSnapshot
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; extraction falls back to html.parser
+    etree = None
 
 logger = logging.getLogger(__name__)
 
+
+class Paragraph(NamedTuple):
+    """The parts of a <p> element that letter extraction looks at."""
+    title: Optional[str]  # Stripped text of the first <b> inside, if any
+    classes: List[str]
+    text: str
+
 class SenecaLetterDownloader:
     DEFAULT_URLS = [
         "https://www.thelatinlibrary.com/sen/seneca.ep1.shtml",
@@ -21,48 +38,195 @@ class SenecaLetterDownloader:
         "https://www.thelatinlibrary.com/sen/seneca.ep10.shtml",
         "https://www.thelatinlibrary.com/sen/seneca.ep11-13.shtml",
         "https://www.thelatinlibrary.com/sen/seneca.ep14-15.shtml",
+        "https://www.thelatinlibrary.com/sen/seneca.ep16.shtml",
         "https://www.thelatinlibrary.com/sen/seneca.ep17-18.shtml",
         "https://www.thelatinlibrary.com/sen/seneca.ep19.shtml",
         "https://www.thelatinlibrary.com/sen/seneca.ep20.shtml"
     ]
 
-    def __init__(self, urls: Optional[List[str]] = None):
+    # Letters on each page, keyed by the book span in the page's file name
+    # (seneca.ep11-13.shtml holds books 11-13, i.e. letters 84-88)
+    PAGE_LETTER_RANGES: Dict[str, Tuple[int, int]] = {
+        "1": (1, 12),
+        "2": (13, 21),
+        "3": (22, 29),
+        "4": (30, 41),
+        "5": (42, 52),
+        "6": (53, 62),
+        "7": (63, 69),
+        "8": (70, 74),
+        "9": (75, 80),
+        "10": (81, 83),
+        "11-13": (84, 88),
+        "14-15": (89, 95),
+        "16": (96, 100),
+        "17-18": (101, 109),
+        "19": (110, 117),
+        "20": (118, 124),
+    }
+
+    HTML_BACKEND = "lxml" if etree is not None else "html.parser"
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    DEFAULT_TIMEOUT = 30.0
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        urls: Optional[List[str]] = None,
+        max_workers: int = 4,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        mirror: Optional[HtmlMirror] = None,
+        snapshot: Optional[CorpusSnapshot] = None
+    ):
+        """
+        Args:
+            urls: Pages to download. Defaults to DEFAULT_URLS.
+            max_workers: Number of pages downloaded concurrently by fetch_all_letters
+            timeout: Per-request timeout in seconds
+            max_retries: Retries for connection errors and retryable HTTP statuses
+            backoff_factor: Exponential backoff factor between retries, in seconds
+            mirror: Optional local HTML mirror; pages are served and revalidated through it
+            snapshot: Optional pre-parsed corpus; when given, letters load from it without
+                downloading or parsing HTML
+        """
         self.urls = urls if urls is not None else self.DEFAULT_URLS
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = self._create_session(max_workers, max_retries, backoff_factor)
+        self.mirror = mirror
+        self.snapshot = snapshot
         self._letters_by_number: Dict[int, Letter] = {}
+        self._letters_by_page: Dict[str, List[Letter]] = {}
+        self._partially_indexed = False
+
+    @classmethod
+    def _create_session(cls, pool_size: int, max_retries: int, backoff_factor: float) -> requests.Session:
+        """Create a keep-alive session whose connection pool is shared by all workers."""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=cls.RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1), max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _fetch_page(self, url: str) -> List[Letter]:
+        """Download and extract one page, logging and skipping it on failure."""
+        logger.info(f"Processing {url}")
+        try:
+            letters = self.fetch_letters_from_url(url)
+            self._letters_by_page[url] = letters
+            return letters
+        except Exception as e:
+            logger.error(f"An error occurred while processing {url}: {e}")
+            return []
 
     def fetch_all_letters(self) -> List[Letter]:
-        """Download and extract all of Seneca's letters from the configured URLs."""
+        """
+        Download and extract all of Seneca's letters from the configured URLs.
+
+        Pages are downloaded concurrently by up to max_workers threads over the
+        shared session; letters are returned in the order of the configured URLs.
+        """
+        if self.snapshot is not None:
+            all_letters = self.snapshot.letters()
+            self._letters_by_number = {letter.number: letter for letter in all_letters}
+            return all_letters
+
         all_letters: List[Letter] = []
         self._letters_by_number = {}
-        for url in self.urls:
-            logger.info(f"Processing {url}")
-            try:
-                content = self.download_content(url)
-                letters = self.extract_letters(content)
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1)) as executor:
+            # executor.map yields results in input order regardless of completion order
+            for letters in executor.map(self._fetch_page, self.urls):
                 all_letters.extend(letters)
-            except Exception as e:
-                logger.error(f"An error occurred while processing {url}: {e}")
 
         for letter in all_letters:
             self._letters_by_number[letter.number] = letter
+        self._partially_indexed = False
 
         return all_letters
 
+    @classmethod
+    def letter_range_for_url(cls, url: str) -> Optional[Tuple[int, int]]:
+        """Return the (first, last) letter numbers on a page, or None if the page is unknown."""
+        match = re.search(r'\.ep(\d+(?:-\d+)?)\.shtml$', url)
+        return cls.PAGE_LETTER_RANGES.get(match.group(1)) if match else None
+
+    def url_for_letter(self, number: int) -> Optional[str]:
+        """Return the configured URL whose page holds a letter, or None if no known page does."""
+        for url in self.urls:
+            letter_range = self.letter_range_for_url(url)
+            if letter_range is not None and letter_range[0] <= number <= letter_range[1]:
+                return url
+        return None
+
     def get_letter_by_number(self, number: int) -> Optional[Letter]:
-        """Retrieve a letter by its number. Returns None if not found."""
-        if not self._letters_by_number:
-            logger.info("Letter index is empty. Fetching all letters first.")
+        """
+        Retrieve a letter by its number. Returns None if not found.
+
+        Only the page holding the letter is downloaded and parsed (parsed pages are
+        cached). Letters on pages outside PAGE_LETTER_RANGES fall back to fetching
+        all letters.
+        """
+        if self.snapshot is not None and number not in self._letters_by_number:
+            return self.snapshot.get(number)
+        if number in self._letters_by_number:
+            return self._letters_by_number[number]
+
+        url = self.url_for_letter(number)
+        if url is not None and url not in self._letters_by_page:
+            for letter in self._fetch_page(url):
+                self._letters_by_number[letter.number] = letter
+            self._partially_indexed = True
+            if number in self._letters_by_number:
+                return self._letters_by_number[number]
+            logger.info(f"Letter {number} not found on {url}.")
+
+        if not self._letters_by_number or self._partially_indexed:
+            logger.info("Letter index is incomplete. Fetching all letters first.")
             self.fetch_all_letters()
         return self._letters_by_number.get(number)
 
+    def save_snapshot(self, path: Path) -> CorpusSnapshot:
+        """
+        Write all letters to a corpus snapshot for fast loading later.
+
+        Args:
+            path: Destination of the snapshot file
+
+        Returns:
+            The opened snapshot
+        """
+        if self._letters_by_number and not self._partially_indexed:
+            letters = list(self._letters_by_number.values())
+        else:
+            letters = self.fetch_all_letters()
+        return CorpusSnapshot.write(letters, path)
+
     def fetch_letters_from_url(self, url: str) -> List[Letter]:
         """Download and extract Seneca's letters from a single URL."""
-        content = self.download_content(url)
+        if self.mirror is not None:
+            content = self.mirror.get(url, session=self.session, timeout=self.timeout)
+        else:
+            content = self.download_content(url, session=self.session, timeout=self.timeout)
         return self.extract_letters(content)
 
     @staticmethod
-    def download_content(url: str) -> str:
-        response = requests.get(url)
+    def download_content(
+        url: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = DEFAULT_TIMEOUT
+    ) -> str:
+        """Download a page, reusing session's pooled connections when given."""
+        response = (session or requests).get(url, timeout=timeout)
         response.raise_for_status()
         return response.text
 
@@ -118,35 +282,93 @@ class SenecaLetterDownloader:
 
         return sections
 
-    @classmethod
-    def extract_letters(cls, content: str) -> List[Letter]:
-        soup = BeautifulSoup(content, 'html.parser')
+    @staticmethod
+    def _iter_paragraphs_lxml(chunks: Iterable[str]) -> Iterator[Paragraph]:
+        """Stream <p> elements with lxml's C parser, discarding each once it is read."""
+        parser = etree.HTMLPullParser(events=("end",), tag="p")
+
+        def read_paragraphs() -> Iterator[Paragraph]:
+            for _, element in parser.read_events():
+                b_tag = element.find(".//b")
+                title = "".join(s.strip() for s in b_tag.itertext()) if b_tag is not None else None
+                yield Paragraph(title, (element.get("class") or "").split(), "".join(element.itertext()))
+                element.clear()
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield from read_paragraphs()
+        parser.close()
+        yield from read_paragraphs()
+
+    @staticmethod
+    def _iter_paragraphs_soup(chunks: Iterable[str]) -> Iterator[Paragraph]:
+        """Walk <p> elements of a full BeautifulSoup tree using the pure-Python html.parser."""
+        soup = BeautifulSoup("".join(chunks), 'html.parser')
         body = soup.find('body')
-        letters: List[Letter] = []
+        for tag in body.find_all('p'):
+            b_tag = tag.find('b')
+            title = b_tag.get_text(strip=True) if b_tag else None
+            yield Paragraph(title, tag.get('class') or [], tag.get_text())
+
+    @classmethod
+    def _build_letter(cls, number: int, roman: str, title: Optional[str], content_parts: List[str]) -> Letter:
+        full_content = '\n'.join(content_parts).strip()
+        return Letter(
+            number=number,
+            roman=roman,
+            title=title or "",
+            content=full_content,
+            sections=cls._parse_sections(full_content)
+        )
+
+    @classmethod
+    def iter_letters(cls, content: Union[str, Iterable[str]], backend: Optional[str] = None) -> Iterator[Letter]:
+        """
+        Yield letters from a page as soon as each one ends.
+
+        A letter ends at the next bold letter header or at a 'shortborder' paragraph.
+        Uses lxml's streaming parser when it is installed and falls back to
+        BeautifulSoup's html.parser otherwise.
+
+        Args:
+            content: Page HTML, either whole or as an iterable of text chunks
+            backend: Force 'lxml' or 'html.parser'; defaults to the fastest available
+
+        Returns:
+            Iterator of Letter objects in page order
+        """
+        backend = backend or cls.HTML_BACKEND
+        if isinstance(content, str):
+            text = content
+            chunks: Iterable[str] = (
+                text[i:i + cls.STREAM_CHUNK_SIZE] for i in range(0, len(text), cls.STREAM_CHUNK_SIZE)
+            )
+        else:
+            chunks = content
+        if backend == "lxml":
+            paragraphs = cls._iter_paragraphs_lxml(chunks)
+        elif backend == "html.parser":
+            paragraphs = cls._iter_paragraphs_soup(chunks)
+        else:
+            raise ValueError(f"Unknown HTML backend: {backend}")
+
         current_letter_number = None
         current_letter_roman = None
         current_letter_title = None
-        current_letter_content_parts: List[str] = [] # Changed name for clarity
+        current_letter_content_parts: List[str] = []
         collecting = False
 
-        for tag in body.find_all('p'):
-            b_tag = tag.find('b')
-            if b_tag:
-                # If we were collecting a previous letter, finalize and add it
+        for paragraph in paragraphs:
+            if paragraph.title is not None:
+                # If we were collecting a previous letter, finalize and yield it
                 if current_letter_number is not None:
-                    full_content = '\n'.join(current_letter_content_parts).strip()
-                    parsed_sections = cls._parse_sections(full_content)
-                    letters.append(Letter(
-                        number=current_letter_number,
-                        roman=current_letter_roman,
-                        title=current_letter_title or "",
-                        content=full_content,
-                        sections=parsed_sections # Pass parsed sections
-                    ))
+                    yield cls._build_letter(
+                        current_letter_number, current_letter_roman,
+                        current_letter_title, current_letter_content_parts
+                    )
 
                 # Start processing the new letter found
-                title_text = b_tag.get_text(strip=True)
-                parts = title_text.split('.', 1)
+                parts = paragraph.title.split('.', 1)
                 if len(parts) == 2:
                     roman_part = parts[0].strip()
                     try:
@@ -165,18 +387,13 @@ class SenecaLetterDownloader:
                 else:
                     # Title format doesn't match expected pattern
                     collecting = False
-            elif tag.get('class') and 'shortborder' in tag.get('class'):
+            elif 'shortborder' in paragraph.classes:
                 # End of a letter indicated by a border
                 if current_letter_number is not None:
-                    full_content = '\n'.join(current_letter_content_parts).strip()
-                    parsed_sections = cls._parse_sections(full_content)
-                    letters.append(Letter(
-                        number=current_letter_number,
-                        roman=current_letter_roman,
-                        title=current_letter_title or "",
-                        content=full_content,
-                        sections=parsed_sections # Pass parsed sections
-                    ))
+                    yield cls._build_letter(
+                        current_letter_number, current_letter_roman,
+                        current_letter_title, current_letter_content_parts
+                    )
                 # Reset state after the border
                 current_letter_number = None
                 current_letter_title = None
@@ -184,21 +401,19 @@ class SenecaLetterDownloader:
                 collecting = False
             elif collecting:
                 # Append the text content of the paragraph
-                current_letter_content_parts.append(tag.get_text())
+                current_letter_content_parts.append(paragraph.text)
 
         # Add the last letter if one was being processed
         if current_letter_number is not None and current_letter_content_parts:
-            full_content = '\n'.join(current_letter_content_parts).strip()
-            parsed_sections = cls._parse_sections(full_content)
-            letters.append(Letter(
-                number=current_letter_number,
-                roman=current_letter_roman,
-                title=current_letter_title or "",
-                content=full_content,
-                sections=parsed_sections # Pass parsed sections
-            ))
-
-        return letters
+            yield cls._build_letter(
+                current_letter_number, current_letter_roman,
+                current_letter_title, current_letter_content_parts
+            )
+
+    @classmethod
+    def extract_letters(cls, content: str, backend: Optional[str] = None) -> List[Letter]:
+        """Extract all letters from a page. See iter_letters."""
+        return list(cls.iter_letters(content, backend=backend))
 
 # Deprecated: use SenecaLetterDownloader instead
 def fetch_letters(urls: List[str]) -> List[Letter]:
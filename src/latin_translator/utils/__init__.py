@@ -3,6 +3,13 @@
 This package contains various utility modules used across the project:
 - text_utils: Text processing and manipulation utilities
 - logging_config: Logging configuration and management
+- rate_limiter: Adaptive client-side rate limiting for API calls
+- retry_policy: Retries, backoff and hedged requests for API calls
+- metrics: Per-call latency, token usage and cost accounting
+- http_instrumentation: Sampled hooks for logging and capturing API traffic
+- context_budget: Token-budgeted selection of conversation history
+- conversation_window: Bounded ring buffer of recent exchanges
+- prompt_registry: Process-wide, versioned prompt files with hot reload
 """
 
 from .text_utils import (
@@ -15,6 +22,14 @@ from .text_utils import (
 
 from .logging_config import LoggingManager
 
+from .rate_limiter import AdaptiveRateLimiter
+from .retry_policy import RetryPolicy
+from .metrics import TranslationMetrics
+from .http_instrumentation import HttpInstrumentation
+from .context_budget import ContextBudget
+from .conversation_window import ConversationWindow
+from .prompt_registry import PromptRegistry, get_prompt_registry
+
 __all__ = [
     # Text utilities
     'split_paragraphs',
@@ -25,4 +40,20 @@ __all__ = [
     
     # Logging utilities
     'LoggingManager',
+    
+    # Rate limiting
+    'AdaptiveRateLimiter',
+    'RetryPolicy',
+    
+    # Metrics
+    'TranslationMetrics',
+    'HttpInstrumentation',
+    
+    # Context
+    'ContextBudget',
+    'ConversationWindow',
+    
+    # Prompts
+    'PromptRegistry',
+    'get_prompt_registry',
 ] 
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""Token-budgeted selection of the conversation history sent with each request."""
+
+from typing import Callable, List, Optional
+import logging
+import re
+import threading
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Chat formatting overhead per message and for priming the reply, as in OpenAI's counting guide
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the BPE tokens of text without a tokenizer.
+
+    Each punctuation mark counts as one token and each word as one token per
+    started six characters. Long Latin inflections split into several tokens,
+    which a flat characters-per-token ratio undercounts.
+    """
+    return sum(1 + (len(piece) - 1) // 6 for piece in _TOKEN_RE.findall(text))
+
+
+def estimate_message_tokens(
+    messages: List[dict],
+    estimator: Callable[[str], int] = estimate_tokens
+) -> int:
+    """Estimate the prompt tokens of a chat request."""
+    return sum(estimator(message.get("content") or "") + MESSAGE_OVERHEAD for message in messages) + REPLY_OVERHEAD
+
+
+class ContextStats(BaseModel):
+    """Running totals of what the budget kept and dropped."""
+    requests: int = 0
+    trimmed_requests: int = 0
+    prompt_tokens: int = 0  # Estimated tokens of the messages actually sent
+    tokens_saved: int = 0   # Estimated tokens of the history that was left out
+    exchanges_dropped: int = 0
+
+    def since(self, earlier: "ContextStats") -> "ContextStats":
+        """The totals accumulated after an earlier snapshot of the same budget."""
+        return ContextStats(**{
+            field: value - getattr(earlier, field) for field, value in self.model_dump().items()
+        })
+
+
+class ContextBudget:
+    """Keeps the system prompt plus as many recent exchanges as fit a token budget.
+
+    The system prompt and the text being translated are always sent; earlier
+    user/assistant exchanges are added newest first until the next one would
+    exceed `max_tokens`. A single long exchange therefore pushes older context
+    out instead of inflating every following request.
+
+    Example:
+        >>> budget = ContextBudget(max_tokens=1500)
+        >>> messages = budget.select(conversation_history)
+        >>> budget.stats().tokens_saved
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        max_exchanges: Optional[int] = 16,
+        estimator: Callable[[str], int] = estimate_tokens
+    ):
+        """
+        Args:
+            max_tokens: Estimated prompt tokens allowed per request, including the system prompt
+            max_exchanges: Cap on the number of previous exchanges, whatever their size; also the
+                size of LetterTranslator's conversation window. None for no cap
+            estimator: Tokens in a piece of text, e.g. a tiktoken encoder's `len(encode(text))`
+        """
+        self.max_tokens = max_tokens
+        self.max_exchanges = max_exchanges
+        self.estimator = estimator
+        self._stats = ContextStats()
+        self._lock = threading.Lock()
+
+    def _tokens(self, messages: List[dict]) -> int:
+        return sum(self.estimator(message.get("content") or "") + MESSAGE_OVERHEAD for message in messages)
+
+    def select(self, conversation_history: List[dict]) -> List[dict]:
+        """
+        Choose the messages to send from a history of
+        [system, user, assistant, ..., user].
+
+        Returns:
+            The system message, the most recent exchanges that fit and the final user message
+        """
+        system, previous, current = conversation_history[:1], conversation_history[1:-1], conversation_history[-1:]
+        used = self._tokens(system) + self._tokens(current) + REPLY_OVERHEAD
+        full = used + self._tokens(previous)
+
+        kept = 0
+        start = len(previous)
+        # Walk back one exchange at a time so a user message is never sent without its reply
+        while start > 0 and (self.max_exchanges is None or kept < self.max_exchanges):
+            exchange = previous[max(start - 2, 0):start]
+            cost = self._tokens(exchange)
+            if used + cost > self.max_tokens:
+                break
+            used += cost
+            start -= len(exchange)
+            kept += 1
+
+        dropped = (start + 1) // 2
+        with self._lock:
+            self._stats.requests += 1
+            self._stats.prompt_tokens += used
+            self._stats.tokens_saved += full - used
+            if dropped:
+                self._stats.trimmed_requests += 1
+                self._stats.exchanges_dropped += dropped
+        if dropped:
+            logger.debug(f"Context budget dropped {dropped} exchange(s), ~{full - used} tokens")
+        return system + previous[start:] + current
+
+    def stats(self) -> ContextStats:
+        with self._lock:
+            return self._stats.model_copy()
@@ -0,0 +1,82 @@
+"""Bounded conversation history for the rolling translation context."""
+
+from collections import deque
+from itertools import chain
+from typing import Deque, Iterator, List, Optional, Tuple, Union
+
+
+class ConversationWindow:
+    """The system message plus a ring buffer of the most recent exchanges.
+
+    A plain message list grows by two entries per translated chunk and has to be
+    sliced (copied) for every request. The window keeps at most `max_exchanges`
+    user/assistant pairs, dropping the oldest as new ones arrive, so memory and
+    the cost of building a request stay constant however long the letter is.
+
+    Example:
+        >>> window = ConversationWindow("Translate literally.", max_exchanges=2)
+        >>> window.ask("Seneca Lucilio suo salutem.")
+        >>> client.chat.completions.create(model=model, messages=window.messages())
+        >>> window.answer(reply)
+    """
+
+    def __init__(self, system_prompt: str, max_exchanges: Optional[int] = None):
+        """
+        Args:
+            system_prompt: Content of the system message sent with every request
+            max_exchanges: Previous exchanges kept; None keeps all of them
+        """
+        self.system = {"role": "system", "content": system_prompt}
+        self._exchanges: Deque[Tuple[dict, dict]] = deque(maxlen=max_exchanges)
+        self._pending: Optional[dict] = None
+
+    @classmethod
+    def from_messages(cls, messages: List[dict], max_exchanges: Optional[int] = None) -> "ConversationWindow":
+        """Build a window from a [system, user, assistant, ..., (user)] message list."""
+        window = cls(messages[0]["content"] if messages else "", max_exchanges)
+        rest = messages[1:]
+        for user, assistant in zip(rest[0::2], rest[1::2]):
+            window._exchanges.append((user, assistant))
+        if len(rest) % 2:
+            window._pending = rest[-1]
+        return window
+
+    @property
+    def max_exchanges(self) -> Optional[int]:
+        return self._exchanges.maxlen
+
+    @property
+    def last_reply(self) -> Optional[str]:
+        """Content of the most recent assistant message."""
+        return self._exchanges[-1][1]["content"] if self._exchanges else None
+
+    def ask(self, text: str) -> None:
+        """Set the user message awaiting a reply, replacing one whose request failed."""
+        self._pending = {"role": "user", "content": text}
+
+    def answer(self, reply: str) -> None:
+        """Complete the pending exchange with the assistant's reply."""
+        if self._pending is None:
+            raise ValueError("No user message is awaiting a reply")
+        self._exchanges.append((self._pending, {"role": "assistant", "content": reply}))
+        self._pending = None
+
+    def add_exchange(self, text: str, reply: str) -> None:
+        """Record a complete exchange that was not sent, e.g. a preserved or replayed one."""
+        self.ask(text)
+        self.answer(reply)
+
+    def __iter__(self) -> Iterator[dict]:
+        pending = [self._pending] if self._pending is not None else []
+        return chain([self.system], chain.from_iterable(self._exchanges), pending)
+
+    def __len__(self) -> int:
+        return 1 + 2 * len(self._exchanges) + (self._pending is not None)
+
+    def messages(self) -> List[dict]:
+        """The request payload: system message, kept exchanges and any pending user message."""
+        return list(self)
+
+
+# What translate_chunk accepts as history; lists are converted to a window
+History = Union[ConversationWindow, List[dict]]
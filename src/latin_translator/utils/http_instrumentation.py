@@ -0,0 +1,134 @@
+"""Sampled, low-overhead instrumentation of the HTTP calls made to the OpenAI API."""
+
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+import logging
+import random
+import threading
+import time
+
+from pydantic import BaseModel
+
+# Kept under the translator's logger name so existing logging configuration applies
+http_logger = logging.getLogger("latin_translator.service.letter_translator.http")
+
+_EXCHANGE_KEY = "latin_translator_exchange"
+
+
+class HttpExchange(BaseModel):
+    """One captured request and, once it arrives, its response."""
+    method: str
+    url: str
+    request_body: Optional[str] = None
+    started_at: float
+    status_code: Optional[int] = None
+    elapsed: Optional[float] = None  # Seconds until the response headers arrived
+    request_id: Optional[str] = None  # OpenAI's x-request-id, for support tickets
+
+
+class HttpInstrumentation:
+    """Pluggable httpx event hooks for debugging API traffic.
+
+    Only a sampled fraction of requests is looked at; for the rest the hooks
+    return after one comparison. Sampled requests are logged to the `.http`
+    logger at DEBUG (only if that level is enabled) and kept in a bounded ring
+    buffer of the last `capacity` exchanges, so detailed capture can be left on
+    in production and inspected after the fact with `recent()`.
+
+    A disabled instance installs no hooks at all.
+
+    Example:
+        >>> instrumentation = HttpInstrumentation(sample_rate=0.01, capacity=200)
+        >>> translator = LetterTranslator(instrumentation=instrumentation)
+        >>> instrumentation.recent()[-1].status_code
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        sample_rate: float = 1.0,
+        capacity: int = 0,
+        capture_bodies: bool = True,
+        max_body_chars: int = 16_384,
+        rng: Optional[Callable[[], float]] = None
+    ):
+        """
+        Args:
+            enabled: Install hooks at all
+            sample_rate: Fraction of requests to log and capture
+            capacity: Number of recent exchanges kept in memory; 0 to only log
+            capture_bodies: Keep request bodies (truncated to max_body_chars)
+            max_body_chars: Longest request body kept per exchange
+            rng: Source of uniform [0, 1) numbers for sampling, for tests
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.capacity = capacity
+        self.capture_bodies = capture_bodies
+        self.max_body_chars = max_body_chars
+        self._rng = rng or random.random
+        self._buffer: Deque[HttpExchange] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def _sampled(self) -> bool:
+        if self.capacity == 0 and not http_logger.isEnabledFor(logging.DEBUG):
+            # Nothing would be kept or logged
+            return False
+        return self.sample_rate >= 1.0 or self._rng() < self.sample_rate
+
+    def on_request(self, request) -> None:
+        """httpx request hook."""
+        if not self._sampled():
+            return
+        exchange = HttpExchange(method=request.method, url=str(request.url), started_at=time.time())
+        if self.capture_bodies and request.content:
+            # Decode before cutting so a multi-byte character is never split; a UTF-8
+            # character is at most 4 bytes, so only that much of the body is decoded
+            body = request.content[:4 * self.max_body_chars].decode("utf-8", errors="replace")
+            exchange.request_body = body[:self.max_body_chars]
+        request.extensions[_EXCHANGE_KEY] = exchange
+        if self.capacity:
+            with self._lock:
+                self._buffer.append(exchange)
+        if http_logger.isEnabledFor(logging.DEBUG):
+            http_logger.debug("OpenAI Request: %s %s", exchange.method, exchange.url)
+            if exchange.request_body is not None:
+                http_logger.debug("Request body: %s", exchange.request_body)
+
+    def on_response(self, response) -> None:
+        """httpx response hook."""
+        exchange = response.request.extensions.get(_EXCHANGE_KEY)
+        if exchange is None:
+            return
+        exchange.status_code = response.status_code
+        exchange.elapsed = time.time() - exchange.started_at
+        exchange.request_id = response.headers.get("x-request-id")
+        http_logger.debug("OpenAI Response: HTTP %s in %.3fs", exchange.status_code, exchange.elapsed)
+
+    async def aon_request(self, request) -> None:
+        # httpx.AsyncClient awaits its event hooks
+        self.on_request(request)
+
+    async def aon_response(self, response) -> None:
+        self.on_response(response)
+
+    def event_hooks(self) -> Dict[str, List[Callable]]:
+        """Hooks for an httpx.Client (empty when disabled)."""
+        if not self.enabled:
+            return {"request": [], "response": []}
+        return {"request": [self.on_request], "response": [self.on_response]}
+
+    def async_event_hooks(self) -> Dict[str, List[Callable]]:
+        """Hooks for an httpx.AsyncClient (empty when disabled)."""
+        if not self.enabled:
+            return {"request": [], "response": []}
+        return {"request": [self.aon_request], "response": [self.aon_response]}
+
+    def recent(self) -> List[HttpExchange]:
+        """The buffered exchanges, oldest first."""
+        with self._lock:
+            return list(self._buffer)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
@@ -60,12 +60,12 @@ class LoggingManager:
         if not self._configured:
             self.configure_base_logging()
             
-        http_logger = logging.getLogger('latin_translator.service.orchestrator.http')
-        orchestrator_logger = logging.getLogger('latin_translator.service.orchestrator')
+        http_logger = logging.getLogger('latin_translator.service.letter_translator.http')
+        translator_logger = logging.getLogger('latin_translator.service.letter_translator')
         
         level = logging.DEBUG if enable else logging.WARNING
         http_logger.setLevel(level)
-        orchestrator_logger.setLevel(level if enable else logging.INFO)
+        translator_logger.setLevel(level if enable else logging.INFO)
         
         status = "enabled" if enable else "disabled"
         logging.getLogger('translate_letter').info(f"OpenAI debug logging {status}")
@@ -0,0 +1,249 @@
+"""Per-call latency, token usage and cost accounting for translation requests."""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import bisect
+import json
+import logging
+import os
+import threading
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+
+class ModelPrice(BaseModel):
+    """USD per million tokens."""
+    prompt: float
+    cached_prompt: float
+    completion: float
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> float:
+        uncached = max(prompt_tokens - cached_tokens, 0)
+        return (
+            uncached * self.prompt
+            + cached_tokens * self.cached_prompt
+            + completion_tokens * self.completion
+        ) / 1_000_000
+
+
+# List prices at the time of writing; pass `prices` to TranslationMetrics to override
+DEFAULT_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o": ModelPrice(prompt=2.50, cached_prompt=1.25, completion=10.00),
+    "gpt-4o-mini": ModelPrice(prompt=0.15, cached_prompt=0.075, completion=0.60),
+    "gpt-4.1": ModelPrice(prompt=2.00, cached_prompt=0.50, completion=8.00),
+    "gpt-4.1-mini": ModelPrice(prompt=0.40, cached_prompt=0.10, completion=1.60),
+}
+
+
+class CallLabels(BaseModel, frozen=True):
+    """Dimensions every call is broken down by."""
+    phase: str
+    model: str
+    letter: str = ""  # Empty when the caller did not say which letter
+    prompt_version: str = ""
+
+
+class CallStats(BaseModel):
+    """Aggregates for one set of labels."""
+    labels: CallLabels
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    latency_seconds_sum: float = 0.0
+    latency_buckets: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)  # Last bucket is +Inf
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost_usd: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency_seconds_sum / self.calls if self.calls else 0.0
+
+
+class MetricsSummary(BaseModel):
+    """Totals across all labels plus the per-label breakdown."""
+    calls: int
+    errors: int
+    cache_hits: int
+    latency_seconds_sum: float
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    cost_usd: float
+    by_labels: List[CallStats]
+
+    @property
+    def prompt_cache_ratio(self) -> float:
+        """Fraction of prompt tokens the provider served from its prompt cache."""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+class TranslationMetrics:
+    """Collects per-call metrics from LetterTranslator and exports them.
+
+    Calls are aggregated by (phase, model, letter, prompt version): a latency
+    histogram, prompt/completion/cached token counts and an estimated cost from
+    the model's per-token prices. Cache hits are counted separately and cost
+    nothing. With an export_dir, LetterTranslator writes `metrics.prom`
+    (Prometheus text format, for the node_exporter textfile collector) and
+    `metrics.json` after every letter.
+
+    Example:
+        >>> metrics = TranslationMetrics(export_dir=Path("metrics"))
+        >>> translator = LetterTranslator(metrics=metrics)
+        >>> translator.process_letter(letter.content, letter_number=letter.number)
+        >>> metrics.summary().cost_usd
+    """
+
+    def __init__(
+        self,
+        export_dir: Optional[Union[str, Path]] = None,
+        prices: Optional[Dict[str, ModelPrice]] = None
+    ):
+        """
+        Args:
+            export_dir: Directory for metrics.prom and metrics.json; None to only collect in memory
+            prices: Per-model prices, replacing DEFAULT_PRICES; unknown models cost 0
+        """
+        self.export_dir = Path(export_dir) if export_dir is not None else None
+        self.prices = prices if prices is not None else DEFAULT_PRICES
+        self._stats: Dict[CallLabels, CallStats] = {}
+        self._lock = threading.Lock()
+
+    def _price(self, model: str) -> Optional[ModelPrice]:
+        if model in self.prices:
+            return self.prices[model]
+        # Dated snapshots (e.g. gpt-4o-2024-08-06) share their base model's price
+        matches = [name for name in self.prices if model.startswith(name + "-")]
+        return self.prices[max(matches, key=len)] if matches else None
+
+    def _entry(self, labels: CallLabels) -> CallStats:
+        if labels not in self._stats:
+            self._stats[labels] = CallStats(labels=labels)
+        return self._stats[labels]
+
+    def record_call(
+        self,
+        labels: CallLabels,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0
+    ) -> None:
+        """Record a completed API call."""
+        price = self._price(labels.model)
+        cost = price.cost(prompt_tokens, completion_tokens, cached_tokens) if price is not None else 0.0
+        with self._lock:
+            entry = self._entry(labels)
+            entry.calls += 1
+            entry.latency_seconds_sum += latency
+            entry.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+            entry.prompt_tokens += prompt_tokens
+            entry.completion_tokens += completion_tokens
+            entry.cached_tokens += cached_tokens
+            entry.cost_usd += cost
+
+    def record_error(self, labels: CallLabels) -> None:
+        """Record an API call that failed after any retries."""
+        with self._lock:
+            self._entry(labels).errors += 1
+
+    def record_cache_hit(self, labels: CallLabels) -> None:
+        """Record a reply served from the TranslationCache instead of the API."""
+        with self._lock:
+            self._entry(labels).cache_hits += 1
+
+    def summary(self) -> MetricsSummary:
+        """Totals and per-label breakdown, sorted by label."""
+        with self._lock:
+            stats = [entry.model_copy(deep=True) for entry in self._stats.values()]
+        stats.sort(key=lambda entry: tuple(entry.labels.model_dump().values()))
+        return MetricsSummary(
+            calls=sum(entry.calls for entry in stats),
+            errors=sum(entry.errors for entry in stats),
+            cache_hits=sum(entry.cache_hits for entry in stats),
+            latency_seconds_sum=sum(entry.latency_seconds_sum for entry in stats),
+            prompt_tokens=sum(entry.prompt_tokens for entry in stats),
+            completion_tokens=sum(entry.completion_tokens for entry in stats),
+            cached_tokens=sum(entry.cached_tokens for entry in stats),
+            cost_usd=sum(entry.cost_usd for entry in stats),
+            by_labels=stats
+        )
+
+    @staticmethod
+    def _label_text(labels: CallLabels, **extra: str) -> str:
+        pairs = {**labels.model_dump(), **extra}
+        escaped = (
+            name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for name, value in pairs.items()
+        )
+        return "{" + ",".join(escaped) + "}"
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = [
+            "# HELP latin_translator_request_duration_seconds Chat completion latency, including retries.",
+            "# TYPE latin_translator_request_duration_seconds histogram",
+        ]
+        for entry in summary.by_labels:
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), entry.latency_buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(
+                    f"latin_translator_request_duration_seconds_bucket{self._label_text(entry.labels, le=le)} {cumulative}"
+                )
+            labels = self._label_text(entry.labels)
+            lines.append(f"latin_translator_request_duration_seconds_sum{labels} {entry.latency_seconds_sum}")
+            lines.append(f"latin_translator_request_duration_seconds_count{labels} {entry.calls}")
+
+        counters = [
+            ("latin_translator_request_errors_total", "Chat completions that failed after retries.", "errors"),
+            ("latin_translator_cache_hits_total", "Replies served from the translation cache.", "cache_hits"),
+            ("latin_translator_cost_usd_total", "Estimated spend from list prices.", "cost_usd"),
+        ]
+        for name, help_text, field in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{self._label_text(e.labels)} {getattr(e, field)}" for e in summary.by_labels]
+
+        lines += [
+            "# HELP latin_translator_tokens_total Tokens reported by the API (cached is a subset of prompt).",
+            "# TYPE latin_translator_tokens_total counter",
+        ]
+        for entry in summary.by_labels:
+            for kind in ("prompt", "completion", "cached"):
+                lines.append(
+                    f"latin_translator_tokens_total{self._label_text(entry.labels, kind=kind)} "
+                    f"{getattr(entry, kind + '_tokens')}"
+                )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        # The textfile collector may read at any moment, so never expose a partial file
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def export(self) -> MetricsSummary:
+        """Log a one-line summary and write metrics.prom and metrics.json to export_dir, if set."""
+        summary = self.summary()
+        logger.info(
+            f"Translation metrics: {summary.calls} calls, {summary.cache_hits} cache hits, "
+            f"{summary.prompt_tokens} prompt / {summary.completion_tokens} completion / "
+            f"{summary.cached_tokens} cached tokens ({summary.prompt_cache_ratio:.0%} of prompt), "
+            f"~${summary.cost_usd:.4f}"
+        )
+        if self.export_dir is None:
+            return summary
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(self.export_dir / "metrics.prom", self.to_prometheus())
+        self._write_atomic(self.export_dir / "metrics.json", json.dumps(summary.model_dump(), indent=2))
+        return summary
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import List, Optional
 import logging
 from ..models import Letter
+from ..cache import CorpusSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -17,22 +18,30 @@ class MockLetterSource:
     The first line of each file should contain the title in the format:
     "I. TITLE" or "II. TITLE" etc., where the Roman numeral is followed by a period.
     The rest of the file contains the letter content.
+    
+    Alternatively, a CorpusSnapshot can be given, in which case letters are loaded
+    from the snapshot instead of the text files.
     """
     
     DEFAULT_TEST_DATA_DIR = Path("tests/test_data/letters")
     
-    def __init__(self, test_data_dir: Optional[Path] = None):
+    def __init__(self, test_data_dir: Optional[Path] = None, snapshot: Optional[CorpusSnapshot] = None):
         """Initialize the mock letter source.
         
         Args:
             test_data_dir: Optional path to the directory containing test letter files.
                           If not provided, uses DEFAULT_TEST_DATA_DIR.
+            snapshot: Optional corpus snapshot to load letters from instead of text files.
         """
         self.test_data_dir = test_data_dir or self.DEFAULT_TEST_DATA_DIR
         self.test_data_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot = snapshot
         
     def fetch_all_letters(self) -> List[Letter]:
-        """Load all test letters from the test data directory."""
+        """Load all test letters from the snapshot or the test data directory."""
+        if self.snapshot is not None:
+            return self.snapshot.letters()
+        
         all_letters: List[Letter] = []
         
         for letter_file in sorted(self.test_data_dir.glob("*.txt")):
@@ -59,6 +68,12 @@ class MockLetterSource:
             
         return self._load_letter_from_file(letter_path)
     
+    def get_letter_by_number(self, number: int) -> Optional[Letter]:
+        """Load a test letter by its number. Returns None if not found."""
+        if self.snapshot is not None:
+            return self.snapshot.get(number)
+        return next((letter for letter in self.fetch_all_letters() if letter.number == number), None)
+    
     @staticmethod
     def _load_letter_from_file(file_path: Path) -> Letter:
         """Load a letter from a text file.
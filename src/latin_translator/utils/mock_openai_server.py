@@ -0,0 +1,209 @@
+"""A local OpenAI-compatible HTTP server for load and soak testing.
+
+Usage:
+    python -m latin_translator.utils.mock_openai_server --port 8089 --latency 0.4 --throttle-rate 0.02
+    OPENAI_API_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=mock latin-translate 1-124 --workers 4
+"""
+
+from contextlib import contextmanager
+from http import HTTPStatus
+from typing import Iterator, List, Optional, Set, Tuple
+import argparse
+import asyncio
+import logging
+import threading
+
+import httpx
+
+from .mock_openai_transport import MockOpenAITransport, lognormal_latency, transform_responder, uniform_latency
+
+logger = logging.getLogger(__name__)
+
+TRANSFORMS = {
+    "echo": None,
+    "upper": transform_responder(str.upper),
+    "tag": transform_responder(lambda text: f"[EN] {text}"),
+}
+
+
+class MockOpenAIServer:
+    """Serves a MockOpenAITransport over real HTTP/1.1 with keep-alive.
+
+    Unlike mounting the transport directly on a client, this exercises the
+    OpenAI SDK's HTTP stack end to end: connection pooling, streamed (chunked)
+    responses, status handling and rate-limit headers. Point a translator at
+    `base_url`, or set OPENAI_API_BASE_URL so Settings picks it up.
+
+    Example:
+        >>> server = MockOpenAIServer(MockOpenAITransport(latency=0.2, error_rate=0.01))
+        >>> with server.run_in_thread() as base_url:
+        ...     LetterTranslator(base_url=base_url).process_letter(letter.content)
+    """
+
+    def __init__(self, transport: Optional[MockOpenAITransport] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            transport: The mock that answers requests. Defaults to an instant echo.
+            host: Interface to listen on
+            port: Port to listen on; 0 picks a free one
+        """
+        self.transport = transport or MockOpenAITransport()
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.Server] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> str:
+        """Start listening and return the base URL."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock OpenAI server listening on {self.base_url}")
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed() open
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def __aenter__(self) -> "MockOpenAIServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    @contextmanager
+    def run_in_thread(self) -> Iterator[str]:
+        """Run the server on a background event loop for the duration of the block."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+        finally:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    @staticmethod
+    async def _read_headers(reader: asyncio.StreamReader) -> List[Tuple[str, str]]:
+        headers = []
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers.append((name.strip(), value.strip()))
+        return headers
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        body = bytearray()
+        while (size := int((await reader.readline()).split(b";")[0], 16)) > 0:
+            body += await reader.readexactly(size)
+            await reader.readline()
+        await reader.readline()  # Blank line after the (ignored) trailers
+        return bytes(body)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while request_line := await reader.readline():
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = await self._read_headers(reader)
+                lookup = {name.lower(): value for name, value in headers}
+                if lookup.get("transfer-encoding", "").lower() == "chunked":
+                    body = await self._read_chunked(reader)
+                else:
+                    body = await reader.readexactly(int(lookup.get("content-length", 0)))
+
+                request = httpx.Request(
+                    method,
+                    f"http://{self.host}:{self.port}{target}",
+                    headers=[(n, v) for n, v in headers if n.lower() not in ("content-length", "transfer-encoding")],
+                    content=body
+                )
+                response = await self.transport.handle_async_request(request)
+                await self._write_response(writer, response)
+                if lookup.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, response: httpx.Response) -> None:
+        streaming = response.headers.get("content-type", "").startswith("text/event-stream")
+        lines = [f"HTTP/1.1 {response.status_code} {HTTPStatus(response.status_code).phrase}"]
+        lines += [
+            f"{name}: {value}" for name, value in response.headers.items()
+            if name.lower() not in ("content-length", "transfer-encoding", "connection")
+        ]
+        if streaming:
+            lines.append("Transfer-Encoding: chunked")
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            async for chunk in response.aiter_raw():
+                writer.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        else:
+            body = await response.aread()
+            lines.append(f"Content-Length: {len(body)}")
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible mock server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean (uniform) or median (lognormal) seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Half-width of uniform latency noise")
+    parser.add_argument("--distribution", choices=["uniform", "lognormal"], default="uniform")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Shape of the lognormal distribution")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests throttled with 429")
+    parser.add_argument("--retry-after", type=float, default=0.5, help="Seconds advertised on injected 429s")
+    parser.add_argument("--rpm", type=int, help="Enforced requests per minute")
+    parser.add_argument("--transform", choices=list(TRANSFORMS), default="echo", help="How replies are derived")
+    parser.add_argument("--seed", type=int, help="Seed for latency and failure draws")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+
+    sampler = (
+        lognormal_latency(args.latency, args.sigma) if args.distribution == "lognormal"
+        else uniform_latency(args.latency, args.jitter)
+    )
+    transport = MockOpenAITransport(
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        responder=TRANSFORMS[args.transform],
+        seed=args.seed,
+        latency_sampler=sampler,
+        token_latency=args.token_latency,
+        requests_per_minute=args.rpm
+    )
+    server = MockOpenAIServer(transport, args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+from collections import deque
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Set
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+import uuid
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_NUMBERED_LINE_RE = re.compile(r"^\d+\.\s+(.*)$", re.MULTILINE)
+
+# OpenAI caches prompt prefixes of at least 1024 tokens, in 128-token increments
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_INCREMENT = 128
+
+LatencySampler = Callable[[random.Random], float]
+
+
+def _is_batch(content: str) -> bool:
+    # Paragraph batches number their sentences; combined mode sends one bare sentence
+    return _NUMBERED_LINE_RE.search(content) is not None
+
+
+def default_responder(body: dict) -> str:
+    """
+    Echo the last user message as its "translation".
+
+    JSON-mode requests get a {"translations": [...]} object with one entry per
+    numbered sentence for paragraph batches, and a {"direct": ..., "rhetorical": ...}
+    object for combined-mode sentences.
+    """
+    content = body["messages"][-1]["content"]
+    if body.get("response_format", {}).get("type") == "json_object":
+        if _is_batch(content):
+            return json.dumps({"translations": _NUMBERED_LINE_RE.findall(content)})
+        return json.dumps({"direct": content, "rhetorical": content})
+    return content
+
+
+def transform_responder(transform: Callable[[str], str]) -> Callable[[dict], str]:
+    """A responder that applies `transform` to each sentence default_responder would echo."""
+    def respond(body: dict) -> str:
+        if body.get("response_format", {}).get("type") == "json_object":
+            reply = json.loads(default_responder(body))
+            if "translations" in reply:
+                return json.dumps({"translations": [transform(sentence) for sentence in reply["translations"]]})
+            return json.dumps({key: transform(value) for key, value in reply.items()})
+        return transform(default_responder(body))
+    return respond
+
+
+def uniform_latency(mean: float, jitter: float = 0.0) -> LatencySampler:
+    """Latency drawn uniformly from mean +/- jitter."""
+    return lambda rng: max(mean + rng.uniform(-jitter, jitter), 0.0)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencySampler:
+    """Long-tailed latency like real API calls: log-normal with the given median."""
+    return lambda rng: rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def chat_completion_payload(body: dict, content: str, cached_tokens: int = 0) -> dict:
+    """A chat.completion response body in the OpenAI wire format."""
+    prompt_tokens = sum(estimate_tokens(m["content"]) for m in body["messages"])
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+def stream_events(body: dict, content: str, cached_tokens: int = 0) -> Iterator[bytes]:
+    """Server-sent events for a streamed chat completion, one word per chunk."""
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+
+    def chunk(delta: dict, finish_reason: Optional[str] = None, usage: Optional[dict] = None) -> bytes:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if usage is None else [],
+        }
+        if usage is not None:
+            payload["usage"] = usage
+        return f"data: {json.dumps(payload)}\n\n".encode("utf-8")
+
+    yield chunk({"role": "assistant", "content": ""})
+    for piece in re.findall(r"\S+\s*", content):
+        yield chunk({"content": piece})
+    yield chunk({}, finish_reason="stop")
+    if body.get("stream_options", {}).get("include_usage"):
+        yield chunk({}, usage=chat_completion_payload(body, content, cached_tokens)["usage"])
+    yield b"data: [DONE]\n\n"
+
+
+def error_payload(message: str, error_type: str) -> dict:
+    return {"error": {"message": message, "type": error_type, "param": None, "code": None}}
+
+
+class MockOpenAITransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """An in-process stand-in for the OpenAI API.
+
+    Mount it on an httpx client (sync or async) to exercise LetterTranslator
+    without network access, or serve it over HTTP with MockOpenAIServer.
+
+    Chat completions wait for a latency drawn from `latency_sampler` (by default
+    `latency` +/- `jitter`) and then fail with a 500 at `error_rate`, are
+    throttled with a 429 (and a retry-after-ms header) at `throttle_rate` or
+    when `requests_per_minute` is used up, or succeed with a reply from
+    `responder`. Streaming requests get server-sent events, optionally paced by
+    `token_latency`. Successful replies carry token usage and x-ratelimit-*
+    headers like the real API; a system prompt sent before is reported as
+    cached prompt tokens, as the provider's prefix cache would serve it.
+
+    The Files and Batches endpoints used by OpenAIBatchBackend are also served:
+    a batch is answered in full as soon as it is created.
+
+    Example:
+        >>> transport = MockOpenAITransport(latency_sampler=lognormal_latency(0.4), throttle_rate=0.02)
+        >>> translator = LetterTranslator(http_transport=transport)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.05,
+        responder: Optional[Callable[[dict], str]] = None,
+        seed: Optional[int] = None,
+        latency_sampler: Optional[LatencySampler] = None,
+        token_latency: float = 0.0,
+        requests_per_minute: Optional[int] = None
+    ):
+        """Initialize the mock endpoint.
+
+        Args:
+            latency: Mean seconds before each response
+            jitter: Half-width of the uniform noise added to latency
+            error_rate: Fraction of requests answered with HTTP 500
+            throttle_rate: Fraction of requests answered with HTTP 429
+            retry_after: Seconds advertised in retry-after-ms on an injected 429
+            responder: Function mapping a request body to reply content. Defaults to default_responder.
+            seed: Seed for the latency and failure draws, for reproducible runs
+            latency_sampler: Custom latency distribution, replacing latency and jitter
+            token_latency: Seconds between streamed chunks
+            requests_per_minute: Rolling request limit reported in headers and enforced with 429s
+        """
+        self.latency_sampler = latency_sampler or uniform_latency(latency, jitter)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.responder = responder or default_responder
+        self.token_latency = token_latency
+        self.requests_per_minute = requests_per_minute
+        self.requests: List[dict] = []
+        self.errors = 0
+        self.throttled = 0
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, dict] = {}
+        self._window: Deque[float] = deque()
+        self._cached_prefixes: Set[str] = set()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> tuple[float, float]:
+        with self._lock:
+            return self.latency_sampler(self._random), self._random.random()
+
+    def _admit(self) -> tuple[Optional[float], Dict[str, str]]:
+        """
+        Count a request against requests_per_minute.
+
+        Returns:
+            Tuple of (seconds until a slot frees up if the limit is used up, else None;
+            x-ratelimit-* headers)
+        """
+        headers = {
+            "x-ratelimit-remaining-tokens": "10000000",
+            "x-ratelimit-reset-tokens": "1ms",
+        }
+        if self.requests_per_minute is None:
+            headers.update({"x-ratelimit-remaining-requests": "10000", "x-ratelimit-reset-requests": "1ms"})
+            return None, headers
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0] >= 60.0:
+                self._window.popleft()
+            wait = 60.0 - (now - self._window[0]) if self._window else 0.0
+            if len(self._window) >= self.requests_per_minute:
+                headers.update({
+                    "x-ratelimit-limit-requests": str(self.requests_per_minute),
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": f"{int(wait * 1000)}ms",
+                })
+                return wait, headers
+            self._window.append(now)
+            headers.update({
+                "x-ratelimit-limit-requests": str(self.requests_per_minute),
+                "x-ratelimit-remaining-requests": str(self.requests_per_minute - len(self._window)),
+                "x-ratelimit-reset-requests": f"{int(wait * 1000)}ms",
+            })
+            return None, headers
+
+    def _cached_tokens(self, body: dict) -> int:
+        """Prompt tokens a provider's prefix cache would serve: a system prompt it has seen before."""
+        messages = body["messages"]
+        if not messages or messages[0]["role"] != "system":
+            return 0
+        prefix = messages[0]["content"]
+        with self._lock:
+            seen = prefix in self._cached_prefixes
+            self._cached_prefixes.add(prefix)
+        tokens = estimate_tokens(prefix)
+        if not seen or tokens < PROMPT_CACHE_MIN_TOKENS:
+            return 0
+        return tokens - tokens % PROMPT_CACHE_INCREMENT
+
+    def _throttle_response(self, retry_after: float, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        self.throttled += 1
+        return httpx.Response(
+            429,
+            json=error_payload("Rate limit reached", "rate_limit_exceeded"),
+            headers={**(headers or {}), "retry-after-ms": str(int(retry_after * 1000))}
+        )
+
+    def _chat_response(self, request: httpx.Request, outcome: float, stream_factory) -> httpx.Response:
+        body = json.loads(request.content)
+        with self._lock:
+            self.requests.append(body)
+            if outcome < self.error_rate:
+                self.errors += 1
+                return httpx.Response(500, json=error_payload("Injected server error", "server_error"))
+            if outcome < self.error_rate + self.throttle_rate:
+                return self._throttle_response(self.retry_after)
+        wait, headers = self._admit()
+        if wait is not None:
+            with self._lock:
+                return self._throttle_response(wait, headers)
+
+        content = self.responder(body)
+        cached_tokens = self._cached_tokens(body)
+        headers["x-request-id"] = f"req_{uuid.uuid4().hex[:16]}"
+        if body.get("stream"):
+            headers["content-type"] = "text/event-stream"
+            events = stream_events(body, content, cached_tokens)
+            payload = stream_factory(events) if self.token_latency > 0 else b"".join(events)
+            return httpx.Response(200, content=payload, headers=headers)
+        return httpx.Response(200, json=chat_completion_payload(body, content, cached_tokens), headers=headers)
+
+    def _paced(self, events: Iterator[bytes]) -> Iterator[bytes]:
+        for event in events:
+            yield event
+            time.sleep(self.token_latency)
+
+    async def _apaced(self, events: Iterator[bytes]) -> AsyncIterator[bytes]:
+        for event in events:
+            yield event
+            await asyncio.sleep(self.token_latency)
+
+    def _upload_file(self, request: httpx.Request) -> httpx.Response:
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + request.headers["content-type"].encode("latin-1") + b"\r\n\r\n" + request.content
+        )
+        fields = {
+            part.get_param("name", header="content-disposition"): part
+            for part in message.iter_parts()
+        }
+        file_part = fields["file"]
+        content = file_part.get_payload(decode=True)
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        with self._lock:
+            self.files[file_id] = content
+        return httpx.Response(200, json={
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": file_part.get_filename() or "upload.jsonl",
+            "purpose": fields["purpose"].get_content().strip() if "purpose" in fields else "batch",
+            "status": "processed",
+        })
+
+    def _create_batch(self, request: httpx.Request) -> httpx.Response:
+        params = json.loads(request.content)
+        input_file_id = params["input_file_id"]
+        if input_file_id not in self.files:
+            return httpx.Response(404, json=error_payload(f"No such file: {input_file_id}", "invalid_request_error"))
+        lines = []
+        for line in self.files[input_file_id].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            lines.append({
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": item["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "request_id": f"req_{uuid.uuid4().hex[:16]}",
+                    "body": chat_completion_payload(item["body"], self.responder(item["body"])),
+                },
+                "error": None,
+            })
+        output_file_id = f"file-{uuid.uuid4().hex[:24]}"
+        now = int(time.time())
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": params["endpoint"],
+            "errors": None,
+            "input_file_id": input_file_id,
+            "completion_window": params["completion_window"],
+            "status": "completed",
+            "output_file_id": output_file_id,
+            "error_file_id": None,
+            "created_at": now,
+            "in_progress_at": now,
+            "finalizing_at": now,
+            "completed_at": now,
+            "request_counts": {"total": len(lines), "completed": len(lines), "failed": 0},
+            "metadata": params.get("metadata"),
+        }
+        with self._lock:
+            self.files[output_file_id] = "".join(json.dumps(line) + "\n" for line in lines).encode("utf-8")
+            self.batches[batch["id"]] = batch
+        return httpx.Response(200, json=batch)
+
+    def _api_response(self, request: httpx.Request) -> httpx.Response:
+        """Files and Batches endpoints."""
+        path = request.url.path
+        if request.method == "POST" and path.endswith("/files"):
+            return self._upload_file(request)
+        if request.method == "POST" and path.endswith("/batches"):
+            return self._create_batch(request)
+        match = re.search(r"/batches/([^/]+)$", path)
+        if request.method == "GET" and match and match.group(1) in self.batches:
+            return httpx.Response(200, json=self.batches[match.group(1)])
+        match = re.search(r"/files/([^/]+)/content$", path)
+        if request.method == "GET" and match and match.group(1) in self.files:
+            return httpx.Response(200, content=self.files[match.group(1)])
+        return httpx.Response(404, json=error_payload(f"No mock for {request.method} {path}", "invalid_request_error"))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        if not request.url.path.endswith("/chat/completions"):
+            return self._api_response(request)
+        delay, outcome = self._draw()
+        time.sleep(delay)
+        return self._chat_response(request, outcome, self._paced)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        if not request.url.path.endswith("/chat/completions"):
+            return self._api_response(request)
+        delay, outcome = self._draw()
+        await asyncio.sleep(delay)
+        return self._chat_response(request, outcome, self._apaced)
@@ -0,0 +1,132 @@
+"""Process-wide registry of the versioned prompt files, reloaded when they change."""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import logging
+import re
+import threading
+import time
+
+from pydantic import BaseModel
+
+from ..exceptions import PromptNotFoundError
+
+logger = logging.getLogger(__name__)
+
+PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+# Prompt files are named <name>.v<version>.txt, e.g. direct.v1.txt
+_PROMPT_FILE_RE = re.compile(r"^(?P<name>\w+)\.v(?P<version>\d+)\.txt$")
+
+
+class Prompt(BaseModel, frozen=True):
+    """One version of a prompt, exactly as read from its file."""
+    name: str
+    version: int
+    text: str
+    path: Path
+    mtime: float
+
+
+class PromptRegistry:
+    """Prompt files read once per process and reloaded when they change on disk.
+
+    Prompts are looked up by name, at the highest version present unless one is
+    asked for. Lookups rescan the directory at most every `check_interval`
+    seconds and re-read only files whose mtime changed, so editing a prompt takes
+    effect on the next request without restarting a long run. Texts are kept
+    byte for byte as written: the system prompt is the request prefix that the
+    provider's prompt cache matches on.
+
+    Example:
+        >>> registry = get_prompt_registry()
+        >>> registry.get("direct").text
+        >>> registry.get("direct", version=1).version
+    """
+
+    def __init__(self, directory: Union[str, Path] = PROMPT_DIR, check_interval: float = 1.0):
+        """
+        Args:
+            directory: Directory holding the <name>.v<version>.txt files
+            check_interval: Minimum seconds between checks for changed files
+        """
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self._prompts: Dict[str, Dict[int, Prompt]] = {}
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _scan(self) -> None:
+        prompts: Dict[str, Dict[int, Prompt]] = {}
+        for path in sorted(self.directory.iterdir()):
+            match = _PROMPT_FILE_RE.match(path.name)
+            if match is None:
+                continue
+            name, version = match["name"], int(match["version"])
+            mtime = path.stat().st_mtime
+            prompt = self._prompts.get(name, {}).get(version)
+            if prompt is None or prompt.mtime != mtime:
+                if prompt is not None:
+                    logger.info(f"Reloading changed prompt {path.name}")
+                prompt = Prompt(
+                    name=name, version=version, text=path.read_text(encoding="utf-8"), path=path, mtime=mtime
+                )
+            prompts.setdefault(name, {})[version] = prompt
+        self._prompts = prompts
+
+    def reload(self) -> None:
+        """Check the directory for new and changed prompt files now."""
+        with self._lock:
+            self._scan()
+            self._checked_at = time.monotonic()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            # Another thread may have rescanned while this one waited for the lock
+            if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                self._scan()
+                self._checked_at = now
+
+    def versions(self, name: str) -> List[int]:
+        """The versions available for a prompt, in ascending order."""
+        self._refresh()
+        return sorted(self._prompts.get(name, {}))
+
+    def get(self, name: str, version: Optional[int] = None) -> Prompt:
+        """
+        Look up a prompt.
+
+        Args:
+            name: Prompt name, e.g. "direct"
+            version: Specific version; defaults to the highest available
+
+        Raises:
+            PromptNotFoundError: If there is no file for the prompt (or version)
+        """
+        self._refresh()
+        versions = self._prompts.get(name, {})
+        if not versions:
+            raise PromptNotFoundError(f"No prompt named {name!r} in {self.directory}")
+        if version is None:
+            version = max(versions)
+        if version not in versions:
+            raise PromptNotFoundError(f"No version {version} of prompt {name!r} in {self.directory}")
+        return versions[version]
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """The registry of the package's own prompts, shared by every translator in the process."""
+    global _registry
+    # Only creating the registry needs the lock; every later call just reads it
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
@@ -0,0 +1,229 @@
+"""Adaptive client-side rate limiting for LLM API calls."""
+
+from email.utils import parsedate_to_datetime
+from typing import List, Mapping, Optional
+import asyncio
+import logging
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: str) -> Optional[float]:
+    """Parse an x-ratelimit-reset-* value such as '1s', '6m0s' or '20ms' into seconds."""
+    parts = _DURATION_PART_RE.findall(value.strip())
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Read the server's requested delay from retry-after-ms or Retry-After, in seconds."""
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def estimate_request_tokens(messages: List[dict]) -> int:
+    """Roughly estimate the prompt tokens of a chat request (about 4 characters per token)."""
+    return sum(len(message.get("content") or "") // 4 + 4 for message in messages)
+
+
+class TokenBucket:
+    """A refilling bucket of `capacity` units that refills completely every `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.period = period
+        self.level = capacity
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        """Units added per second."""
+        return self.capacity / self.period
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        self._refill(now)
+        # A request larger than the bucket only needs a full bucket
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def set_capacity(self, capacity: float) -> None:
+        self.capacity = capacity
+        self.level = min(self.level, capacity)
+
+    def cap_level(self, remaining: float, now: float) -> None:
+        """Lower the level to what the server reports as remaining."""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+class AdaptiveRateLimiter:
+    """Shared request/token limiter with AIMD concurrency control.
+    
+    Every API call acquires a slot before it is sent and releases it afterwards:
+    - Two token buckets bound requests per minute and tokens per minute. Their
+      capacities start from the configured values and follow the provider's
+      `x-ratelimit-limit-*` / `x-ratelimit-remaining-*` headers when present.
+    - The number of calls in flight is capped by a concurrency limit that grows
+      additively on each success and is cut multiplicatively on each throttle.
+    - After a 429, no slot is handed out until the server's Retry-After passes.
+    
+    One limiter is safe to share between threads and asyncio tasks.
+    
+    Example:
+        >>> limiter = AdaptiveRateLimiter(requests_per_minute=500, tokens_per_minute=30_000)
+        >>> translator = LetterTranslator(rate_limiter=limiter)
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: float = 500,
+        tokens_per_minute: float = 30_000,
+        initial_concurrency: float = 4,
+        max_concurrency: float = 64,
+        additive_increase: float = 0.5,
+        multiplicative_decrease: float = 0.5,
+        default_retry_after: float = 1.0,
+        max_throttle_retries: int = 5
+    ):
+        """
+        Args:
+            requests_per_minute: Starting request quota
+            tokens_per_minute: Starting token quota
+            initial_concurrency: Starting cap on calls in flight
+            max_concurrency: Ceiling the concurrency cap may grow to
+            additive_increase: Added to the concurrency cap after each successful call
+            multiplicative_decrease: Factor applied to the concurrency cap on throttle
+            default_retry_after: Pause used when a 429 carries no Retry-After
+            max_throttle_retries: Times a throttled call is retried before the 429 is raised
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency_limit = float(initial_concurrency)
+        self.max_concurrency = float(max_concurrency)
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.default_retry_after = default_retry_after
+        self.max_throttle_retries = max_throttle_retries
+        self.in_flight = 0
+        self.throttle_count = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Condition()
+
+    def _try_acquire(self, estimated_tokens: int) -> float:
+        """Take a slot if possible; otherwise return how long to wait before trying again."""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self.in_flight >= int(self.concurrency_limit):
+            # Woken by release(); the timeout is only a fallback
+            return 0.05
+        wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(estimated_tokens, now))
+        if wait > 0:
+            return wait
+        self.requests.take(1, now)
+        self.tokens.take(estimated_tokens, now)
+        self.in_flight += 1
+        return 0.0
+
+    def acquire(self, estimated_tokens: int = 0) -> None:
+        """Block until a call may be sent."""
+        with self._lock:
+            while (wait := self._try_acquire(estimated_tokens)) > 0:
+                self._lock.wait(timeout=wait)
+
+    async def acquire_async(self, estimated_tokens: int = 0) -> None:
+        """Wait, without blocking the event loop, until a call may be sent."""
+        while True:
+            with self._lock:
+                wait = self._try_acquire(estimated_tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, success: bool = True, estimated_tokens: int = 0, actual_tokens: Optional[int] = None) -> None:
+        """Return a slot after a call completes.
+        
+        Args:
+            success: Whether the call succeeded; successes grow the concurrency cap
+            estimated_tokens: The estimate passed to acquire
+            actual_tokens: Tokens the call really used, to correct the token bucket
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if actual_tokens is not None:
+                self.tokens.take(actual_tokens - estimated_tokens, time.monotonic())
+            if success:
+                self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + self.additive_increase)
+            self._lock.notify_all()
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """React to a 429: cut the concurrency cap and pause until Retry-After passes."""
+        with self._lock:
+            self.throttle_count += 1
+            self.concurrency_limit = max(1.0, self.concurrency_limit * self.multiplicative_decrease)
+            delay = retry_after if retry_after is not None else self.default_retry_after
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            logger.warning(
+                f"Rate limited; pausing {delay:.2f}s and lowering concurrency to {int(self.concurrency_limit)}"
+            )
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Update bucket capacities and levels from x-ratelimit-* response headers."""
+        now = time.monotonic()
+        with self._lock:
+            for bucket, kind in ((self.requests, "requests"), (self.tokens, "tokens")):
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                reset = headers.get(f"x-ratelimit-reset-{kind}")
+                try:
+                    if limit is not None:
+                        bucket.set_capacity(float(limit))
+                    if remaining is not None:
+                        bucket.cap_level(float(remaining), now)
+                        if float(remaining) <= 0 and reset is not None:
+                            reset_seconds = parse_reset_duration(reset)
+                            if reset_seconds:
+                                self._blocked_until = max(self._blocked_until, now + reset_seconds)
+                except ValueError:
+                    logger.debug(f"Ignoring malformed x-ratelimit-*-{kind} headers")
+            self._lock.notify_all()
+
+    def response_hook(self, response) -> None:
+        """httpx response event hook feeding rate-limit headers into the limiter."""
+        self.observe_headers(response.headers)
+
+    async def async_response_hook(self, response) -> None:
+        """httpx.AsyncClient counterpart of response_hook."""
+        self.observe_headers(response.headers)
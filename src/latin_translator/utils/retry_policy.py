@@ -0,0 +1,217 @@
+"""Retries with jittered exponential backoff and hedged requests for API calls."""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Deque, Optional, Tuple, Type, TypeVar
+import asyncio
+import inspect
+import logging
+import random
+import threading
+import time
+
+import openai
+from pydantic import BaseModel
+
+from .rate_limiter import parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_ERRORS: Tuple[Type[Exception], ...] = (
+    openai.APIConnectionError,  # includes APITimeoutError
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+# For callers whose AdaptiveRateLimiter already retries 429s; retrying them here too
+# would multiply the attempts
+UNTHROTTLED_RETRYABLE_ERRORS = tuple(error for error in RETRYABLE_ERRORS if error is not openai.RateLimitError)
+
+
+class RetryPolicy(BaseModel):
+    """How translate calls are retried, bounded and hedged."""
+    max_attempts: int = 3
+    base_delay: float = 0.5   # Backoff ceiling for the first retry, in seconds
+    max_delay: float = 20.0   # Upper bound on any single backoff
+    deadline: Optional[float] = None  # Per-attempt timeout in seconds
+    hedge: bool = False       # Fire a duplicate request when an attempt runs past hedge_quantile
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20  # Observed latencies needed before hedging starts
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff for a retry, never shorter than Retry-After."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+
+
+class LatencyTracker:
+    """Rolling window of recent successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The q-quantile of the window, or None if it is empty."""
+        with self._lock:
+            ordered = sorted(self._latencies)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _retry_delay(policy: RetryPolicy, attempt: int, error: Exception) -> float:
+    retry_after = None
+    if isinstance(error, openai.RateLimitError):
+        retry_after = parse_retry_after(error.response.headers)
+    return policy.backoff(attempt, retry_after)
+
+
+def _hedge_delay(policy: RetryPolicy, tracker: LatencyTracker) -> Optional[float]:
+    if not policy.hedge or len(tracker) < policy.hedge_min_samples:
+        return None
+    return tracker.quantile(policy.hedge_quantile)
+
+
+def _close_result(result) -> Optional[Awaitable]:
+    """Close an unused result that holds a connection, e.g. a response stream."""
+    close = getattr(result, "close", None)
+    return close() if callable(close) else None
+
+
+def _close_unused(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        _close_result(future.result())
+
+
+def call_with_retry(
+    send: Callable[[], T],
+    policy: RetryPolicy,
+    tracker: LatencyTracker,
+    retryable: Tuple[Type[Exception], ...] = RETRYABLE_ERRORS
+) -> T:
+    """
+    Call send() under a retry policy.
+
+    Retryable API errors are retried with full-jitter backoff up to max_attempts.
+    With hedging on, an attempt still running after the observed hedge_quantile
+    latency gets a duplicate, and whichever succeeds first is returned; the
+    other's result is closed if it is a stream.
+
+    Args:
+        send: Makes one request
+        policy: Retry and hedging settings
+        tracker: Latencies of earlier calls; successful calls are recorded in it
+        retryable: Errors to retry; UNTHROTTLED_RETRYABLE_ERRORS when a rate limiter handles 429s
+
+    Returns:
+        The result of the first successful request
+    """
+    def timed_send() -> T:
+        start = time.monotonic()
+        result = send()
+        tracker.record(time.monotonic() - start)
+        return result
+
+    for attempt in range(policy.max_attempts):
+        try:
+            hedge_delay = _hedge_delay(policy, tracker)
+            if hedge_delay is None:
+                return timed_send()
+            return _hedged(timed_send, hedge_delay)
+        except retryable as e:
+            if attempt == policy.max_attempts - 1:
+                raise
+            delay = _retry_delay(policy, attempt, e)
+            logger.warning(f"Attempt {attempt + 1} failed ({type(e).__name__}); retrying in {delay:.2f}s")
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def _hedged(timed_send: Callable[[], T], hedge_delay: float) -> T:
+    # The losing request cannot be interrupted, so don't wait for it on shutdown
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        primary = executor.submit(timed_send)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result()
+        logger.info(f"Request exceeded {hedge_delay:.2f}s; sending a hedged duplicate")
+        futures = {primary, executor.submit(timed_send)}
+        pending = set(futures)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # Close the other request's result whenever it arrives, so a stream isn't left open
+                    for other in futures - {future}:
+                        other.add_done_callback(_close_unused)
+                    return future.result()
+                first_error = first_error or future.exception()
+        raise first_error
+    finally:
+        executor.shutdown(wait=False)
+
+
+async def acall_with_retry(
+    send: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    tracker: LatencyTracker,
+    retryable: Tuple[Type[Exception], ...] = RETRYABLE_ERRORS
+) -> T:
+    """Async counterpart of call_with_retry; the losing hedged request is cancelled."""
+    async def timed_send() -> T:
+        start = time.monotonic()
+        result = await send()
+        tracker.record(time.monotonic() - start)
+        return result
+
+    for attempt in range(policy.max_attempts):
+        try:
+            hedge_delay = _hedge_delay(policy, tracker)
+            if hedge_delay is None:
+                return await timed_send()
+            return await _ahedged(timed_send, hedge_delay)
+        except retryable as e:
+            if attempt == policy.max_attempts - 1:
+                raise
+            delay = _retry_delay(policy, attempt, e)
+            logger.warning(f"Attempt {attempt + 1} failed ({type(e).__name__}); retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def _ahedged(timed_send: Callable[[], Awaitable[T]], hedge_delay: float) -> T:
+    primary = asyncio.ensure_future(timed_send())
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done:
+        return primary.result()
+    logger.info(f"Request exceeded {hedge_delay:.2f}s; sending a hedged duplicate")
+    pending = {primary, asyncio.ensure_future(timed_send())}
+    first_error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winners = [task for task in done if task.exception() is None]
+            if winners:
+                # Both may have finished together; close the unused stream
+                for task in winners[1:]:
+                    closing = _close_result(task.result())
+                    if inspect.isawaitable(closing):
+                        await closing
+                return winners[0].result()
+            first_error = first_error or next(task.exception() for task in done)
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -7,54 +7,52 @@ def split_paragraphs(text: str) -> List[str]:
     return [p.strip() for p in text.strip().split('\n\n') if p.strip()]
 
 
+# Characters the splitters act on; everything else is skipped by the regex engine
+_SENTENCE_END_RE = re.compile(r'[.!?]')
+_QUOTE_OR_SENTENCE_END_RE = re.compile(r'["“”.!?]')
+_QUOTE_CHARS = '"“”'
+
+
 def split_text_with_quotes(text: str) -> List[str]:
     """
     Split text on sentence-ending punctuation, but preserve everything
     within matching single or double quotes as a single chunk.
+
+    Boundaries are found in one regex scan over quote and punctuation
+    characters, and chunks are sliced from the original string.
     """
     chunks = []
-    current_chunk = []
-    inside_quotes = False
-    quote_char = None  # Tracks whether we opened a single/double quote
+    start = 0
+    quote_char = None  # Tracks the opening quote while inside quotes
 
-    for char in text:
-        current_chunk.append(char)
+    for match in _QUOTE_OR_SENTENCE_END_RE.finditer(text):
+        char = match.group()
         # Toggle quotes if encountering any quote characters.
-        if char in ['"', '“', '”']:
-            if not inside_quotes:
-                inside_quotes = True
+        if char in _QUOTE_CHARS:
+            if quote_char is None:
                 quote_char = char
-            else:
-                if char == quote_char:
-                    inside_quotes = False
-                    quote_char = None
+            elif char == quote_char:
+                quote_char = None
         # If we're not inside quotes, treat '.', '!', '?' as sentence boundaries.
-        if not inside_quotes and char in ['.', '!', '?']:
-            chunks.append(''.join(current_chunk).strip())
-            current_chunk = []
-        # Continue adding characters to the current chunk if inside quotes
-        else:
-            continue
-    if current_chunk:
-        leftover = ''.join(current_chunk).strip()
-        if leftover:
-            chunks.append(leftover)
+        elif quote_char is None:
+            chunks.append(text[start:match.end()].strip())
+            start = match.end()
+    leftover = text[start:].strip()
+    if leftover:
+        chunks.append(leftover)
     return chunks
 
 
 def split_naive_sentences(text: str) -> List[str]:
     """A simple sentence splitter that always splits on '.', '!', or '?'."""
     chunks = []
-    current_chunk = []
-    for char in text:
-        current_chunk.append(char)
-        if char in ['.', '!', '?']:
-            chunks.append(''.join(current_chunk).strip())
-            current_chunk = []
-    if current_chunk:
-        leftover = ''.join(current_chunk).strip()
-        if leftover:
-            chunks.append(leftover)
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        chunks.append(text[start:match.end()].strip())
+        start = match.end()
+    leftover = text[start:].strip()
+    if leftover:
+        chunks.append(leftover)
     return chunks
 
 
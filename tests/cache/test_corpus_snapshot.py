@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import patch
+from latin_translator.cache import CorpusSnapshot
+from latin_translator.models import Letter
+from latin_translator.service.seneca_letter_downloader import SenecaLetterDownloader
+from latin_translator.utils.mock_letter_source import MockLetterSource
+
+LETTERS = [
+    Letter(number=1, roman="I", title="SENECA LVCILIO SVO SALVTEM", content="[1] Ita fac.\n[2] Persuade.",
+           sections={1: "[1] Ita fac.\n", 2: "[2] Persuade."}),
+    Letter(number=77, roman="LXXVII", title="SENECA LVCILIO SVO SALVTEM", content="[1] Subito nobis hodie “Alexandrinae” naves.",
+           sections={1: "[1] Subito nobis hodie “Alexandrinae” naves."}),
+]
+
+
+def test_write_and_load_round_trip(tmp_path):
+    snapshot = CorpusSnapshot.write(LETTERS, tmp_path / "corpus.jsonl")
+    assert snapshot.numbers == [1, 77]
+    assert len(snapshot) == 2
+    assert 77 in snapshot
+    assert snapshot.get(77) == LETTERS[1]
+    assert snapshot.get(77).sections[1].startswith("[1]")
+    assert snapshot.get(2) is None
+    assert snapshot.letters() == LETTERS
+    snapshot.close()
+
+
+def test_rejects_other_versions(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    path.write_text('{"format":"latin-translator-corpus","version":0,"index":{}}\n')
+    with pytest.raises(ValueError, match="v1 snapshot"):
+        CorpusSnapshot(path)
+
+
+def test_downloader_loads_from_snapshot_without_network(tmp_path):
+    snapshot = CorpusSnapshot.write(LETTERS, tmp_path / "corpus.jsonl")
+    downloader = SenecaLetterDownloader(snapshot=snapshot)
+    with patch.object(SenecaLetterDownloader, "download_content") as mock_download:
+        assert downloader.get_letter_by_number(77) == LETTERS[1]
+        assert downloader.fetch_all_letters() == LETTERS
+    mock_download.assert_not_called()
+
+
+def test_downloader_save_snapshot(tmp_path):
+    downloader = SenecaLetterDownloader(urls=[])
+    with patch.object(SenecaLetterDownloader, "fetch_all_letters", return_value=LETTERS):
+        snapshot = downloader.save_snapshot(tmp_path / "corpus.jsonl")
+    assert snapshot.letters() == LETTERS
+
+
+def test_mock_letter_source_uses_snapshot(tmp_path):
+    snapshot = CorpusSnapshot.write(LETTERS, tmp_path / "corpus.jsonl")
+    source = MockLetterSource(test_data_dir=tmp_path / "letters", snapshot=snapshot)
+    assert source.fetch_all_letters() == LETTERS
+    assert source.get_letter_by_number(1) == LETTERS[0]
@@ -0,0 +1,92 @@
+import json
+import pytest
+from unittest.mock import Mock, patch
+from latin_translator.cache import HtmlMirror
+from latin_translator.exceptions import MirrorMissError
+from latin_translator.service.seneca_letter_downloader import SenecaLetterDownloader
+
+URL = "https://www.thelatinlibrary.com/sen/seneca.ep1.shtml"
+PAGE = "<html><body><p><b>I. SENECA LVCILIO SVO SALVTEM</b></p><p>[1] Ita fac, mi Lucili.</p></body></html>"
+
+
+def response(status_code=200, text=PAGE, headers=None):
+    resp = Mock(status_code=status_code, text=text, headers=headers or {})
+    resp.raise_for_status = Mock()
+    return resp
+
+
+def test_first_get_downloads_and_records_manifest(tmp_path):
+    session = Mock()
+    session.get.return_value = response(headers={"ETag": '"abc"', "Last-Modified": "Tue, 01 Apr 2025 00:00:00 GMT"})
+    mirror = HtmlMirror(tmp_path)
+
+    assert mirror.get(URL, session=session) == PAGE
+    session.get.assert_called_once_with(URL, headers={}, timeout=30.0)
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    entry = manifest[URL]
+    assert entry["etag"] == '"abc"'
+    assert entry["file_name"].endswith("seneca.ep1.shtml")
+    assert (tmp_path / entry["file_name"]).read_text(encoding="utf-8") == PAGE
+
+
+def test_revalidation_uses_validators_and_304(tmp_path):
+    session = Mock()
+    session.get.return_value = response(headers={"ETag": '"abc"', "Last-Modified": "Tue, 01 Apr 2025 00:00:00 GMT"})
+    HtmlMirror(tmp_path).get(URL, session=session)
+
+    session.get.reset_mock()
+    session.get.return_value = response(status_code=304, text="")
+    assert HtmlMirror(tmp_path).get(URL, session=session) == PAGE
+    assert session.get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 01 Apr 2025 00:00:00 GMT",
+    }
+
+
+def test_changed_page_replaces_copy(tmp_path):
+    session = Mock()
+    session.get.return_value = response(headers={"ETag": '"abc"'})
+    mirror = HtmlMirror(tmp_path)
+    mirror.get(URL, session=session)
+
+    session.get.return_value = response(text=PAGE.replace("Ita", "Sic"), headers={"ETag": '"def"'})
+    assert "Sic fac" in mirror.get(URL, session=session)
+    assert mirror.entries[URL].etag == '"def"'
+
+
+def test_offline_never_touches_network(tmp_path):
+    session = Mock()
+    session.get.return_value = response()
+    HtmlMirror(tmp_path).get(URL, session=session)
+    session.get.reset_mock()
+
+    offline = HtmlMirror(tmp_path, offline=True)
+    assert offline.get(URL, session=session) == PAGE
+    with pytest.raises(MirrorMissError):
+        offline.get(URL.replace("ep1", "ep2"), session=session)
+    session.get.assert_not_called()
+
+
+def test_corrupted_copy_is_refetched(tmp_path):
+    session = Mock()
+    session.get.return_value = response(headers={"ETag": '"abc"'})
+    mirror = HtmlMirror(tmp_path)
+    mirror.get(URL, session=session)
+    (tmp_path / mirror.entries[URL].file_name).write_text("garbage")
+
+    assert mirror.get(URL, session=session) == PAGE
+    # No validators are sent for a copy that failed its hash check
+    assert session.get.call_args.kwargs["headers"] == {}
+
+
+def test_downloader_reads_through_mirror(tmp_path):
+    session = Mock()
+    session.get.return_value = response()
+    HtmlMirror(tmp_path).get(URL, session=session)
+
+    downloader = SenecaLetterDownloader(urls=[URL], mirror=HtmlMirror(tmp_path, offline=True))
+    with patch.object(SenecaLetterDownloader, "download_content") as mock_download:
+        letters = downloader.fetch_all_letters()
+    mock_download.assert_not_called()
+    assert [letter.number for letter in letters] == [1]
@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import Mock, patch
+from latin_translator.cache import TranslationCache
+from latin_translator.exceptions import CacheMissError
+from latin_translator.service.letter_translator import LetterTranslator
+
+
+MESSAGES = [
+    {"role": "system", "content": "Translate Latin to English literally"},
+    {"role": "user", "content": "Vale."},
+]
+
+
+def test_make_key_depends_on_messages_and_params():
+    key = TranslationCache.make_key(MESSAGES, model="gpt-4o", temperature=0.7)
+    assert key == TranslationCache.make_key(list(MESSAGES), temperature=0.7, model="gpt-4o")
+    assert key != TranslationCache.make_key(MESSAGES, model="gpt-4o", temperature=0.2)
+    assert key != TranslationCache.make_key(MESSAGES[:1], model="gpt-4o", temperature=0.7)
+
+
+def test_get_put_and_stats(tmp_path):
+    cache = TranslationCache(tmp_path / "cache.sqlite3")
+    assert cache.get("missing") is None
+    cache.put("k", "Farewell.")
+    assert cache.get("k") == "Farewell."
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.hit_rate == 0.5
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    TranslationCache(path).put("k", "Farewell.")
+    assert TranslationCache(path).get("k") == "Farewell."
+
+
+def test_lru_eviction(tmp_path):
+    cache = TranslationCache(tmp_path / "cache.sqlite3", max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")  # "b" is now least recently used
+    cache.put("c", "3")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_replay_mode_is_read_only(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    TranslationCache(path).put("k", "Farewell.")
+    replay = TranslationCache(path, replay=True)
+    replay.put("other", "ignored")
+    assert replay.get("k") == "Farewell."
+    assert replay.get("other") is None
+
+
+def test_translator_uses_cache(tmp_path):
+    mock_completion = Mock()
+    mock_completion.choices = [Mock(message=Mock(content="Farewell."))]
+    mock_client = Mock()
+    mock_client.chat.completions.create.return_value = mock_completion
+    path = tmp_path / "cache.sqlite3"
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+        translator = LetterTranslator(cache=TranslationCache(path))
+        first = translator.process_letter("Vale.")
+        second = translator.process_letter("Vale.")
+        assert first == second
+        assert mock_client.chat.completions.create.call_count == 2
+        assert translator.cache.stats.hits == 2
+
+        replay = LetterTranslator(cache=TranslationCache(path, replay=True))
+        assert replay.process_letter("Vale.") == first
+        with pytest.raises(CacheMissError):
+            replay.process_letter("Ave.")
+        assert mock_client.chat.completions.create.call_count == 2
@@ -0,0 +1,170 @@
+import json
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from latin_translator.cache import TranslationJournal, prompt_version
+from latin_translator.service.letter_translator import LetterTranslator
+
+
+ENTRY = dict(letter=77, paragraph=1, sentence=0, phase="direct", prompt_version="v1")
+
+
+def completion(content):
+    return Mock(choices=[Mock(message=Mock(content=content))])
+
+
+def test_prompt_version_tracks_prompt_text():
+    assert prompt_version("Translate") == prompt_version("Translate")
+    assert prompt_version("Translate") != prompt_version("Translate literally")
+    assert len(prompt_version("Translate")) == 12
+
+
+def test_record_persists_across_instances(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path, fsync=False)
+    assert journal.get(**ENTRY) is None
+    journal.record(source="Vale.", reply="\"Farewell.\"", translation="Farewell.", **ENTRY)
+    journal.close()
+
+    reopened = TranslationJournal(path)
+    entry = reopened.get(**ENTRY)
+    assert (entry.source, entry.reply, entry.translation) == ("Vale.", "\"Farewell.\"", "Farewell.")
+    assert reopened.get(**{**ENTRY, "prompt_version": "v2"}) is None
+    assert len(reopened) == 1
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path)
+    journal.record(source="Vale.", reply="Farewell.", translation="Farewell.", **ENTRY)
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"letter": 77, "paragraph": 1, "sent')
+
+    journal = TranslationJournal(path)
+    assert len(journal) == 1
+    journal.record(source="Ave.", reply="Hail.", translation="Hail.", **{**ENTRY, "sentence": 1})
+    journal.close()
+    assert len(TranslationJournal(path)) == 2
+
+
+def test_resumes_after_failure(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    mock_client = Mock()
+    mock_client.chat.completions.create.side_effect = [
+        completion("One."), completion("Two."), RuntimeError("connection dropped"),
+    ]
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+        translator = LetterTranslator(journal=TranslationJournal(path))
+        with pytest.raises(RuntimeError):
+            translator.process_letter("Unus. Duo.", letter_number=1)
+
+        sent = []
+        replies = iter(["First.", "Second."])
+
+        def create(**kwargs):
+            sent.append([m["content"] for m in kwargs["messages"][1:]])
+            return completion(next(replies))
+
+        mock_client.chat.completions.create.side_effect = create
+        resumed = LetterTranslator(journal=TranslationJournal(path))
+        result = resumed.process_letter("Unus. Duo.", letter_number=1)
+
+    assert result[0].direct == ["One.", "Two."]
+    assert result[0].rhetorical == ["First.", "Second."]
+    # The journaled exchange is replayed into the rolling context
+    assert sent == [["One."], ["One.", "First.", "Two."]]
+
+    # A changed prompt only invalidates its own phase
+    resumed.rhetorical_prompt = "Rewrite differently"
+    mock_client.chat.completions.create.side_effect = [completion("Alt one."), completion("Alt two.")]
+    assert resumed.process_letter("Unus. Duo.", letter_number=1)[0].rhetorical == ["Alt one.", "Alt two."]
+    assert mock_client.chat.completions.create.call_count == 7
+
+
+def test_resume_replays_the_raw_replies(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    replies = ['"One."', '"Two."', '"First."', '"Second."']
+
+    def run(journal, first_reply=0, fail_at=None):
+        sent = []
+
+        def create(**kwargs):
+            if len(sent) == fail_at:
+                raise RuntimeError("connection dropped")
+            sent.append(json.dumps(kwargs["messages"]))
+            return completion(replies[first_reply + len(sent) - 1])
+
+        mock_client = Mock()
+        mock_client.chat.completions.create.side_effect = create
+        with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+            translator = LetterTranslator(journal=journal)
+            try:
+                result = translator.process_letter("Unus. Duo.", letter_number=1)
+            except RuntimeError:
+                result = None
+        return result, sent
+
+    expected, uninterrupted = run(None)
+    assert run(TranslationJournal(path), fail_at=1)[0] is None
+    result, resumed = run(TranslationJournal(path), first_reply=1)
+
+    assert result == expected
+    # The context rebuilt from the journal is exactly what the uninterrupted run sent
+    assert resumed == uninterrupted[1:]
+
+
+def test_journals_without_conversation_context(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    mock_client = Mock()
+    mock_client.chat.completions.create.side_effect = [completion("One."), completion("First.")]
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+        translator = LetterTranslator(max_context=0, journal=TranslationJournal(path))
+        result = translator.process_letter("Unus.", letter_number=1)
+
+    assert result[0].rhetorical == ["First."]
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["reply"] for line in lines] == ["One.", "First."]
+
+
+def test_async_skips_journaled_sentences(tmp_path, make_translator):
+    path = tmp_path / "journal.jsonl"
+    journal = TranslationJournal(path)
+    translator = make_translator(journal=journal)
+    journal.record(
+        letter=1, paragraph=1, sentence=0, phase="direct",
+        prompt_version=prompt_version(translator.direct_prompt),
+        source="Unus.", reply="One.", translation="One."
+    )
+    mock_client = Mock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: completion("Done."))
+    translator._async_client = mock_client
+
+    result = asyncio.run(translator.aprocess_letter("Unus. Duo.", letter_number=1))
+
+    assert result[0].direct == ["One.", "Done."]
+    assert mock_client.chat.completions.create.call_count == 3
+    assert len(journal) == 4
+
+
+def test_streaming_skips_journaled_sentences(tmp_path, make_translator):
+    journal = TranslationJournal(tmp_path / "journal.jsonl")
+    translator = make_translator(journal=journal)
+    journal.record(
+        letter=1, paragraph=1, sentence=0, phase="direct",
+        prompt_version=prompt_version(translator.direct_prompt),
+        source="Unus.", reply="One.", translation="One."
+    )
+    translator.client = Mock()
+    translator.client.chat.completions.create.side_effect = lambda **kwargs: iter(
+        [Mock(choices=[Mock(delta=Mock(content="Done."))])]
+    )
+
+    events = list(translator.iter_process_letter("Unus. Duo.", letter_number=1))
+
+    assert events[0].text == "One."
+    assert events[-1].stages.direct == ["One.", "Done."]
+    assert translator.client.chat.completions.create.call_count == 3
+    assert len(journal) == 4
@@ -1,5 +1,10 @@
 import pytest
 import logging
+from unittest.mock import patch
+from latin_translator.service.letter_translator import LetterTranslator
+
+DIRECT_PROMPT = "Translate Latin to English literally"
+RHETORICAL_PROMPT = "Rewrite the English translation"
 
 def pytest_configure(config):
     """Set up pytest configuration."""
@@ -26,4 +31,25 @@ def setup_logging(caplog):
     logging.getLogger("openai").setLevel(logging.DEBUG)
     logging.getLogger("httpx").setLevel(logging.WARNING)  # Keep httpx quieter
     
-    yield 
\ No newline at end of file
+    yield
+
+
+@pytest.fixture
+def make_translator():
+    """Factory for LetterTranslators with short fixed prompts instead of the prompt files.
+
+    Keyword arguments go to LetterTranslator, except direct_prompt and rhetorical_prompt.
+    """
+    def make(direct_prompt=DIRECT_PROMPT, rhetorical_prompt=RHETORICAL_PROMPT, **kwargs):
+        with patch.object(LetterTranslator, "_load_prompts"):
+            translator = LetterTranslator(**kwargs)
+        translator.direct_prompt = direct_prompt
+        translator.rhetorical_prompt = rhetorical_prompt
+        return translator
+    return make
+
+
+@pytest.fixture
+def translator(make_translator):
+    """A LetterTranslator with the default test prompts."""
+    return make_translator()
@@ -0,0 +1,79 @@
+import json
+import pytest
+from unittest.mock import patch
+from latin_translator.exceptions import BatchJobError
+from latin_translator.models import Letter
+from latin_translator.service.batch_translation_job import BatchTranslationJob
+from latin_translator.service.mock_batch_backend import MockBatchBackend
+
+
+def tagging_responder(translator):
+    def respond(body):
+        prefix = "D:" if body["messages"][0]["content"] == translator.direct_prompt else "R:"
+        return prefix + body["messages"][-1]["content"]
+    return respond
+
+
+LETTERS = [
+    Letter(number=1, roman="I", title="T1", content="Unus. Duo.\n\nTres."),
+    Letter(number=2, roman="II", title="T2", content="Sic enim coepit: 'vale.\n'"),
+]
+
+
+def test_run_translates_letters_in_two_waves(translator, tmp_path):
+    backend = MockBatchBackend(responder=tagging_responder(translator), polls_until_complete=2)
+    job = BatchTranslationJob(translator, backend, tmp_path, poll_interval=0)
+
+    results = job.run(LETTERS)
+
+    assert [stage.paragraph_index for stage in results[1]] == [1, 2]
+    assert results[1][0].original == ["Unus.", "Duo."]
+    assert results[1][0].direct == ["D:Unus.", "D:Duo."]
+    assert results[1][0].rhetorical == ["R:D:Unus.", "R:D:Duo."]
+    assert results[1][1].rhetorical == ["R:D:Tres."]
+    # The lone quote is preserved without a request
+    assert results[2][0].rhetorical == ["R:D:Sic enim coepit: 'vale.", "'"]
+
+    direct_batch, rhetorical_batch = backend.submitted.values()
+    assert len(direct_batch) == 4
+    assert {line["custom_id"] for line in rhetorical_batch} == {
+        "rhetorical-1-1-0", "rhetorical-1-1-1", "rhetorical-1-2-0", "rhetorical-2-1-0"
+    }
+    assert direct_batch[0]["url"] == "/v1/chat/completions"
+    assert direct_batch[0]["body"]["model"] == translator.model
+
+
+def test_request_files_are_split(translator, tmp_path):
+    job = BatchTranslationJob(translator, MockBatchBackend(), tmp_path, max_requests_per_file=2)
+    paths = job.write_request_files("direct", {(1, 1, i): f"S{i}." for i in range(5)})
+    assert len(paths) == 3
+    lines = [json.loads(line) for line in paths[2].read_text().splitlines()]
+    assert [line["custom_id"] for line in lines] == ["direct-1-1-4"]
+
+
+def test_failed_lines_fall_back_to_translate_chunk(translator, tmp_path):
+    backend = MockBatchBackend(failing_custom_ids={"direct-1-1-1"})
+    job = BatchTranslationJob(translator, backend, tmp_path, poll_interval=0)
+
+    with patch.object(translator, "translate_chunk", return_value=("fallback", [])) as mock_chunk:
+        results = job.run(LETTERS[:1])
+
+    mock_chunk.assert_called_once_with("Duo.", translator.direct_prompt)
+    assert results[1][0].direct == ["Unus.", "fallback"]
+
+
+def test_empty_replies_fall_back_to_translate_chunk(translator, tmp_path):
+    backend = MockBatchBackend(responder=lambda body: None if body["messages"][-1]["content"] == "Duo." else "ok")
+    job = BatchTranslationJob(translator, backend, tmp_path, poll_interval=0)
+
+    with patch.object(translator, "translate_chunk", return_value=("fallback", [])) as mock_chunk:
+        results = job.run(LETTERS[:1])
+
+    mock_chunk.assert_called_once_with("Duo.", translator.direct_prompt)
+    assert results[1][0].direct == ["ok", "fallback"]
+
+
+def test_failed_batch_raises(translator, tmp_path):
+    job = BatchTranslationJob(translator, MockBatchBackend(final_status="failed"), tmp_path, poll_interval=0)
+    with pytest.raises(BatchJobError):
+        job.run(LETTERS[:1])
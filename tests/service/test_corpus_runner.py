@@ -0,0 +1,127 @@
+import time
+import pytest
+from unittest.mock import Mock, patch
+from latin_translator.models import Letter, TranslationStages
+from latin_translator.service.corpus_runner import CorpusRunner, LeaseStore, _LeaseHeartbeat, run_worker
+
+
+LETTERS = [
+    Letter(number=1, roman="I", title="T1", content="Unus. Duo.\n\nTres."),
+    Letter(number=2, roman="II", title="T2", content="Quattuor."),
+]
+
+
+def stages(text):
+    return [TranslationStages(paragraph_index=1, original=[text], direct=[text], rhetorical=[text])]
+
+
+def test_claims_are_exclusive_until_lease_expires(tmp_path):
+    store = LeaseStore(tmp_path / "run.sqlite3", lease_seconds=60)
+    other = LeaseStore(tmp_path / "run.sqlite3", lease_seconds=60)
+
+    assert store.claim([1, 2], "a") == 1
+    assert other.claim([1, 2], "b") == 2
+    assert other.claim([1, 2], "b") is None
+
+    store.release(1, "a")
+    assert other.claim([1, 2], "b") == 1
+    assert not store.renew(1, "a")
+    assert other.renew(1, "b")
+
+
+def test_completed_letters_are_not_claimed_again(tmp_path):
+    store = LeaseStore(tmp_path / "run.sqlite3")
+    assert store.claim([1, 2], "a") == 1
+    store.complete(1, "a", stages("One."))
+
+    assert store.claim([1], "b") is None
+    assert store.results() == {1: stages("One.")}
+    counts = store.counts([1, 2, 3])
+    assert (counts.done, counts.leased, counts.pending) == (1, 0, 2)
+
+
+def test_complete_requires_a_live_lease(tmp_path):
+    store = LeaseStore(tmp_path / "run.sqlite3", lease_seconds=-1)
+    assert store.claim([1], "a") == 1
+    assert not store.complete(1, "a", stages("Expired."))
+
+    store.lease_seconds = 60
+    assert store.claim([1], "b") == 1
+    assert not store.complete(1, "a", stages("Taken over."))
+    assert store.complete(1, "b", stages("One."))
+    assert store.results() == {1: stages("One.")}
+
+
+def test_expired_lease_can_be_taken_over(tmp_path):
+    store = LeaseStore(tmp_path / "run.sqlite3", lease_seconds=-1)
+    assert store.claim([1], "crashed") == 1
+    assert store.claim([1], "b") == 1
+
+
+def test_worker_translates_unfinished_letters(tmp_path):
+    store_path = tmp_path / "run.sqlite3"
+    store = LeaseStore(store_path)
+    store.claim([1], "earlier")
+    store.complete(1, "earlier", stages("Done before."))
+
+    translator = Mock()
+    translator.process_letter.side_effect = lambda content, letter_number: stages(f"T{letter_number}")
+    with patch("latin_translator.service.corpus_runner.LetterTranslator", return_value=translator) as cls:
+        completed = run_worker(store_path, LETTERS, "w0", {"model": "gpt-4o"}, tmp_path / "journals")
+
+    assert completed == [2]
+    cls.assert_called_once_with(model="gpt-4o")
+    translator.process_letter.assert_called_once_with("Quattuor.", letter_number=2)
+    assert (tmp_path / "journals" / "letter_002.jsonl").exists()
+    assert store.results() == {1: stages("Done before."), 2: stages("T2")}
+
+
+def test_worker_drops_letter_after_losing_its_lease(tmp_path):
+    store_path = tmp_path / "run.sqlite3"
+    other = LeaseStore(store_path)
+
+    def taken_over(content, letter_number):
+        other.release(letter_number, "w0")
+        other.claim([letter_number], "w1")
+        return stages("Late.")
+
+    translator = Mock()
+    translator.process_letter.side_effect = taken_over
+    with patch("latin_translator.service.corpus_runner.LetterTranslator", return_value=translator):
+        assert run_worker(store_path, LETTERS[:1], "w0") == []
+
+    assert other.results() == {}
+    assert other.complete(1, "w1", stages("One."))
+
+
+def test_heartbeat_reports_a_lost_lease(tmp_path):
+    store_path = tmp_path / "run.sqlite3"
+    assert LeaseStore(store_path).claim([1], "other") == 1
+    with _LeaseHeartbeat(store_path, 0.03, 1, "w0") as heartbeat:
+        time.sleep(0.1)
+    assert heartbeat.lost
+
+
+def test_failed_letter_is_released(tmp_path):
+    store_path = tmp_path / "run.sqlite3"
+    translator = Mock()
+    translator.process_letter.side_effect = [RuntimeError("boom"), stages("Vale.")]
+    with patch("latin_translator.service.corpus_runner.LetterTranslator", return_value=translator):
+        assert run_worker(store_path, LETTERS[:2], "w0") == [2]
+
+    assert translator.process_letter.call_count == 2
+    assert LeaseStore(store_path).claim([1, 2], "w1") == 1
+
+
+def test_build_epub_requires_every_letter(tmp_path):
+    runner = CorpusRunner(tmp_path / "run.sqlite3")
+    store = LeaseStore(runner.store_path)
+    store.claim([1, 2], "w0")
+    store.claim([1, 2], "w0")
+    store.complete(1, "w0", stages("One."))
+
+    with pytest.raises(ValueError):
+        runner.build_epub(LETTERS, tmp_path / "out.epub")
+
+    store.complete(2, "w0", stages("Two."))
+    assert runner.build_epub(LETTERS, tmp_path / "out.epub").exists()
@@ -1,24 +1,18 @@
 import pytest
-from unittest.mock import patch, MagicMock
+import asyncio
+import json
+import re
+from unittest.mock import patch, MagicMock, AsyncMock
+from latin_translator.cache import TranslationJournal
 from latin_translator.service.letter_translator import LetterTranslator
-from latin_translator.models import TranslationStages
+from latin_translator.models import PromptVariant, TranslationStages, TokenEvent, SentenceEvent, ParagraphEvent
 from latin_translator.utils import split_paragraphs, split_text_with_quotes
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport
 
 
 class TestLetterTranslator:
     """Tests for the LetterTranslator class"""
 
-    @pytest.fixture
-    def translator(self):
-        """Fixture to create a translator with mocked methods"""
-        # Mock _load_prompts to avoid file reading
-        with patch.object(LetterTranslator, '_load_prompts'):
-            translator = LetterTranslator()
-            # Set prompts directly
-            translator.direct_prompt = "Translate Latin to English literally"
-            translator.rhetorical_prompt = "Rewrite the English translation"
-            return translator
-
     def test_lone_quotation_marks_handling(self, translator):
         """
         Test that lone quotation marks are handled correctly.
@@ -134,4 +128,345 @@ Cogita quamdiu iam idem facias: cibus, somnus, libido -- per hunc circulum curri
             assert result[0].original[3] == "'"
             assert result[0].direct[3] == "'"
             # This unwanted text was the bug
-            assert result[0].rhetorical[3] == "If you have more text for me to work on or any questions, feel free to share!" 
\ No newline at end of file
+            assert result[0].rhetorical[3] == "If you have more text for me to work on or any questions, feel free to share!" 
+
+class TestAsyncLetterTranslator:
+    """Tests for the asyncio translation path of LetterTranslator"""
+
+    @pytest.fixture
+    def translator(self, make_translator):
+        return make_translator(max_concurrency=2)
+
+    def test_aprocess_letter_keeps_order_and_bounds_concurrency(self, translator):
+        in_flight = []
+        max_paragraphs_in_flight = 0
+        calls = []
+
+        async def fake_create(model, messages, temperature, **kwargs):
+            nonlocal max_paragraphs_in_flight
+            paragraph = re.search(r"Paragraph (\d+)", messages[-1]["content"]).group(1)
+            in_flight.append(paragraph)
+            max_paragraphs_in_flight = max(max_paragraphs_in_flight, len(set(in_flight)))
+            calls.append(list(messages))
+            await asyncio.sleep(0.01)
+            in_flight.remove(paragraph)
+            prefix = "D:" if messages[0]["content"] == translator.direct_prompt else "R:"
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=prefix + messages[-1]["content"]))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=fake_create)
+        translator._async_client = mock_client
+
+        content = "\n\n".join(f"Paragraph {n} one. Paragraph {n} two." for n in range(1, 5))
+        result = asyncio.run(translator.aprocess_letter(content))
+
+        assert [stage.paragraph_index for stage in result] == [1, 2, 3, 4]
+        assert result[2].original == ["Paragraph 3 one.", "Paragraph 3 two."]
+        assert result[2].direct == ["D:Paragraph 3 one.", "D:Paragraph 3 two."]
+        assert result[2].rhetorical == ["R:D:Paragraph 3 one.", "R:D:Paragraph 3 two."]
+        assert mock_client.chat.completions.create.call_count == 16
+        # Paragraphs overlap, but never beyond the semaphore limit
+        assert max_paragraphs_in_flight == 2
+
+        # Rolling context within a paragraph is preserved
+        second_direct = next(m for m in calls if m[-1]["content"] == "Paragraph 3 two.")
+        assert [m["content"] for m in second_direct[1:]] == [
+            "Paragraph 3 one.", "D:Paragraph 3 one.", "Paragraph 3 two."
+        ]
+
+    def test_aprocess_letter_pipelines_phases(self, translator):
+        events = []
+
+        async def fake_create(model, messages, temperature, **kwargs):
+            label = ("D:" if messages[0]["content"] == translator.direct_prompt else "R:") + messages[-1]["content"]
+            events.append(("start", label))
+            await asyncio.sleep(0.01)
+            events.append(("end", label))
+            return MagicMock(choices=[MagicMock(message=MagicMock(content=label))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=fake_create)
+        translator._async_client = mock_client
+
+        result = asyncio.run(translator.aprocess_letter("Unus. Duo. Tres."))
+
+        assert result[0].direct == ["D:Unus.", "D:Duo.", "D:Tres."]
+        assert result[0].rhetorical == ["R:D:Unus.", "R:D:Duo.", "R:D:Tres."]
+        # The first rhetorical call starts while the second direct call is still running
+        assert events.index(("start", "R:D:Unus.")) < events.index(("end", "D:Duo."))
+
+    def test_aprocess_letter_propagates_rhetorical_failure(self, translator):
+        async def fake_create(model, messages, temperature, **kwargs):
+            if messages[0]["content"] == translator.rhetorical_prompt:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.01)
+            return MagicMock(choices=[MagicMock(message=MagicMock(content="ok"))])
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=fake_create)
+        translator._async_client = mock_client
+
+        with pytest.raises(RuntimeError, match="boom"):
+            asyncio.run(translator.aprocess_letter("Unus. Duo. Tres."))
+
+
+class TestBatchedParagraphs:
+    """Tests for the paragraph-batched (one JSON request per phase) mode"""
+
+    @pytest.fixture
+    def translator(self, make_translator):
+        return make_translator(batch_paragraphs=True)
+
+    @staticmethod
+    def json_reply(translations):
+        return MagicMock(choices=[MagicMock(message=MagicMock(
+            content=json.dumps({"translations": translations})
+        ))])
+
+    def test_one_request_per_phase(self, translator):
+        replies = [
+            self.json_reply(["Direct one.", "Direct two."]),
+            self.json_reply(["Final one.", "Final two."]),
+        ]
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = replies
+
+        result = translator.process_letter("Sic enim coepit: 'Unus. Duo.\n'")
+
+        assert result[0].original == ["Sic enim coepit: 'Unus.", "Duo.", "'"]
+        assert result[0].direct == ["Direct one.", "Direct two.", "'"]
+        assert result[0].rhetorical == ["Final one.", "Final two.", "'"]
+        calls = translator.client.chat.completions.create.call_args_list
+        assert len(calls) == 2
+        first = calls[0].kwargs
+        assert first["response_format"] == {"type": "json_object"}
+        # The system prompt is sent unchanged; the lone quote is not sent at all
+        assert first["messages"][0] == {"role": "system", "content": translator.direct_prompt}
+        assert "1. Sic enim coepit: 'Unus.\n2. Duo." in first["messages"][1]["content"]
+        assert "exactly 2 strings" in first["messages"][1]["content"]
+
+    def test_length_mismatch_falls_back_to_sentences(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [
+            self.json_reply(["Only one translation."]),
+            MagicMock(choices=[MagicMock(message=MagicMock(content="One."))]),
+            MagicMock(choices=[MagicMock(message=MagicMock(content="Two."))]),
+        ]
+
+        assert translator.translate_sentences(["Unus.", "Duo."], translator.direct_prompt) == ["One.", "Two."]
+        assert translator.client.chat.completions.create.call_count == 3
+
+    def test_async_batched(self, translator):
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=[
+            self.json_reply(["Direct one.", "Direct two."]),
+            MagicMock(choices=[MagicMock(message=MagicMock(content="not json"))]),
+        ])
+        translator._async_client = mock_client
+
+        with patch.object(translator, "atranslate_chunk", side_effect=[
+            ("Final one.", []), ("Final two.", []),
+        ]) as mock_chunk:
+            result = asyncio.run(translator.aprocess_letter("Unus. Duo."))
+
+        assert result[0].direct == ["Direct one.", "Direct two."]
+        assert result[0].rhetorical == ["Final one.", "Final two."]
+        assert mock_chunk.call_count == 2
+
+
+class TestStreamingLetterTranslator:
+    """Tests for iter_process_letter"""
+
+    @staticmethod
+    def stream(*pieces):
+        return iter([MagicMock(choices=[MagicMock(delta=MagicMock(content=piece))]) for piece in pieces])
+
+    def test_events_in_order(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [
+            self.stream("Direct", " one.", None),
+            self.stream("Final one."),
+        ]
+
+        events = list(translator.iter_process_letter("Unus."))
+
+        assert [type(event) for event in events] == [
+            TokenEvent, TokenEvent, SentenceEvent, TokenEvent, SentenceEvent, ParagraphEvent
+        ]
+        assert "".join(e.text for e in events[:2]) == "Direct one."
+        assert events[2].phase == "direct" and events[2].translation == "Direct one."
+        assert events[4].source == "Direct one." and events[4].translation == "Final one."
+        assert events[-1].stages == TranslationStages(
+            paragraph_index=1, original=["Unus."], direct=["Direct one."], rhetorical=["Final one."]
+        )
+        assert translator.client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    def test_paragraph_arrives_before_next_is_sent(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = lambda **kwargs: self.stream("Done.")
+
+        events = translator.iter_process_letter("Unus.\n\nDuo.")
+        first = next(e for e in events if isinstance(e, ParagraphEvent))
+
+        assert first.stages.paragraph_index == 1
+        assert translator.client.chat.completions.create.call_count == 2
+
+    def test_lone_quote_is_not_sent(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = lambda **kwargs: self.stream("Said.")
+
+        events = list(translator.iter_process_letter("Dixit: 'Vale.\n'"))
+
+        assert events[-1].stages.direct == ["Said.", "'"]
+        assert translator.client.chat.completions.create.call_count == 2
+
+
+class TestCombinedTranslation:
+    """Tests for the combined (one JSON request per sentence for both phases) mode"""
+
+    @pytest.fixture
+    def translator(self, make_translator):
+        return make_translator(combined=True)
+
+    @staticmethod
+    def reply(content):
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+    def combined_reply(self, direct, rhetorical):
+        return self.reply(json.dumps({"direct": direct, "rhetorical": rhetorical}))
+
+    def test_one_request_per_sentence(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [
+            self.combined_reply("Direct one.", "Final one."),
+            self.combined_reply("Direct two.", "Final two."),
+        ]
+
+        result = translator.process_letter("Dixit: 'Unus. Duo.\n'")
+
+        assert result[0].direct == ["Direct one.", "Direct two.", "'"]
+        assert result[0].rhetorical == ["Final one.", "Final two.", "'"]
+        calls = translator.client.chat.completions.create.call_args_list
+        assert len(calls) == 2
+        second = calls[1].kwargs
+        assert second["response_format"] == {"type": "json_object"}
+        assert translator.direct_prompt in second["messages"][0]["content"]
+        assert translator.rhetorical_prompt in second["messages"][0]["content"]
+        # The raw JSON reply is kept as context for the next sentence
+        assert [m["content"] for m in second["messages"][1:]] == [
+            "Dixit: 'Unus.", json.dumps({"direct": "Direct one.", "rhetorical": "Final one."}), "Duo."
+        ]
+
+    def test_malformed_reply_falls_back_to_two_phases(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [
+            self.reply("Not JSON."),
+            self.reply("Direct one."),
+            self.reply("Final one."),
+        ]
+
+        result = translator.process_letter("Unus.")
+
+        assert result[0].direct == ["Direct one."]
+        assert result[0].rhetorical == ["Final one."]
+        assert translator.client.chat.completions.create.call_count == 3
+
+    def test_two_phases_for_one_letter(self, translator):
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [self.reply("Direct one."), self.reply("Final one.")]
+
+        result = translator.process_letter("Unus.", combined=False)
+
+        assert result[0].rhetorical == ["Final one."]
+        assert "response_format" not in translator.client.chat.completions.create.call_args.kwargs
+
+    def test_async_combined(self, translator):
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=[
+            self.combined_reply("Direct one.", "Final one."),
+            self.combined_reply("Direct two.", "Final two."),
+        ])
+        translator._async_client = mock_client
+
+        result = asyncio.run(translator.aprocess_letter("Unus.\n\nDuo."))
+
+        assert [stage.direct for stage in result] == [["Direct one."], ["Direct two."]]
+        assert [stage.rhetorical for stage in result] == [["Final one."], ["Final two."]]
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_journal_replays_both_translations(self, translator, tmp_path):
+        translator.journal = TranslationJournal(tmp_path / "journal.jsonl")
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [self.combined_reply("Direct one.", "Final one.")]
+        first = translator.process_letter("Unus.", letter_number=1)
+
+        translator.client.chat.completions.create.side_effect = AssertionError("should replay")
+        assert translator.process_letter("Unus.", letter_number=1) == first
+
+    def test_journal_without_conversation_context(self, translator, tmp_path):
+        translator.max_context = 0
+        translator.journal = TranslationJournal(tmp_path / "journal.jsonl")
+        translator.client = MagicMock()
+        translator.client.chat.completions.create.side_effect = [self.combined_reply("Direct one.", "Final one.")]
+
+        result = translator.process_letter("Unus.", letter_number=1)
+
+        assert result[0].rhetorical == ["Final one."]
+        assert len(translator.journal) == 1
+
+
+class TestPromptVariants:
+    """Tests for process_letter_variants"""
+
+    @pytest.fixture
+    def transport(self):
+        def respond(body):
+            system, text = body["messages"][0]["content"], body["messages"][-1]["content"]
+            if system == "Translate Latin to English literally":
+                return f"D({text})"
+            return f"{system}[{body['model']}]({text})"
+        return MockOpenAITransport(responder=respond)
+
+    @pytest.fixture
+    def translator(self, make_translator, transport):
+        return make_translator(rhetorical_prompt="R1", http_transport=transport)
+
+    variants = [
+        PromptVariant(name="v1"),
+        PromptVariant(name="v2", prompt="R2"),
+        PromptVariant(name="mini", model="gpt-4o-mini"),
+    ]
+
+    def test_direct_phase_is_shared(self, translator, transport):
+        results = translator.process_letter_variants("Unus. Duo.\n\nTres.", self.variants)
+
+        assert list(results) == ["v1", "v2", "mini"]
+        assert [stage.direct for stage in results["v2"]] == [["D(Unus.)", "D(Duo.)"], ["D(Tres.)"]]
+        assert results["v1"][1].rhetorical == ["R1[gpt-4o](D(Tres.))"]
+        assert results["v2"][0].rhetorical == ["R2[gpt-4o](D(Unus.))", "R2[gpt-4o](D(Duo.))"]
+        assert results["mini"][1].rhetorical == ["R1[gpt-4o-mini](D(Tres.))"]
+        # 3 direct requests, then 3 rhetorical requests per variant
+        assert len(transport.requests) == 3 + 3 * 3
+        # The variants do not change the translator they were made from
+        assert translator.rhetorical_prompt == "R1" and translator.model == "gpt-4o"
+
+    def test_async_matches_sync(self, translator, transport):
+        expected = translator.process_letter_variants("Unus. Duo.\n\nTres.", self.variants)
+
+        assert asyncio.run(translator.aprocess_letter_variants("Unus. Duo.\n\nTres.", self.variants)) == expected
+
+    def test_variant_names_must_be_distinct(self, translator):
+        with pytest.raises(ValueError):
+            translator.process_letter_variants("Unus.", [PromptVariant(name="a"), PromptVariant(name="a", prompt="R2")])
+
+    def test_variants_are_required(self, translator):
+        with pytest.raises(ValueError, match="At least one"):
+            translator.process_letter_variants("Unus.", [])
+        with pytest.raises(ValueError, match="At least one"):
+            asyncio.run(translator.aprocess_letter_variants("Unus.", []))
+        assert translator._async_client is None
+
+    def test_variants_share_the_async_client(self, translator):
+        translator._ensure_async_client()
+        variants = translator._variant_translators(self.variants)
+        assert all(variant._async_client is translator._async_client for variant in variants.values())
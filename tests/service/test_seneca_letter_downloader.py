@@ -1,3 +1,4 @@
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from latin_translator.models import Letter
@@ -153,4 +154,135 @@ def test_get_letter_by_number_fetches_if_needed(downloader):
     assert letter is not None
     assert letter.number == 1
     mock_fetch.assert_called_once() # Verify fetch was called implicitly
-    assert downloader._letters_by_number # Index should now be populated 
\ No newline at end of file
+    assert downloader._letters_by_number # Index should now be populated
+
+
+# --- Tests for fetch_all_letters ---
+
+def page_html(number: int) -> str:
+    roman = {1: "I", 2: "II", 3: "III"}[number]
+    return f"<html><body><p><b>{roman}. TITLE</b></p><p>[1] Letter {number}.</p></body></html>"
+
+
+def test_fetch_all_letters_concurrent_keeps_url_order():
+    urls = ["page1", "page2", "page3"]
+
+    def fake_download(url, session=None, timeout=None):
+        number = int(url[-1])
+        # Earlier pages finish last
+        time.sleep(0.01 * (4 - number))
+        return page_html(number)
+
+    downloader = SenecaLetterDownloader(urls=urls, max_workers=3, timeout=5)
+    with patch.object(SenecaLetterDownloader, 'download_content', side_effect=fake_download) as mock_download:
+        letters = downloader.fetch_all_letters()
+
+    assert [letter.number for letter in letters] == [1, 2, 3]
+    assert downloader.get_letter_by_number(2).content == "[1] Letter 2."
+    for call in mock_download.call_args_list:
+        assert call.kwargs == {"session": downloader.session, "timeout": 5}
+
+
+def test_fetch_all_letters_skips_failed_pages():
+    def fake_download(url, session=None, timeout=None):
+        if url == "page2":
+            raise RuntimeError("connection reset")
+        return page_html(int(url[-1]))
+
+    downloader = SenecaLetterDownloader(urls=["page1", "page2", "page3"])
+    with patch.object(SenecaLetterDownloader, 'download_content', side_effect=fake_download):
+        letters = downloader.fetch_all_letters()
+
+    assert [letter.number for letter in letters] == [1, 3]
+
+
+def test_session_pool_and_retries_configured():
+    downloader = SenecaLetterDownloader(urls=[], max_workers=6, max_retries=5, backoff_factor=0.25)
+    adapter = downloader.session.get_adapter("https://www.thelatinlibrary.com/")
+    assert adapter._pool_maxsize == 6
+    assert adapter.max_retries.total == 5
+    assert adapter.max_retries.backoff_factor == 0.25
+    assert 429 in adapter.max_retries.status_forcelist
+
+
+# --- Tests for lazy, page-indexed lookup ---
+
+def test_letter_range_for_url():
+    assert SenecaLetterDownloader.letter_range_for_url(
+        "https://www.thelatinlibrary.com/sen/seneca.ep11-13.shtml") == (84, 88)
+    assert SenecaLetterDownloader.letter_range_for_url(
+        "https://www.thelatinlibrary.com/sen/seneca.ep1.shtml") == (1, 12)
+    assert SenecaLetterDownloader.letter_range_for_url("dummy") is None
+
+
+def test_default_urls_cover_their_ranges():
+    downloader = SenecaLetterDownloader()
+    assert downloader.url_for_letter(77).endswith("seneca.ep9.shtml")
+    assert downloader.url_for_letter(124).endswith("seneca.ep20.shtml")
+    assert downloader.url_for_letter(97).endswith("seneca.ep16.shtml")
+    # Every known page is fetched by default, so every letter has a URL
+    assert all(downloader.url_for_letter(number) for number in range(1, 125))
+
+
+def test_get_letter_by_number_fetches_only_its_page():
+    ep9 = "https://www.thelatinlibrary.com/sen/seneca.ep9.shtml"
+    html = "<html><body><p><b>LXXVII. SENECA LVCILIO SVO SALVTEM</b></p><p>[1] Subito nobis hodie.</p></body></html>"
+    downloader = SenecaLetterDownloader()
+    with patch.object(SenecaLetterDownloader, 'download_content', return_value=html) as mock_download:
+        letter = downloader.get_letter_by_number(77)
+        assert letter.number == 77
+        assert downloader.get_letter_by_number(77) is letter
+
+    mock_download.assert_called_once()
+    assert mock_download.call_args.args == (ep9,)
+
+
+def test_get_letter_by_number_falls_back_when_page_lacks_letter():
+    urls = ["https://www.thelatinlibrary.com/sen/seneca.ep1.shtml", "dummy"]
+    pages = {
+        urls[0]: page_html(1),
+        urls[1]: page_html(2),
+    }
+    downloader = SenecaLetterDownloader(urls=urls)
+    with patch.object(SenecaLetterDownloader, 'download_content', side_effect=lambda url, **kwargs: pages[url]):
+        # Letter 2 is expected on ep1 but really lives on the unmapped page
+        letter = downloader.get_letter_by_number(2)
+    assert letter.number == 2
+
+
+# --- Tests for streaming extraction backends ---
+
+SAMPLE_HTML_MESSY = """
+<html><head><title>Seneca</title></head><body>
+<p class="pagehead"><b>L. ANNAEI SENECAE</b></p>
+<p><b>IV.</b> <b>SENECA</b> LVCILIO</p>
+<p>[1] Perseuera ut coepisti <!-- note --> &amp; propera<br>quantum potes. <i>Vale.</i></p>
+<p class="shortborder x"> </p>
+<p><b>V. SENECA LVCILIO SVO SALVTEM</b></p>
+<p>[1] Quod pertinaciter studes &nbsp;gaudeo.</p>
+<p>[2] Illud autem te admoneo.</p>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("html", [
+    SAMPLE_HTML_ONE_LETTER, SAMPLE_HTML_TWO_LETTERS, SAMPLE_HTML_NO_MARKERS, SAMPLE_HTML_MESSY
+])
+def test_extract_letters_backends_match(html):
+    pytest.importorskip("lxml")
+    assert SenecaLetterDownloader.extract_letters(html, backend="lxml") == \
+        SenecaLetterDownloader.extract_letters(html, backend="html.parser")
+
+
+def test_iter_letters_streams_chunks():
+    pytest.importorskip("lxml")
+    chunks = [SAMPLE_HTML_TWO_LETTERS[i:i + 16] for i in range(0, len(SAMPLE_HTML_TWO_LETTERS), 16)]
+    letters = SenecaLetterDownloader.iter_letters(iter(chunks), backend="lxml")
+    first = next(letters)
+    assert first.number == 1
+    assert [letter.number for letter in letters] == [2]
+
+
+def test_iter_letters_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown HTML backend"):
+        SenecaLetterDownloader.extract_letters(SAMPLE_HTML_ONE_LETTER, backend="regex")
@@ -0,0 +1,34 @@
+import pytest
+from unittest.mock import patch
+from latin_translator.cli import parse_letter_ranges, build_parser, main
+from latin_translator.models import Letter
+
+
+def test_parse_letter_ranges():
+    assert parse_letter_ranges(["1-3", "5,7-8", "2"]) == [1, 2, 3, 5, 7, 8]
+    assert parse_letter_ranges(build_parser().parse_args([]).letters) == list(range(1, 125))
+
+
+@pytest.mark.parametrize("spec", ["0-3", "120-125", "5-2", "x", "1-y"])
+def test_parse_letter_ranges_rejects_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_letter_ranges([spec])
+
+
+def test_status_does_not_fetch_letters(tmp_path):
+    with patch("latin_translator.cli.SenecaLetterDownloader") as downloader:
+        assert main(["--status", "--store", str(tmp_path / "store.sqlite3"), "96-100"]) == 0
+    downloader.assert_not_called()
+
+
+def test_letters_are_fetched_in_one_call(tmp_path):
+    letters = [Letter(number=n, roman="", title=f"T{n}", content="Vale.") for n in (1, 2, 3)]
+    with patch("latin_translator.cli.SenecaLetterDownloader") as downloader, \
+            patch("latin_translator.cli.CorpusRunner") as runner:
+        downloader.return_value.fetch_all_letters.return_value = letters
+        runner.return_value.counts.return_value.done = 0
+        assert main(["--no-epub", "--store", str(tmp_path / "store.sqlite3"), "1", "3"]) == 0
+        assert main(["--no-epub", "--store", str(tmp_path / "store.sqlite3"), "4"]) == 1
+
+    downloader.return_value.get_letter_by_number.assert_not_called()
+    assert runner.return_value.run.call_args_list[0].args[0] == [letters[0], letters[2]]
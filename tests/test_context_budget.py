@@ -0,0 +1,73 @@
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils import ContextBudget
+from latin_translator.utils.context_budget import estimate_message_tokens, estimate_tokens
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport
+
+
+def history(*exchanges, current="Vale."):
+    messages = [{"role": "system", "content": "Translate."}]
+    for user, assistant in exchanges:
+        messages += [{"role": "user", "content": user}, {"role": "assistant", "content": assistant}]
+    return messages + [{"role": "user", "content": current}]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Seneca Lucilio suo salutem.") == 7
+    assert estimate_tokens("philosophiae") == 2
+    assert estimate_message_tokens([{"role": "user", "content": "Vale."}]) == 2 + 4 + 3
+
+
+def test_keeps_recent_exchanges_that_fit():
+    long_reply = "verbum " * 200
+    messages = history(("Unus.", long_reply), ("Duo.", "Two."), ("Tres.", "Three."))
+    budget = ContextBudget(max_tokens=60)
+
+    selected = budget.select(messages)
+
+    assert [m["content"] for m in selected] == ["Translate.", "Duo.", "Two.", "Tres.", "Three.", "Vale."]
+    stats = budget.stats()
+    assert stats.trimmed_requests == 1
+    assert stats.exchanges_dropped == 1
+    assert stats.tokens_saved == estimate_message_tokens(messages) - estimate_message_tokens(selected)
+    assert stats.prompt_tokens == estimate_message_tokens(selected)
+
+
+def test_stops_at_the_first_exchange_that_does_not_fit():
+    # An older short exchange is not sent once a newer one was too long
+    messages = history(("Unus.", "One."), ("Duo.", "verbum " * 200))
+    assert ContextBudget(max_tokens=60).select(messages) == [messages[0], messages[-1]]
+
+
+def test_system_and_current_message_are_always_sent():
+    messages = history(("Unus.", "One."), current="verbum " * 500)
+    assert ContextBudget(max_tokens=10).select(messages) == [messages[0], messages[-1]]
+
+
+def test_max_exchanges():
+    messages = history(("Unus.", "One."), ("Duo.", "Two."), ("Tres.", "Three."))
+    selected = ContextBudget(max_tokens=10_000, max_exchanges=1).select(messages)
+    assert [m["content"] for m in selected] == ["Translate.", "Tres.", "Three.", "Vale."]
+
+
+def test_translator_sends_budgeted_context():
+    transport = MockOpenAITransport()
+    translator = LetterTranslator(http_transport=transport, context_tokens=90)
+    translator._sequential_translations(["Unus. " * 15, "Duo.", "Tres."], "Translate.")
+
+    sent = [len(request["messages"]) for request in transport.requests]
+    # The long first exchange no longer fits once the short ones are in context
+    assert sent == [2, 4, 4]
+    assert translator.context_budget.stats().exchanges_dropped == 1
+
+
+def test_letter_log_reports_that_letter_only(caplog):
+    translator = LetterTranslator(http_transport=MockOpenAITransport(), context_tokens=1_000)
+    with caplog.at_level("INFO", logger="latin_translator.service.letter_translator"):
+        translator.process_letter("Unus. Duo.")
+        translator.process_letter("Unus. Duo.")
+
+    logged = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Context budget")]
+    assert len(logged) == 2
+    assert logged[0] == logged[1]
+    assert translator.context_budget.stats().requests == 8
@@ -0,0 +1,62 @@
+import pytest
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils import ConversationWindow
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport
+
+
+def test_keeps_the_most_recent_exchanges():
+    window = ConversationWindow("Translate.", max_exchanges=2)
+    for number in ("Unus.", "Duo.", "Tres."):
+        window.ask(number)
+        window.answer(number.upper())
+    window.ask("Vale.")
+
+    assert [m["content"] for m in window.messages()] == ["Translate.", "Duo.", "DUO.", "Tres.", "TRES.", "Vale."]
+    assert len(window) == 6
+    assert window.last_reply == "TRES."
+
+
+def test_failed_request_is_replaced():
+    window = ConversationWindow("Translate.", max_exchanges=1)
+    window.ask("Unus.")
+    window.ask("Duo.")
+    window.answer("Two.")
+    assert [m["content"] for m in window] == ["Translate.", "Duo.", "Two."]
+    with pytest.raises(ValueError):
+        window.answer("Three.")
+
+
+def test_from_messages():
+    messages = [
+        {"role": "system", "content": "Translate."},
+        {"role": "user", "content": "Unus."},
+        {"role": "assistant", "content": "One."},
+        {"role": "user", "content": "Duo."},
+    ]
+    window = ConversationWindow.from_messages(messages, max_exchanges=4)
+    assert window.messages() == messages
+    assert window.max_exchanges == 4
+
+
+def test_translator_history_stays_bounded():
+    transport = MockOpenAITransport()
+    translator = LetterTranslator(http_transport=transport, max_context=2)
+
+    translator.translate_direct("Unus. Duo. Tres. Quattuor. Quinque.")
+
+    sent = [len(request["messages"]) for request in transport.requests]
+    assert sent == [2, 4, 6, 6, 6]
+
+
+def test_translate_chunk_accepts_a_message_list():
+    translator = LetterTranslator(http_transport=MockOpenAITransport(), max_context=2)
+    history = [
+        {"role": "system", "content": "Translate."},
+        {"role": "user", "content": "Unus."},
+        {"role": "assistant", "content": "One."},
+    ]
+
+    translation, window = translator.translate_chunk("Duo.", "Translate.", history)
+
+    assert translation == "Duo."
+    assert [m["content"] for m in window] == ["Translate.", "Unus.", "One.", "Duo.", "Duo."]
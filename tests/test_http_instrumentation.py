@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import httpx
+from unittest.mock import patch
+from latin_translator.utils.http_instrumentation import HttpInstrumentation
+
+
+def handler(request):
+    return httpx.Response(200, json={"ok": True}, headers={"x-request-id": "req_123"})
+
+
+def client_for(instrumentation):
+    return httpx.Client(transport=httpx.MockTransport(handler), event_hooks=instrumentation.event_hooks())
+
+
+def test_ring_buffer_keeps_last_exchanges():
+    instrumentation = HttpInstrumentation(capacity=2)
+    with client_for(instrumentation) as client:
+        for i in range(3):
+            client.post("https://api.test/v1/chat/completions", json={"n": i})
+
+    recent = instrumentation.recent()
+    assert [exchange.request_body for exchange in recent] == ['{"n":1}', '{"n":2}']
+    assert recent[-1].status_code == 200
+    assert recent[-1].request_id == "req_123"
+    assert recent[-1].elapsed is not None
+
+
+
+def test_body_is_truncated_by_characters():
+    instrumentation = HttpInstrumentation(capacity=1, max_body_chars=5)
+    with client_for(instrumentation) as client:
+        client.post("https://api.test/v1/chat/completions", content="Ἑλλάς λόγος".encode("utf-8"))
+
+    assert instrumentation.recent()[0].request_body == "Ἑλλάς"
+
+
+def test_sampling():
+    draws = iter([0.5, 0.05, 0.9])
+    instrumentation = HttpInstrumentation(sample_rate=0.1, capacity=10, rng=lambda: next(draws))
+    with client_for(instrumentation) as client:
+        for i in range(3):
+            client.post("https://api.test/v1/chat/completions", json={"n": i})
+
+    assert [exchange.request_body for exchange in instrumentation.recent()] == ['{"n":1}']
+
+
+def test_inactive_without_buffer_or_debug_logging():
+    instrumentation = HttpInstrumentation(rng=lambda: 1 / 0)  # Must not even sample
+    with patch.object(logging.getLogger("latin_translator.service.letter_translator.http"), "isEnabledFor", return_value=False):
+        with client_for(instrumentation) as client:
+            client.get("https://api.test/")
+    assert instrumentation.recent() == []
+
+
+def test_logs_when_debug_enabled(caplog):
+    instrumentation = HttpInstrumentation(capture_bodies=False)
+    with caplog.at_level(logging.DEBUG, logger="latin_translator.service.letter_translator.http"):
+        with client_for(instrumentation) as client:
+            client.post("https://api.test/v1/chat/completions", json={"n": 1})
+    assert "OpenAI Request: POST https://api.test/v1/chat/completions" in caplog.text
+    assert "OpenAI Response: HTTP 200" in caplog.text
+    assert "Request body" not in caplog.text
+
+
+def test_async_hooks():
+    instrumentation = HttpInstrumentation(capacity=5)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), event_hooks=instrumentation.async_event_hooks()
+        ) as client:
+            await client.get("https://api.test/")
+
+    asyncio.run(run())
+    assert instrumentation.recent()[0].status_code == 200
+
+
+def test_disabled_installs_no_hooks(make_translator):
+    translator = make_translator(instrumentation=HttpInstrumentation(enabled=False))
+    assert translator.client._client.event_hooks == {"request": [], "response": []}
+    assert translator.async_client._client.event_hooks == {"request": [], "response": []}
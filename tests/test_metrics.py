@@ -0,0 +1,95 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils.metrics import CallLabels, ModelPrice, TranslationMetrics
+
+
+LABELS = CallLabels(phase="direct", model="gpt-4o", letter="77", prompt_version="abc")
+
+
+def completion(content, prompt_tokens=100, completion_tokens=20, cached_tokens=0):
+    usage = Mock(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    usage.prompt_tokens_details.cached_tokens = cached_tokens
+    return Mock(choices=[Mock(message=Mock(content=content))], usage=usage)
+
+
+def test_aggregates_calls_and_cost():
+    metrics = TranslationMetrics(prices={"gpt-4o": ModelPrice(prompt=2.0, cached_prompt=1.0, completion=10.0)})
+    metrics.record_call(LABELS, 0.3, prompt_tokens=1_000, completion_tokens=100, cached_tokens=500)
+    metrics.record_call(LABELS, 5.0, prompt_tokens=1_000, completion_tokens=100)
+    metrics.record_cache_hit(LABELS)
+    metrics.record_error(LABELS.model_copy(update={"phase": "rhetorical"}))
+
+    summary = metrics.summary()
+    assert (summary.calls, summary.cache_hits, summary.errors) == (2, 1, 1)
+    assert (summary.prompt_tokens, summary.completion_tokens, summary.cached_tokens) == (2_000, 200, 500)
+    assert summary.cost_usd == (500 * 2.0 + 500 * 1.0 + 1_000 * 2.0 + 200 * 10.0) / 1_000_000
+    direct = summary.by_labels[0]
+    assert direct.latency_buckets[1] == 1 and direct.latency_buckets[5] == 1
+
+
+def test_dated_model_uses_base_price():
+    metrics = TranslationMetrics()
+    metrics.record_call(LABELS.model_copy(update={"model": "gpt-4o-mini-2024-07-18"}), 1.0, prompt_tokens=1_000_000)
+    assert metrics.summary().cost_usd == 0.15
+
+
+def test_prometheus_histogram_is_cumulative():
+    metrics = TranslationMetrics()
+    metrics.record_call(LABELS, 0.3)
+    metrics.record_call(LABELS, 100.0)
+
+    text = metrics.to_prometheus()
+    labels = 'phase="direct",model="gpt-4o",letter="77",prompt_version="abc"'
+    assert f'latin_translator_request_duration_seconds_bucket{{{labels},le="0.25"}} 0' in text
+    assert f'latin_translator_request_duration_seconds_bucket{{{labels},le="0.5"}} 1' in text
+    assert f'latin_translator_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"latin_translator_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f'latin_translator_tokens_total{{{labels},kind="cached"}} 0' in text
+
+
+def test_translator_records_and_exports(tmp_path):
+    mock_client = Mock()
+    mock_client.chat.completions.create.return_value = completion("Done.", cached_tokens=64)
+    metrics = TranslationMetrics(export_dir=tmp_path)
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+        translator = LetterTranslator(metrics=metrics)
+        translator.process_letter("Unus. Duo.", letter_number=77)
+
+    by_phase = {entry.labels.phase: entry for entry in metrics.summary().by_labels}
+    assert set(by_phase) == {"direct", "rhetorical"}
+    assert by_phase["direct"].labels.letter == "77"
+    assert (by_phase["direct"].calls, by_phase["direct"].prompt_tokens, by_phase["direct"].cached_tokens) == (2, 200, 128)
+    assert by_phase["direct"].labels.prompt_version != by_phase["rhetorical"].labels.prompt_version
+    assert json.loads((tmp_path / "metrics.json").read_text())["calls"] == 4
+    assert 'letter="77"' in (tmp_path / "metrics.prom").read_text()
+
+
+def test_async_calls_are_labelled_with_letter(make_translator):
+    metrics = TranslationMetrics()
+    translator = make_translator(metrics=metrics)
+    mock_client = Mock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=lambda **kwargs: completion("Done."))
+    translator._async_client = mock_client
+
+    asyncio.run(translator.aprocess_letter("Unus.\n\nDuo.", letter_number=3))
+
+    assert [entry.labels.letter for entry in metrics.summary().by_labels] == ["3", "3"]
+    assert metrics.summary().calls == 4
+
+
+def test_streamed_letter_is_labelled_and_exported(tmp_path, make_translator):
+    metrics = TranslationMetrics(export_dir=tmp_path)
+    translator = make_translator(metrics=metrics)
+    translator.client = Mock()
+    translator.client.chat.completions.create.side_effect = lambda **kwargs: iter([
+        Mock(choices=[Mock(delta=Mock(content="Done."))], usage=None),
+        Mock(choices=[], usage=completion("").usage),
+    ])
+
+    list(translator.iter_process_letter("Unus.", letter_number=5))
+
+    assert [entry.labels.letter for entry in metrics.summary().by_labels] == ["5", "5"]
+    assert json.loads((tmp_path / "metrics.json").read_text())["calls"] == 2
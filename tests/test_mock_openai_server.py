@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+from openai import OpenAI, RateLimitError
+from latin_translator.models import Letter, TokenEvent
+from latin_translator.service.batch_translation_job import BatchTranslationJob, OpenAIBatchBackend
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils.mock_openai_server import MockOpenAIServer, TRANSFORMS
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    # The mocks ignore the key, but the OpenAI clients refuse to start without one
+    monkeypatch.setenv("OPENAI_API_KEY", "mock")
+
+
+@pytest.fixture
+def server():
+    transport = MockOpenAITransport(responder=TRANSFORMS["upper"], token_latency=0.001)
+    server = MockOpenAIServer(transport)
+    with server.run_in_thread():
+        yield server
+
+
+def test_translator_over_http(server):
+    translator = LetterTranslator(base_url=server.base_url)
+
+    assert translator.process_letter("Unus. Duo.")[0].direct == ["UNUS.", "DUO."]
+    assert asyncio.run(translator.aprocess_letter("Tres."))[0].rhetorical == ["TRES."]
+    events = list(translator.iter_process_letter("Quattuor quinque."))
+    assert events[-1].stages.direct == ["QUATTUOR QUINQUE."]
+    assert sum(1 for event in events if isinstance(event, TokenEvent)) > 2
+    translator.batch_paragraphs = True
+    assert translator.process_letter("Sex. Septem.")[0].direct == ["SEX.", "SEPTEM."]
+
+
+def test_base_url_from_settings(server, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_BASE_URL", server.base_url)
+    translator = LetterTranslator()
+    assert translator.process_letter("Vale.")[0].direct == ["VALE."]
+    assert len(server.transport.requests) == 2
+
+
+def test_rate_limit_headers_and_throttling():
+    server = MockOpenAIServer(MockOpenAITransport(requests_per_minute=1))
+    with server.run_in_thread():
+        client = OpenAI(api_key="mock", base_url=server.base_url, max_retries=0)
+        response = client.chat.completions.with_raw_response.create(
+            model="gpt-4o", messages=[{"role": "user", "content": "Vale."}]
+        )
+        assert response.headers["x-ratelimit-limit-requests"] == "1"
+        assert response.headers["x-ratelimit-remaining-requests"] == "0"
+        with pytest.raises(RateLimitError):
+            client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Ave."}])
+
+
+def test_batch_endpoints(server, tmp_path):
+    translator = LetterTranslator(base_url=server.base_url)
+    backend = OpenAIBatchBackend(OpenAI(api_key="mock", base_url=server.base_url))
+    job = BatchTranslationJob(translator, backend, tmp_path, poll_interval=0)
+
+    result = job.run([Letter(number=1, roman="I", title="T", content="Unus. Duo.")])
+
+    assert result[1][0].direct == ["UNUS.", "DUO."]
+    assert result[1][0].rhetorical == ["UNUS.", "DUO."]
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import httpx
+import pytest
+from openai import OpenAI, InternalServerError, RateLimitError
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport, default_responder
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    # The mocks ignore the key, but the OpenAI clients refuse to start without one
+    monkeypatch.setenv("OPENAI_API_KEY", "mock")
+
+
+def client_for(transport):
+    return OpenAI(api_key="test", http_client=httpx.Client(transport=transport), max_retries=0)
+
+
+def test_completion_round_trip():
+    transport = MockOpenAITransport(responder=lambda body: "Farewell.")
+    completion = client_for(transport).chat.completions.create(
+        model="gpt-4o", messages=[{"role": "user", "content": "Vale."}]
+    )
+    assert completion.choices[0].message.content == "Farewell."
+    assert completion.usage.total_tokens > 0
+    assert transport.requests[0]["messages"][0]["content"] == "Vale."
+
+
+def test_streaming_with_usage():
+    transport = MockOpenAITransport(responder=lambda body: "Fare well, Lucilius.")
+    chunks = list(client_for(transport).chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": "Vale."}],
+        stream=True,
+        stream_options={"include_usage": True}
+    ))
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in chunks if chunk.choices)
+    assert text == "Fare well, Lucilius."
+    assert chunks[-1].usage.completion_tokens > 0
+
+
+def test_injected_failures():
+    client = client_for(MockOpenAITransport(error_rate=1.0))
+    with pytest.raises(InternalServerError):
+        client.chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Vale."}])
+
+    transport = MockOpenAITransport(throttle_rate=1.0, retry_after=0.25)
+    with pytest.raises(RateLimitError) as excinfo:
+        client_for(transport).chat.completions.create(model="gpt-4o", messages=[{"role": "user", "content": "Vale."}])
+    assert excinfo.value.response.headers["retry-after-ms"] == "250"
+    assert transport.throttled == 1
+
+
+def test_json_mode_reply_lists_numbered_sentences():
+    body = {
+        "messages": [{"role": "user", "content": "Translate:\n1. Unus.\n2. Duo."}],
+        "response_format": {"type": "json_object"},
+    }
+    assert json.loads(default_responder(body)) == {"translations": ["Unus.", "Duo."]}
+
+
+def test_translator_over_mock_transport():
+    transport = MockOpenAITransport(latency=0.001, jitter=0.001, seed=1)
+    translator = LetterTranslator(http_transport=transport)
+
+    assert translator.process_letter("Unus. Duo.")[0].rhetorical == ["Unus.", "Duo."]
+    assert asyncio.run(translator.aprocess_letter("Tres."))[0].direct == ["Tres."]
+    assert len(transport.requests) == 6
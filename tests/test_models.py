@@ -70,4 +70,19 @@ def test_translation_stages_display_many():
         
         # Assert that print is called the correct number of times
         # 2 paragraphs * (1 header + 1 sentence * 4 lines/sentence + 1 trailing newline) = 2 * 6 = 12
-        assert mock_print.call_count == 12 
\ No newline at end of file
+        assert mock_print.call_count == 12 
+
+def test_translation_stages_compare_many():
+    def stages(direct, rhetorical):
+        return [TranslationStages(paragraph_index=1, original=["Unus."], direct=[direct], rhetorical=[rhetorical])]
+
+    markdown = TranslationStages.compare_many({"v1": stages("One.", "Just one."), "v2": stages("One.", "Only one.")})
+
+    assert markdown == (
+        "## Paragraph 1\n\n"
+        "**Sentence 1:**\n\n- Latin: `Unus.`\n- Direct: `One.`\n- v1: `Just one.`\n- v2: `Only one.`\n\n"
+        "---\n\n"
+    )
+    # Direct translations are listed per variant only when they differ
+    markdown = TranslationStages.compare_many({"a": stages("One.", "x"), "b": stages("A single.", "y")})
+    assert "- Direct (a): `One.`\n- Direct (b): `A single.`\n" in markdown
@@ -0,0 +1,99 @@
+import os
+import pytest
+from latin_translator.exceptions import PromptNotFoundError
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils import PromptRegistry, TranslationMetrics, get_prompt_registry
+from latin_translator.utils.mock_openai_transport import MockOpenAITransport
+
+
+@pytest.fixture
+def prompt_dir(tmp_path):
+    (tmp_path / "direct.v1.txt").write_text("Translate literally.", encoding="utf-8")
+    (tmp_path / "direct.v2.txt").write_text("Translate very literally.", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("Not a prompt.", encoding="utf-8")
+    return tmp_path
+
+
+def test_versions(prompt_dir):
+    registry = PromptRegistry(prompt_dir)
+
+    assert registry.versions("direct") == [1, 2]
+    assert registry.get("direct").text == "Translate very literally."
+    assert registry.get("direct", version=1).text == "Translate literally."
+    with pytest.raises(PromptNotFoundError):
+        registry.get("direct", version=3)
+    with pytest.raises(PromptNotFoundError):
+        registry.get("notes")
+
+
+def test_reloads_changed_files(prompt_dir):
+    registry = PromptRegistry(prompt_dir, check_interval=0)
+    first = registry.get("direct", version=1)
+
+    path = prompt_dir / "direct.v1.txt"
+    path.write_text("Translate word for word.", encoding="utf-8")
+    os.utime(path, (first.mtime + 10, first.mtime + 10))
+    (prompt_dir / "rhetorical.v1.txt").write_text("Rewrite.", encoding="utf-8")
+
+    assert registry.get("direct", version=1).text == "Translate word for word."
+    assert registry.get("rhetorical").text == "Rewrite."
+    # Unchanged files are not re-read
+    assert registry.get("direct", version=2) is registry.get("direct", version=2)
+
+
+def test_waits_for_check_interval(prompt_dir):
+    registry = PromptRegistry(prompt_dir, check_interval=3600)
+    registry.get("direct")
+    (prompt_dir / "direct.v3.txt").write_text("Newer.", encoding="utf-8")
+
+    assert registry.get("direct").version == 2
+    registry.reload()
+    assert registry.get("direct").version == 3
+
+
+def test_translator_uses_the_shared_registry():
+    translator = LetterTranslator(prompt_versions={"direct": 1})
+
+    assert translator.direct_prompt == get_prompt_registry().get("direct", version=1).text
+    with pytest.raises(PromptNotFoundError):
+        LetterTranslator(prompt_versions={"direct": 999})
+
+
+def test_system_prompt_is_a_cacheable_prefix():
+    transport = MockOpenAITransport()
+    metrics = TranslationMetrics()
+    translator = LetterTranslator(http_transport=transport, metrics=metrics)
+
+    translator.process_letter("Unus. Duo.")
+
+    direct = [r for r in transport.requests if r["messages"][0]["content"] == translator.direct_prompt]
+    assert len(direct) == 2
+    assert direct[0]["prompt_cache_key"] == direct[1]["prompt_cache_key"]
+    assert direct[1]["messages"][:2] == direct[0]["messages"]
+    # The mock reports the repeated system prompt as cached, like the provider
+    summary = metrics.summary()
+    assert summary.cached_tokens > 0
+    assert 0 < summary.prompt_cache_ratio < 1
+
+
+def test_prompts_are_pinned_for_a_letter(prompt_dir, monkeypatch):
+    (prompt_dir / "rhetorical.v1.txt").write_text("Rewrite.", encoding="utf-8")
+    registry = PromptRegistry(prompt_dir, check_interval=0)
+    monkeypatch.setattr("latin_translator.utils.prompt_registry._registry", registry)
+    transport = MockOpenAITransport()
+    translator = LetterTranslator(http_transport=transport)
+
+    reply_from_completion = translator._reply_from_completion
+
+    def edit_prompt_after_reply(completion, cache_key):
+        # A newer prompt appears while the letter is being translated
+        (prompt_dir / "rhetorical.v2.txt").write_text("Rewrite freely.", encoding="utf-8")
+        return reply_from_completion(completion, cache_key)
+
+    monkeypatch.setattr(translator, "_reply_from_completion", edit_prompt_after_reply)
+    translator.process_letter("Unus. Duo.")
+
+    system_prompts = [r["messages"][0]["content"] for r in transport.requests]
+    assert system_prompts == ["Translate very literally."] * 2 + ["Rewrite."] * 2
+    # The edit is picked up by the next letter
+    assert translator.rhetorical_prompt == "Rewrite freely."
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+from openai import RateLimitError
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils import AdaptiveRateLimiter
+from latin_translator.utils.rate_limiter import parse_reset_duration, parse_retry_after
+
+
+def rate_limit_error(headers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return RateLimitError("Rate limit reached", response=httpx.Response(429, headers=headers, request=request), body=None)
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("1s") == 1.0
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("1h2m3.5s") == pytest.approx(3723.5)
+    assert parse_reset_duration("soon") is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"retry-after": "2"}) == 2.0
+    assert parse_retry_after({}) is None
+
+
+def test_observe_headers_updates_buckets():
+    limiter = AdaptiveRateLimiter(requests_per_minute=10, tokens_per_minute=1000)
+    limiter.observe_headers({
+        "x-ratelimit-limit-requests": "5000",
+        "x-ratelimit-remaining-requests": "4999",
+        "x-ratelimit-limit-tokens": "80000",
+        "x-ratelimit-remaining-tokens": "100",
+    })
+    assert limiter.requests.capacity == 5000
+    assert limiter.tokens.capacity == 80000
+    assert limiter.tokens.level <= 101
+
+
+def test_aimd_concurrency():
+    limiter = AdaptiveRateLimiter(initial_concurrency=4, max_concurrency=5, additive_increase=0.5)
+    limiter.acquire()
+    limiter.release(success=True)
+    assert limiter.concurrency_limit == 4.5
+    limiter.on_throttle(retry_after=0)
+    assert limiter.concurrency_limit == 2.25
+    for _ in range(5):
+        limiter.on_throttle(retry_after=0)
+    assert limiter.concurrency_limit == 1.0
+    for _ in range(20):
+        limiter.acquire()
+        limiter.release(success=True)
+    assert limiter.concurrency_limit == 5
+
+
+def test_retry_after_pauses_acquire():
+    limiter = AdaptiveRateLimiter()
+    limiter.on_throttle(retry_after=0.1)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_concurrency_cap_blocks_until_release():
+    limiter = AdaptiveRateLimiter(initial_concurrency=1)
+    limiter.acquire()
+    acquired = threading.Event()
+    worker = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+    worker.start()
+    assert not acquired.wait(0.1)
+    limiter.release()
+    assert acquired.wait(1)
+    worker.join()
+
+
+def test_async_acquire_waits_for_request_bucket():
+    limiter = AdaptiveRateLimiter(requests_per_minute=600)  # 10 per second
+    limiter.requests.level = 0
+
+    async def run():
+        start = time.monotonic()
+        await limiter.acquire_async()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_translator_retries_throttled_calls():
+    completion = MagicMock(choices=[MagicMock(message=MagicMock(content="Farewell."))])
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [rate_limit_error({"retry-after-ms": "10"}), completion]
+    limiter = AdaptiveRateLimiter()
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client) as mock_openai:
+        translator = LetterTranslator(rate_limiter=limiter)
+        translation, _ = translator.translate_chunk("Vale.", "Translate")
+
+    assert translation == "Farewell."
+    assert mock_openai.call_args.kwargs["max_retries"] == 0
+    assert mock_client.chat.completions.create.call_count == 2
+    assert limiter.throttle_count == 1
+    assert limiter.in_flight == 0
+
+
+def test_translator_raises_after_max_throttle_retries():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = rate_limit_error({"retry-after-ms": "1"})
+    limiter = AdaptiveRateLimiter(max_throttle_retries=2)
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+        translator = LetterTranslator(rate_limiter=limiter)
+        with pytest.raises(RateLimitError):
+            translator.translate_chunk("Vale.", "Translate")
+
+    assert mock_client.chat.completions.create.call_count == 3
+    assert limiter.in_flight == 0
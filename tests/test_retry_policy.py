@@ -0,0 +1,204 @@
+import asyncio
+import time
+import httpx
+import openai
+import pytest
+from unittest.mock import MagicMock, patch
+from latin_translator.service.letter_translator import LetterTranslator
+from latin_translator.utils import AdaptiveRateLimiter, RetryPolicy
+from latin_translator.utils.retry_policy import LatencyTracker, call_with_retry, acall_with_retry
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def connection_error():
+    return openai.APIConnectionError(request=REQUEST)
+
+
+def flaky(failures, result="ok"):
+    calls = []
+
+    def send():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise connection_error()
+        return result
+    return send, calls
+
+
+def warmed_tracker(latency=0.01, samples=20):
+    tracker = LatencyTracker()
+    for _ in range(samples):
+        tracker.record(latency)
+    return tracker
+
+
+def test_backoff_is_jittered_and_bounded():
+    policy = RetryPolicy(base_delay=1.0, max_delay=3.0)
+    delays = [policy.backoff(attempt) for attempt in range(6) for _ in range(20)]
+    assert all(0 <= d <= 3.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert policy.backoff(0, retry_after=5.0) == 5.0
+
+
+def test_latency_tracker_quantile():
+    tracker = LatencyTracker()
+    assert tracker.quantile(0.95) is None
+    for n in range(1, 101):
+        tracker.record(n / 100)
+    assert tracker.quantile(0.95) == 0.96
+
+
+def test_retries_then_succeeds():
+    send, calls = flaky(failures=2)
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+    assert call_with_retry(send, policy, LatencyTracker()) == "ok"
+    assert len(calls) == 3
+
+
+def test_gives_up_after_max_attempts():
+    send, calls = flaky(failures=5)
+    with pytest.raises(openai.APIConnectionError):
+        call_with_retry(send, RetryPolicy(max_attempts=2, base_delay=0.001), LatencyTracker())
+    assert len(calls) == 2
+
+
+def test_non_retryable_errors_propagate():
+    def send():
+        raise ValueError("bad request")
+    with pytest.raises(ValueError):
+        call_with_retry(send, RetryPolicy(base_delay=0.001), LatencyTracker())
+
+
+def test_sync_hedge_takes_first_answer():
+    calls = []
+
+    def send():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.5)  # straggler
+            return "slow"
+        return "fast"
+
+    start = time.monotonic()
+    result = call_with_retry(send, RetryPolicy(hedge=True), warmed_tracker())
+    assert result == "fast"
+    assert time.monotonic() - start < 0.4
+    assert len(calls) == 2
+
+
+def test_sync_hedge_closes_losing_stream():
+    slow, fast = MagicMock(name="slow"), MagicMock(name="fast")
+    calls = []
+
+    def send():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.3)  # straggler
+            return slow
+        return fast
+
+    assert call_with_retry(send, RetryPolicy(hedge=True), warmed_tracker()) is fast
+    time.sleep(0.5)
+    slow.close.assert_called_once()
+    fast.close.assert_not_called()
+
+
+def test_async_hedge_cancels_loser():
+    cancelled = []
+
+    async def run():
+        calls = 0
+
+        async def send():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+                return "slow"
+            return "fast"
+
+        result = await acall_with_retry(send, RetryPolicy(hedge=True), warmed_tracker())
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "fast"
+    assert cancelled == [True]
+
+
+def test_async_retries():
+    attempts = 0
+
+    async def send():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise connection_error()
+        return "ok"
+
+    assert asyncio.run(acall_with_retry(send, RetryPolicy(base_delay=0.001), LatencyTracker())) == "ok"
+    assert attempts == 2
+
+
+def test_translator_applies_policy():
+    completion = MagicMock(choices=[MagicMock(message=MagicMock(content="Farewell."))])
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [connection_error(), completion]
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client) as mock_openai:
+        translator = LetterTranslator(retry_policy=RetryPolicy(base_delay=0.001, deadline=30))
+        translation, _ = translator.translate_chunk("Vale.", "Translate")
+
+    assert translation == "Farewell."
+    assert mock_openai.call_args.kwargs["max_retries"] == 0
+    assert mock_client.chat.completions.create.call_count == 2
+    assert mock_client.chat.completions.create.call_args.kwargs["timeout"] == 30
+    assert len(translator.latency_tracker) == 1
+
+
+def test_rate_limiter_owns_throttling_retries():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    throttled = openai.RateLimitError(
+        "Rate limit reached", response=httpx.Response(429, headers={"retry-after-ms": "1"}, request=request), body=None
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = throttled
+
+    with patch("latin_translator.service.letter_translator.OpenAI", return_value=mock_client):
+        translator = LetterTranslator(
+            rate_limiter=AdaptiveRateLimiter(max_throttle_retries=2),
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001)
+        )
+        with pytest.raises(openai.RateLimitError):
+            translator.translate_chunk("Vale.", "Translate")
+
+    # The limiter's three tries, not three policy attempts of three tries each
+    assert mock_client.chat.completions.create.call_count == 3
+
+
+def test_cancelled_hedge_releases_rate_limiter_slot():
+    completion = MagicMock(choices=[MagicMock(message=MagicMock(content="Farewell."))])
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)  # straggler, cancelled once the hedge answers
+        return completion
+
+    limiter = AdaptiveRateLimiter()
+    translator = LetterTranslator(rate_limiter=limiter, retry_policy=RetryPolicy(hedge=True))
+    translator.latency_tracker = warmed_tracker()
+    translator._async_client = MagicMock()
+    translator._async_client.chat.completions.create = create
+
+    translation, _ = asyncio.run(translator.atranslate_chunk("Vale.", "Translate"))
+
+    assert translation == "Farewell."
+    assert calls == 2
+    assert limiter.in_flight == 0
@@ -23,6 +23,17 @@ def test_split_text_with_quotes():
     sentences = split_text_with_quotes(text)
     assert sentences == ["He said, 'Hello!'", "How are you?"]
 
+def test_split_text_with_quotes_keeps_double_quoted_text_together():
+    text = 'Sic enim coepit: "Noli torqueri. Non est res magna vivere!" Cogita quamdiu. Vale'
+    assert split_text_with_quotes(text) == [
+        'Sic enim coepit: "Noli torqueri. Non est res magna vivere!" Cogita quamdiu.',
+        "Vale",
+    ]
+
+def test_split_text_with_quotes_unterminated_quote():
+    text = "Ait “primum. Deinde? Tandem"
+    assert split_text_with_quotes(text) == ["Ait “primum. Deinde? Tandem"]
+
 def test_split_naive_sentences():
     text = "This is a sentence. This is another! And a third?"
     sentences = split_naive_sentences(text)